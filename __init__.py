@@ -10,16 +10,38 @@ bl_info = {
     "tracker_url": "",
 }
 
+import sys
+import time
+_import_start = time.perf_counter() # The add-on's own startup cost is reported in the Debug panel
+
 import bpy
-# Import modules directly
+# Import modules directly. Heavy standard library modules (urllib, sqlite3, zipfile, ...)
+# are imported inside the functions that need them, and caches and indexes are built on first use.
+# The canvas, the shared library and the search index are loaded by their first user (see lazy_modules).
 from . import core
 from . import properties
+from . import board_cache
+from . import scheduling
+from . import sorting
+from . import palette
+from . import tag_index
+from . import preferences
+from . import instrumentation
 # Import all operator modules
 from .operators import board_ops
 from .operators import pin_ops
-# from .operators import relink_ops # Removed
 from .operators import web_ops
 from .operators import placement_ops
+from .operators import color_ops
+from .operators import search_ops
+from .operators import library_ops
+from .operators import package_ops
+from .operators import transfer_ops
+from .operators import debug_ops
+from .operators import sheet_ops
+from .operators import canvas_ops
+from .operators import tag_ops
+from .operators import clipboard_ops
 # Import UI
 from . import ui
 
@@ -27,57 +49,59 @@ from . import ui
 classes_to_register = (
     *board_ops.classes,       # Classes from board_ops.py
     *pin_ops.classes,         # Classes from pin_ops.py
-    # *relink_ops.classes,    # Removed
     *web_ops.classes,         # Classes from web_ops.py
     *placement_ops.classes,   # Classes from placement_ops.py
+    *color_ops.classes,       # Classes from color_ops.py
+    *search_ops.classes,      # Classes from search_ops.py
+    *library_ops.classes,     # Classes from library_ops.py
+    *package_ops.classes,     # Classes from package_ops.py
+    *transfer_ops.classes,    # Classes from transfer_ops.py
+    *debug_ops.classes,       # Classes from debug_ops.py
+    *sheet_ops.classes,       # Classes from sheet_ops.py
+    *canvas_ops.classes,      # Classes from canvas_ops.py
+    *tag_ops.classes,         # Classes from tag_ops.py
+    *clipboard_ops.classes,   # Classes from clipboard_ops.py
+    *preferences.classes,     # Add-on preferences
     *ui.classes,           # Classes from ui/__init__.py (panels & uilists)
 )
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes_to_register)
 
+# Runtime modules with their own handlers/timers, in registration order
+runtime_modules = (board_cache, scheduling, sorting, palette, tag_index)
+# Runtime modules imported on first use; they register themselves when imported
+lazy_modules = ("search_index", "library", "canvas")
 
-# Ensure relative imports work
-if "." not in __name__:
-    from . import core
-    from . import properties
-    from . import operators
-    from . import ui
-else:
-    import core
-    import properties
-    import operators
-    import ui
+def _loaded_lazy_modules() -> list:
+    return [sys.modules[name] for name in (f"{__name__}.{module}" for module in lazy_modules) if name in sys.modules]
 
-# Order is important
-modules_ordered = (
-    properties,
-    operators,
-    ui,
-)
+instrumentation.startup["import_ms"] = (time.perf_counter() - _import_start) * 1000.0
 
 def register():
-    print("Registering RefBoard Manager (Manual Class List)...")
+    start = time.perf_counter()
     # Register scene properties
     properties.register()
-    # Register all other classes
-    for cls in classes_to_register:
-        # Add try-except just in case
-        try:
-            bpy.utils.register_class(cls)
-        except Exception as e:
-            print(f"ERROR: Failed to register class {cls.__name__}: {e}")
-
-    print("RefBoard Manager registration complete.")
+    for module in runtime_modules:
+        module.register()
+    for module in _loaded_lazy_modules(): # Enabled again after a disable: they are not imported again
+        module.register()
+    _register_classes()
+    clipboard_ops.register_keymaps()
+    # Opt-in timing hooks (only installed if enabled in the preferences)
+    instrumentation.register(classes_to_register)
+    instrumentation.startup["register_ms"] = (time.perf_counter() - start) * 1000.0
+    if bpy.app.debug_python:
+        print("RefBoard startup: import {import_ms:.1f} ms, register {register_ms:.1f} ms".format(**instrumentation.startup))
 
 def unregister():
-    print("Unregistering RefBoard Manager (Manual Class List)...")
-    # Unregister all classes
-    for cls in reversed(classes_to_register):
-        try:
-            bpy.utils.unregister_class(cls)
-        except Exception as e:
-            print(f"ERROR: Failed to unregister class {cls.__name__}: {e}")
+    instrumentation.unregister() # Restore the original functions before the classes go away
+    clipboard_ops.unregister_keymaps()
+    _unregister_classes()
+    for module in reversed(_loaded_lazy_modules()):
+        module.unregister()
+    for module in reversed(runtime_modules):
+        module.unregister()
     # Unregister scene properties
     properties.unregister()
-    print("RefBoard Manager unregistration complete.")
 
 
 # For debugging: reload on script execution in Blender
@@ -90,4 +114,4 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Unregister failed (likely first run): {e}")
         pass
-    register()
\ No newline at end of file
+    register()
@@ -0,0 +1,230 @@
+"""
+Python API of RefBoard, for pipeline scripts and background sessions (``blender -b``).
+
+Unlike the ``bpy.ops.refboard.*`` operators, these functions take explicit board and
+pin objects, need no UI context, push no undo steps and use the same bulk code paths
+as the add-on itself. The UI operators are thin wrappers around them.
+
+Example (the add-on package is the folder RefBoard is installed in, e.g. ``RFBManager``)::
+
+    import RFBManager.api as rb
+
+    board = rb.create_board("Hands", scene=bpy.context.scene)
+    rb.add_pins(board, ["/refs/hand_01.jpg", "/refs/hand_02.jpg"])
+    pins = rb.query(board, tags={"hands"}, text="pose")
+    rb.place(pins, layout='GRID', columns=3)
+    rb.remove(rb.query(board, has_image=False))
+"""
+import bpy
+import re
+import math
+import mathutils
+import numpy as np
+# Relative imports
+from . import core
+from .ingest import ImageIngest
+
+__all__ = (
+    "get_boards", "get_board", "create_board", "remove_board",
+    "add_pins", "add_image", "query", "select", "remove",
+    "copy_pins", "move_pins", "layout_offsets", "place",
+)
+
+LAYOUTS = ('STACK_X', 'STACK_Y', 'STACK_Z', 'GRID')
+PLACEMENT_COLLECTION = "RefBoard Empties"
+
+# --- Boards ---
+def get_boards(scene: bpy.types.Scene | None = None):
+    """
+    All boards shown in the scene (the current scene if none is given). Boards are stored once
+    per file, so scenes usually share them.
+    """
+    return core.get_boards(scene or bpy.context.scene)
+
+def get_board(key: str, scene: bpy.types.Scene | None = None):
+    """Returns the board with the given uid or name, or None."""
+    for board in get_boards(scene):
+        if board.uid == key: return board
+    for board in get_boards(scene):
+        if board.name == key: return board
+    return None
+
+def create_board(name: str, scene: bpy.types.Scene | None = None):
+    """Adds a new board. Note: this may invalidate references to other boards of the file."""
+    return core.new_board(scene or bpy.context.scene, name)
+
+def remove_board(board) -> None:
+    store = board.id_data
+    idx, _board = core.find_board(store, board.uid)
+    if idx < 0: return
+    core.remove_board(store, idx)
+
+# --- Adding pins ---
+def add_pins(board, paths, defer_previews: bool | None = None) -> list:
+    """
+    Adds image files to the board and returns the new pins. Images already loaded are
+    reused and files whose image is already on the board are skipped. Previews and
+    palettes are generated in the background in interactive sessions and right away
+    in background mode (override with defer_previews).
+    """
+    ingest = ImageIngest(board.id_data, board, paths)
+    ingest.step()
+    ingest.finish(defer_previews=not bpy.app.background if defer_previews is None else defer_previews)
+    board = ingest.get_board()
+    return [board.pins[idx] for idx in ingest.new_pin_indices]
+
+def add_image(board, image: bpy.types.Image, **fields):
+    """Adds a pin for an existing Image data-block. Extra keyword arguments set pin properties (note, tags, ...)."""
+    pin = core.new_pin(board, image)
+    for key, value in fields.items(): setattr(pin, key, value)
+    return pin
+
+# --- Querying ---
+def query(board, *, text: str = "", tags=None, selected: bool | None = None, has_image: bool | None = None) -> list:
+    """
+    Returns the pins of the board matching all given criteria:
+    text (substring of name or note), tags (any of the given tags), selection state and image presence.
+    """
+    mask = np.ones(len(board.pins), dtype=bool)
+    if selected is not None:
+        selection = core.get_selection(board)
+        mask &= selection if selected else ~selection
+    if tags is not None and isinstance(tags, str): tags = core.parse_tags(tags)
+    tag_set = {t.lower() for t in tags} if tags else set()
+    text = text.lower()
+    pins = board.pins
+    result = []
+    for idx in np.flatnonzero(mask).tolist():
+        pin = pins[idx]
+        if has_image is not None and (pin.image is not None) != has_image: continue
+        if text and not core.pin_matches_filter(pin, text, "", set()): continue
+        if tag_set and not tag_set.intersection(core.parse_tags(pin.tags)): continue
+        result.append(pin)
+    return result
+
+def select(board, pins=None, state: bool = True, extend: bool = False) -> int:
+    """
+    Sets the selection of the given pins (all pins if None) in one bulk write.
+    Without extend, all other pins are deselected. Returns the number of selected pins.
+    """
+    selection = core.get_selection(board) if extend or pins is None else np.zeros(len(board.pins), dtype=bool)
+    if pins is None: selection[:] = state
+    else: selection[_indices_on_board(board, pins)] = state
+    core.set_selection(board, selection)
+    return int(np.count_nonzero(selection))
+
+# --- Removing / transferring ---
+_PIN_PATH_RE = re.compile(r'^(.*)\.pins\[(\d+)\]$')
+
+def _group_by_board(pins) -> dict:
+    """Groups pins as {board pointer: (board, [indices])} using their RNA path."""
+    groups = {}
+    for pin in pins:
+        match = _PIN_PATH_RE.match(pin.path_from_id())
+        if not match: continue
+        board = pin.id_data.path_resolve(match.group(1))
+        groups.setdefault(board.as_pointer(), (board, []))[1].append(int(match.group(2)))
+    return groups
+
+def _indices_on_board(board, pins) -> list[int]:
+    """
+    Indices of the pins on the board: by uid, or by RNA path for pins without one
+    (older files), so that pins with an empty uid never match each other.
+    """
+    uids = set(); indices = []
+    board_path = None
+    for pin in pins:
+        if pin.uid: uids.add(pin.uid); continue
+        match = _PIN_PATH_RE.match(pin.path_from_id())
+        if board_path is None: board_path = board.path_from_id()
+        if match and match.group(1) == board_path and pin.id_data == board.id_data:
+            indices.append(int(match.group(2)))
+    if uids: indices.extend(idx for idx, pin in enumerate(board.pins) if pin.uid in uids)
+    return sorted(set(indices))
+
+def remove(pins, board=None) -> int:
+    """
+    Removes the given pins (which may belong to different boards; pass board to skip the
+    path lookup when they are all on one board). Images are kept. Returns the number removed.
+    """
+    pins = list(pins)
+    groups = {board.as_pointer(): (board, _indices_on_board(board, pins))} if board is not None else _group_by_board(pins)
+    removed = 0
+    for board, indices in groups.values():
+        for idx in sorted(set(indices), reverse=True): # From the end so indices do not shift
+            board.pins.remove(idx); removed += 1
+        board.active_pin_index = min(board.active_pin_index, len(board.pins) - 1)
+    core.tag_changed('selection', 'order')
+    return removed
+
+def copy_pins(pins, target, source=None) -> tuple[int, int]:
+    """Copies pins to the target board, sharing their images. Returns (copied, skipped duplicates)."""
+    return _transfer(pins, target, source, move=False)
+
+def move_pins(pins, target, source=None) -> tuple[int, int]:
+    """Moves pins to the target board, sharing their images. Returns (moved, skipped duplicates)."""
+    return _transfer(pins, target, source, move=True)
+
+def _transfer(pins, target, source, move: bool) -> tuple[int, int]:
+    pins = list(pins)
+    groups = {source.as_pointer(): (source, _indices_on_board(source, pins))} if source is not None else _group_by_board(pins)
+    done = duplicates = 0
+    for board, indices in groups.values():
+        count, dups = core.transfer_pins(board, target, indices, move=move)
+        done += count; duplicates += dups
+    return done, duplicates
+
+# --- Placement ---
+def layout_offsets(count: int, layout: str = 'STACK_X', size: float = 2.0, spacing: float = 0.2, columns: int = 4) -> np.ndarray:
+    """
+    Local offsets (count, 3) of placed images for a layout, centered around the origin
+    (STACK_Z goes straight back instead). Pure math, no Blender data involved.
+    """
+    if layout not in LAYOUTS: raise ValueError(f"Unknown layout '{layout}'")
+    step = size + spacing
+    i = np.arange(count, dtype=np.float64)
+    offsets = np.zeros((count, 3), dtype=np.float64)
+    if layout == 'STACK_X':
+        offsets[:, 0] = (i - (count - 1) / 2.0) * step
+    elif layout == 'STACK_Y':
+        offsets[:, 1] = (i - (count - 1) / 2.0) * step
+    elif layout == 'STACK_Z':
+        offsets[:, 2] = i * step # One behind the other, not centered
+    elif layout == 'GRID':
+        cols = max(1, columns)
+        rows = math.ceil(count / cols)
+        offsets[:, 0] = (i % cols - (cols - 1) / 2.0) * step
+        offsets[:, 1] = ((rows - 1) / 2.0 - i // cols) * step # Y goes down
+    return offsets
+
+def place(pins, layout: str = 'STACK_X', *, location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0),
+          size: float = 2.0, spacing: float = 0.2, columns: int = 4,
+          scene: bpy.types.Scene | None = None, collection: bpy.types.Collection | None = None) -> list:
+    """
+    Creates an Image Empty for every pin with an image, arranged by layout around location
+    and oriented by rotation (Euler, radians). Objects go to the "RefBoard Empties" collection
+    unless another collection is given. Works without any 3D View. Returns the new objects.
+    """
+    pins = [pin for pin in pins if pin.image]
+    scene = scene or bpy.context.scene
+    if collection is None:
+        collection = bpy.data.collections.get(PLACEMENT_COLLECTION)
+        if collection is None:
+            collection = bpy.data.collections.new(PLACEMENT_COLLECTION)
+        if collection.name not in scene.collection.children:
+            scene.collection.children.link(collection)
+    rotation = mathutils.Euler(rotation, 'XYZ')
+    orientation = rotation.to_quaternion()
+    base = mathutils.Vector(location)
+    objects = []
+    for pin, offset in zip(pins, layout_offsets(len(pins), layout, size, spacing, columns)):
+        obj = bpy.data.objects.new(f"Ref_{pin.pin_name or pin.image.name}", None)
+        obj.empty_display_type = 'IMAGE'
+        obj.data = pin.image
+        obj.empty_display_size = size
+        obj.show_name = False
+        obj.location = base + orientation @ mathutils.Vector(offset)
+        obj.rotation_euler = rotation
+        collection.objects.link(obj)
+        objects.append(obj)
+    return objects
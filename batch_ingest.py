@@ -0,0 +1,221 @@
+"""
+Command-line batch import: builds a reference .blend from a manifest of folders, files and URLs.
+
+    blender -b --python batch_ingest.py -- --manifest refs.json --output refs.blend [--pack] [--workers 8]
+
+Manifest (JSON)::
+
+    {
+      "output": "refs.blend",          (optional, --output wins)
+      "pack": false,                   (optional, --pack wins)
+      "boards": [
+        {"name": "Hands", "folders": ["/refs/hands"], "recursive": true,
+         "files": ["/refs/misc/hand.png"], "urls": ["https://example.com/hand.jpg"],
+         "tags": "hands, anatomy"}
+      ]
+    }
+
+Files are read and hashed and URLs downloaded on a thread pool; Blender data is only touched
+from the main thread, through the same ImageIngest path as the Add Pin operator. Previews and
+palettes are generated right away. When done, one line ``REFBOARD_STATS {...}`` with timing and
+throughput figures is printed (and written to --stats-file if given). The exit code is 1 if any
+board had errors, 2 for invalid arguments or manifest.
+"""
+import bpy
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import urllib.request
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+STATS_MARKER = "REFBOARD_STATS"
+IMAGE_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".tga", ".exr", ".hdr", ".webp", ".gif", ".psd",
+}
+DOWNLOAD_TIMEOUT = 30.0
+
+def _load_addon():
+    """Returns the RefBoard package, enabling the add-on if it is not yet (also when run from a source checkout)."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    name = os.path.basename(package_dir)
+    if name not in sys.modules:
+        import addon_utils
+        if addon_utils.enable(name, default_set=False) is None:
+            sys.path.insert(0, os.path.dirname(package_dir))
+            importlib.import_module(name).register()
+    return sys.modules[name]
+
+# --- Worker side (threads, no bpy access) ---
+def _collect_files(spec: dict) -> list[str]:
+    paths = [os.path.abspath(p) for p in spec.get("files", [])]
+    for folder in spec.get("folders", []):
+        if spec.get("recursive", False):
+            for root, _dirs, names in os.walk(folder):
+                paths.extend(os.path.join(root, n) for n in sorted(names))
+        else:
+            paths.extend(os.path.join(folder, n) for n in sorted(os.listdir(folder)))
+    return [os.path.abspath(p) for p in paths if os.path.splitext(p)[1].lower() in IMAGE_EXTENSIONS]
+
+def _download(url: str) -> tuple[bytes, str, dict]:
+    """Returns (data, file name, cache validators) of an image URL."""
+    request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as resp:
+        ctype = resp.info().get('Content-Type', '').lower()
+        if ctype and not ctype.startswith('image/'): raise ValueError(f"Not image (Type: {ctype})")
+        data = resp.read()
+        validators = {"etag": resp.info().get('ETag', ''), "last_modified": resp.info().get('Last-Modified', '')}
+    name = os.path.basename(urllib.parse.urlparse(url).path) or "web_image"
+    return data, name, validators
+
+# --- Main ---
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="batch_ingest.py", description="Build RefBoard boards from a manifest.")
+    parser.add_argument("--manifest", required=True, help="JSON manifest of boards")
+    parser.add_argument("--output", help="Where to save the .blend (default: manifest 'output', else the open file)")
+    parser.add_argument("--pack", action="store_true", help="Pack all images into the .blend")
+    parser.add_argument("--compress", action="store_true", help="Save the .blend compressed")
+    parser.add_argument("--no-purge", action="store_true", help="Keep unused data-blocks when saving")
+    parser.add_argument("--workers", type=int, default=8, help="Threads for reading files and downloading")
+    parser.add_argument("--stats-file", help="Also write the stats JSON to this file")
+    return parser.parse_args(argv)
+
+def run(args: argparse.Namespace) -> dict:
+    addon = _load_addon()
+    api = importlib.import_module(addon.__name__ + ".api")
+    image_utils = importlib.import_module(addon.__name__ + ".image_utils")
+    ImageIngest = importlib.import_module(addon.__name__ + ".ingest").ImageIngest
+
+    with open(args.manifest, encoding="utf-8") as f: manifest = json.load(f)
+    pack = args.pack or manifest.get("pack", False)
+    output = args.output or manifest.get("output") or bpy.data.filepath
+    if not output: raise ValueError("No output file given")
+
+    scene = bpy.context.scene
+    images_by_hash = image_utils.find_images_by_hash() # Content already in the file, reused instead of loaded again
+    timings = {"read": 0.0, "download": 0.0, "ingest": 0.0, "thumbnails": 0.0, "pack": 0.0, "save": 0.0}
+    totals = {"files": 0, "urls": 0, "added": 0, "skipped": 0, "errors": 0, "bytes": 0}
+    board_stats = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for spec in manifest.get("boards", []):
+            stats = {"name": spec["name"], "files": 0, "urls": 0, "added": 0, "skipped": 0, "errors": []}
+            board = api.get_board(spec["name"], scene) or api.create_board(spec["name"], scene)
+            board_uid = board.uid
+            pin_count = len(board.pins)
+
+            # Content already on this board is skipped; content elsewhere in the file is pinned again, not loaded again
+            board_hashes = {image_utils.get_image_hash(pin.image) for pin in board.pins if pin.image} - {None}
+
+            # Read and hash local files in parallel, dropping content already on the board
+            t = time.perf_counter()
+            paths = _collect_files(spec)
+            digests = dict(zip(paths, pool.map(image_utils.hash_file, paths)))
+            unique_paths = []; reused = []
+            for path in paths:
+                digest = digests[path]
+                if digest is None: stats["errors"].append([path, "Cannot read"]); continue
+                if digest in board_hashes: stats["skipped"] += 1; continue
+                board_hashes.add(digest)
+                if digest in images_by_hash: reused.append(images_by_hash[digest]); continue
+                unique_paths.append(path)
+                totals["bytes"] += os.path.getsize(path)
+            timings["read"] += time.perf_counter() - t
+            stats["files"] = len(paths)
+
+            # Load on the main thread through the shared ingest path
+            t = time.perf_counter()
+            ingest = ImageIngest(scene, board, unique_paths)
+            ingest.step()
+            stats["skipped"] += ingest.skipped
+            stats["errors"].extend([path, message] for path, message in ingest.errors)
+            board = ingest.get_board()
+            for idx in ingest.new_pin_indices:
+                img = board.pins[idx].image
+                digest = digests.get(os.path.abspath(bpy.path.abspath(img.filepath)))
+                if digest: img[image_utils.HASH_PROP] = digest; images_by_hash.setdefault(digest, img)
+            for img in reused: ingest.add_pin(board, img)
+            timings["ingest"] += time.perf_counter() - t
+
+            # Download URLs in parallel, load them from memory
+            urls = spec.get("urls", [])
+            t = time.perf_counter()
+            futures = [(url, pool.submit(_download, url)) for url in urls]
+            for url, future in futures:
+                try: data, name, validators = future.result()
+                except Exception as e: stats["errors"].append([url, str(e)]); continue
+                digest = image_utils.hash_bytes(data)
+                if digest in board_hashes: stats["skipped"] += 1; continue
+                board_hashes.add(digest)
+                img = images_by_hash.get(digest)
+                if img is None:
+                    totals["bytes"] += len(data)
+                    img = images_by_hash[digest] = image_utils.load_image_from_bytes(name, data, digest)
+                pin = ingest.add_pin(board, img)
+                pin.external_link = url; pin.source_hash = digest
+                pin.source_etag = validators["etag"]; pin.source_last_modified = validators["last_modified"]
+            timings["download"] += time.perf_counter() - t
+            stats["urls"] = len(urls)
+
+            # Tags, previews and palettes
+            t = time.perf_counter()
+            if spec.get("tags"):
+                for idx in ingest.new_pin_indices: board.pins[idx].tags = spec["tags"]
+            ingest.finish(defer_previews=False)
+            timings["thumbnails"] += time.perf_counter() - t
+
+            board = api.get_board(board_uid, scene)
+            stats["added"] = len(board.pins) - pin_count
+            board_stats.append(stats)
+            for key in ("files", "urls", "added", "skipped"): totals[key] += stats[key]
+            totals["errors"] += len(stats["errors"])
+
+    if pack:
+        t = time.perf_counter()
+        for img in bpy.data.images:
+            if img.source == 'FILE' and img.filepath and not img.packed_file and not img.library:
+                try: img.pack()
+                except RuntimeError as e: totals["errors"] += 1; print(f"RefBoard: cannot pack '{img.name}': {e}")
+        timings["pack"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    if not args.no_purge: bpy.data.orphans_purge(do_recursive=True)
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(output), compress=args.compress)
+    timings["save"] = time.perf_counter() - t
+
+    elapsed = time.perf_counter() - start
+    return {
+        "output": os.path.abspath(output),
+        "packed": bool(pack),
+        "workers": args.workers,
+        "elapsed": round(elapsed, 3),
+        "timings": {key: round(value, 3) for key, value in timings.items()},
+        "totals": totals,
+        "pins_per_second": round(totals["added"] / elapsed, 2) if elapsed else 0.0,
+        "megabytes_per_second": round(totals["bytes"] / elapsed / 1e6, 2) if elapsed else 0.0,
+        "boards": board_stats,
+    }
+
+def main() -> int:
+    try:
+        args = parse_args(sys.argv)
+    except SystemExit as e:
+        return e.code or 0
+    try:
+        stats = run(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{STATS_MARKER} " + json.dumps({"error": str(e)}))
+        return 2
+    line = json.dumps(stats)
+    print(f"{STATS_MARKER} {line}")
+    if args.stats_file:
+        with open(args.stats_file, 'w', encoding="utf-8") as f: f.write(line + "\n")
+    return 1 if stats["totals"]["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Timing of the hot board operations at growing pin counts, for catching performance regressions.
+
+Outside Blender (bpy stand-in, see bpy_standin.py):
+    python benchmarks/bench_pins.py --output bench.json [--compare baseline.json]
+Inside Blender (the real numbers; the add-on is enabled from this checkout if needed):
+    blender -b --python benchmarks/bench_pins.py -- --output bench_blender.json
+
+Benchmarks, each at every size (default 100, 1k, 10k and 50k pins):
+    filter_cold       REFBOARD_UL_pins.filter_items() with name and tag filters, caches dropped
+    filter_cached     the same call again, as on every redraw
+    select_all        SelectAllPins on an unselected board
+    remove_selected   RemoveSelectedPins with every other pin selected
+    duplicate_check   the AddPinFromFile ingest of 200 files, half of them already on the board
+    layout_grid       the PlacePinInView layout math (api.layout_offsets) for all pins
+
+Results are the min and median of --repeat runs in milliseconds. With --compare, medians are
+checked against an earlier result file of the same mode; the exit code is 1 if any benchmark got
+slower than --threshold times the baseline.
+"""
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+import tempfile
+import importlib
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+IMAGE_POOL = 512      # Pins share images, as on real boards with copies across boards
+INGEST_FILES = 200
+TAGS = ("ref, anatomy", "ref, hands", "light", "color, mood", "")
+
+def _in_blender() -> bool:
+    try: import bpy
+    except ImportError: return False
+    return not getattr(bpy, "STANDIN", False)
+
+def load_addon():
+    """Imports the add-on package (without registering it in stand-in mode). Returns (package name, mode)."""
+    name = os.path.basename(ROOT)
+    if _in_blender():
+        if name not in sys.modules:
+            import addon_utils
+            if addon_utils.enable(name, default_set=False) is None:
+                sys.path.insert(0, os.path.dirname(ROOT))
+                importlib.import_module(name).register()
+        return name, "blender"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import bpy_standin
+    bpy_standin.install()
+    if name not in sys.modules: # Already imported by the test runner (see conftest.py), unregistered
+        package = types.ModuleType(name); package.__path__ = [ROOT]
+        sys.modules[name] = package # Skips the package __init__: nothing is registered with the stand-in
+    return name, "standin"
+
+def measure(func, repeat: int, setup=None) -> dict:
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        start = time.perf_counter(); func(); times.append((time.perf_counter() - start) * 1000.0)
+    return {"min_ms": round(min(times), 4), "median_ms": round(statistics.median(times), 4), "repeat": repeat}
+
+class Bench:
+    def __init__(self, package: str, mode: str, repeat: int):
+        module = lambda sub: importlib.import_module(f"{package}.{sub}")
+        self.bpy = importlib.import_module("bpy")
+        self.core = module("core"); self.api = module("api")
+        self.board_cache = module("board_cache"); self.image_utils = module("image_utils")
+        self.ImageIngest = module("ingest").ImageIngest
+        self.pin_ops = module("operators.pin_ops"); self.uilists = module("ui.uilists")
+        self.mode = mode; self.repeat = repeat
+        if mode == "blender":
+            self.context = self.bpy.context; self.scene = self.bpy.context.scene
+        else:
+            standin = sys.modules["bpy_standin"]
+            self.scene = standin.new_scene(module("properties")); self.context = standin.context
+        self.images = [self.bpy.data.images.new(f"bench_{i}", 8, 8) for i in range(IMAGE_POOL)]
+        self.tempdir = tempfile.mkdtemp(prefix="refboard_bench_")
+        pixels = self.image_utils.np.full((8, 8, 4), 128, dtype=self.image_utils.np.uint8)
+        self.files = []
+        for i in range(INGEST_FILES):
+            path = os.path.join(self.tempdir, f"ingest_{i:04d}.png")
+            with open(path, 'wb') as f: f.write(self.image_utils.encode_png(pixels))
+            self.files.append(path)
+
+    def cleanup(self) -> None:
+        for img in self.images: self.bpy.data.images.remove(img)
+        for path in self.files: os.remove(path)
+        os.rmdir(self.tempdir)
+
+    # --- Board setup ---
+    def get_board(self):
+        return self.core.find_board(self.scene, self.board_uid)[1]
+
+    def fill(self, board, count: int) -> None:
+        for i in range(len(board.pins), len(board.pins) + count):
+            pin = self.core.new_pin(board, self.images[i % IMAGE_POOL])
+            pin.pin_name = f"pin_{i:06d}"; pin.tags = TAGS[i % len(TAGS)]
+
+    def make_board(self, size: int) -> None:
+        board = self.core.new_board(self.scene, f"Bench {size}")
+        self.board_uid = board.uid
+        self.scene.refboard_active_board_index = len(self.core.get_boards(self.scene)) - 1
+        self.fill(board, size)
+
+    # --- Benchmarks ---
+    def run_size(self, size: int) -> dict:
+        np = self.image_utils.np
+        self.make_board(size)
+        results = {}
+        ul = types.SimpleNamespace(bitflag_filter_item=getattr(self.uilists.REFBOARD_UL_pins, "bitflag_filter_item", 1 << 30))
+        board = self.get_board()
+        board.applied_pin_filter = "pin_0"; board.applied_tag_filter = "ref"
+        filter_items = lambda: self.uilists.REFBOARD_UL_pins.filter_items(ul, self.context, self.get_board(), "pins")
+        results["filter_cold"] = measure(filter_items, self.repeat, setup=self.board_cache.invalidate)
+        filter_items()
+        results["filter_cached"] = measure(filter_items, self.repeat)
+        board.applied_pin_filter = ""; board.applied_tag_filter = ""
+
+        report = lambda *_args: None
+        select_op = types.SimpleNamespace(select_mode=True, use_filter=False, report=report)
+        deselect = lambda: self.core.set_selection(self.get_board(), np.zeros(size, dtype=bool))
+        results["select_all"] = measure(
+            lambda: self.pin_ops.REFBOARD_OT_SelectAllPins.execute(select_op, self.context), self.repeat, setup=deselect)
+
+        remove_op = types.SimpleNamespace(report=report)
+        def select_every_other():
+            board = self.get_board()
+            self.fill(board, size - len(board.pins)) # Put back what the last run removed
+            selection = np.zeros(size, dtype=bool); selection[::2] = True
+            self.core.set_selection(board, selection)
+        results["remove_selected"] = measure(
+            lambda: self.pin_ops.REFBOARD_OT_RemoveSelectedPins.execute(remove_op, self.context), self.repeat, setup=select_every_other)
+        board = self.get_board()
+        self.fill(board, size - len(board.pins))
+
+        # Half of the files are already on the board, the other half is new
+        known = [self.bpy.data.images.load(path, check_existing=False) for path in self.files[:INGEST_FILES // 2]]
+        for pin, img in zip(board.pins, known): pin.image = img
+        def ingest():
+            ingest = self.ImageIngest(self.scene, self.get_board(), self.files)
+            ingest.step(); self.last_ingest = ingest
+        def undo_ingest():
+            ingest = getattr(self, "last_ingest", None)
+            if ingest is None: return
+            board = self.get_board()
+            new_images = [board.pins[idx].image for idx in ingest.new_pin_indices]
+            self.api.remove([board.pins[idx] for idx in ingest.new_pin_indices], board=board)
+            for img in new_images: self.bpy.data.images.remove(img)
+            self.last_ingest = None
+        results["duplicate_check"] = measure(ingest, self.repeat, setup=undo_ingest)
+        undo_ingest()
+        for pin, i in zip(board.pins, range(len(known))): pin.image = self.images[i % IMAGE_POOL]
+        for img in known: self.bpy.data.images.remove(img)
+
+        results["layout_grid"] = measure(lambda: self.api.layout_offsets(size, 'GRID', 2.0, 0.2, 8), self.repeat)
+        self.api.remove_board(self.get_board())
+        return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Prints median ratios against the baseline; returns the names of regressed benchmarks."""
+    if baseline.get("mode") != results["mode"]:
+        print(f"Baseline mode '{baseline.get('mode')}' differs from '{results['mode']}', ratios are not meaningful.")
+    regressions = []
+    for name, by_size in results["benchmarks"].items():
+        for size, current in by_size.items():
+            before = baseline.get("benchmarks", {}).get(name, {}).get(size)
+            if not before or not before["median_ms"]: continue
+            ratio = current["median_ms"] / before["median_ms"]
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{name:<18}{size:>7}  {before['median_ms']:>10.3f} -> {current['median_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+            if flag: regressions.append(f"{name}@{size}")
+    return regressions
+
+def main() -> int:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(prog="bench_pins.py", description="RefBoard pin operation benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as regression")
+    args = parser.parse_args(argv)
+
+    package, mode = load_addon()
+    bench = Bench(package, mode, args.repeat)
+    results = {
+        "mode": mode,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "blender": ".".join(map(str, bench.bpy.app.version)) if mode == "blender" else None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": args.sizes,
+        "benchmarks": {},
+    }
+    try:
+        for size in args.sizes:
+            start = time.perf_counter()
+            for name, timing in bench.run_size(size).items():
+                results["benchmarks"].setdefault(name, {})[str(size)] = timing
+            print(f"{size} pins done in {time.perf_counter() - start:.1f}s")
+    finally:
+        bench.cleanup()
+
+    for name, by_size in results["benchmarks"].items():
+        print(f"{name:<18}" + "".join(f"{size:>8}: {t['median_ms']:>9.3f} ms" for size, t in by_size.items()))
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8") as f: json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f: baseline = json.load(f)
+        if compare(results, baseline, args.threshold): return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
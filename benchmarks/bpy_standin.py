@@ -0,0 +1,223 @@
+"""
+Minimal stand-in for the parts of ``bpy`` RefBoard touches, so its modules can be imported and
+timed with a plain Python interpreter. It mimics the data model, not Blender's speed:
+
+- PropertyGroup instances get their defaults from the class annotations (the real property
+  classes of properties.py are used) and run ``update`` callbacks on assignment,
+- CollectionProperty is a list with add/remove/move/clear and foreach_get/foreach_set,
+- Image data-blocks, bpy.data.images.load(), timers and handlers are simple Python objects.
+
+foreach_get/foreach_set loop in Python here, where Blender does it in C, so absolute numbers
+differ from Blender; compare runs of the same mode only. Use install() before importing the add-on.
+"""
+import os
+import sys
+import types
+import itertools
+
+_DEFAULTS = {
+    "StringProperty": "", "BoolProperty": False, "IntProperty": 0, "FloatProperty": 0.0,
+    "PointerProperty": None,
+}
+
+class _PropSpec:
+    """What a bpy.props function returns here: the property kind and its keyword arguments."""
+    __slots__ = ("kind", "kw")
+
+    def __init__(self, kind: str, kw: dict):
+        self.kind = kind; self.kw = kw
+
+    def default(self):
+        kw = self.kw
+        if self.kind == "CollectionProperty": return Collection(kw.get("type"))
+        if "default" in kw:
+            value = kw["default"]
+            return list(value) if isinstance(value, (tuple, list)) else value
+        if self.kind == "FloatVectorProperty": return [0.0] * kw.get("size", 3)
+        if self.kind == "EnumProperty":
+            items = kw.get("items")
+            return items[0][0] if isinstance(items, (list, tuple)) and items else ""
+        return _DEFAULTS.get(self.kind)
+
+def _prop_function(kind: str):
+    return lambda **kw: _PropSpec(kind, kw)
+
+_pointers = itertools.count(1)
+
+class PropertyGroup:
+    """Struct with annotation-defined properties; assignments run the property's update callback."""
+    _specs_cache = {}
+
+    @classmethod
+    def _specs(cls) -> dict:
+        specs = PropertyGroup._specs_cache.get(cls)
+        if specs is None:
+            specs = {}
+            for klass in reversed(cls.__mro__):
+                for name, spec in vars(klass).get("__annotations__", {}).items():
+                    if isinstance(spec, _PropSpec): specs[name] = spec
+            PropertyGroup._specs_cache[cls] = specs
+        return specs
+
+    def __init__(self, id_data=None):
+        object.__setattr__(self, "_pointer", next(_pointers))
+        object.__setattr__(self, "id_data", id_data or self) # The owning ID (scene); IDs own themselves
+        object.__setattr__(self, "name", "")
+        for name, spec in self._specs().items():
+            value = spec.default()
+            if isinstance(value, Collection): value.id_data = self.id_data
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        spec = self._specs().get(name)
+        update = spec.kw.get("update") if spec is not None else None
+        if update is not None: update(self, context)
+
+    def as_pointer(self) -> int: return self._pointer
+
+class Collection(list):
+    """CollectionProperty stand-in."""
+    def __init__(self, item_type=None):
+        super().__init__(); self.item_type = item_type or PropertyGroup; self.id_data = None
+
+    def add(self):
+        item = self.item_type(self.id_data); self.append(item)
+        return item
+
+    def remove(self, index: int) -> None: del self[index]
+
+    def move(self, src: int, dst: int) -> None: self.insert(dst, self.pop(src))
+
+    def foreach_get(self, attr: str, seq) -> None:
+        seq[:] = [getattr(item, attr) for item in self]
+
+    def foreach_set(self, attr: str, seq) -> None:
+        for item, value in zip(self, seq.tolist() if hasattr(seq, "tolist") else seq):
+            object.__setattr__(item, attr, value)
+
+    def get(self, key, default=None):
+        return next((item for item in self if item.name == key), default)
+
+class _Struct:
+    """Base for other registrable types (Operator, Panel, UIList, ...)."""
+    bitflag_filter_item = 1 << 30
+    def report(self, _type, _message): pass
+
+class _Pixels:
+    def foreach_get(self, seq) -> None: seq[:] = 1.0
+
+class Image:
+    """Image data-block stand-in. Images are 'generated' unless a filepath is given, so no file checks run."""
+    def __init__(self, name: str, filepath: str = ""):
+        self.name = self.name_full = name
+        self.filepath = filepath
+        self.source = 'FILE' if filepath else 'GENERATED'
+        self.packed_file = None
+        self.library = None
+        self.size = (64, 64)
+        self.preview = None
+        self._pointer = next(_pointers)
+        self._id_props = {}
+    def as_pointer(self) -> int: return self._pointer
+    def reload(self): pass
+    def preview_ensure(self): return None
+    def pack(self, data: bytes = b"", data_len: int = 0) -> None:
+        self.packed_file = types.SimpleNamespace(data=data, size=data_len or len(data))
+    @property
+    def pixels(self): return _Pixels() # Opaque white, pixel data is not decoded
+    def get(self, key, default=None): return self._id_props.get(key, default)
+    def __getitem__(self, key): return self._id_props[key]
+    def __setitem__(self, key, value): self._id_props[key] = value
+
+class _Images(Collection):
+    def __init__(self): super().__init__(Image)
+    def new(self, name: str, width: int = 8, height: int = 8, **_kw):
+        img = Image(name); self.append(img); return img
+    def load(self, filepath: str, check_existing: bool = False):
+        img = Image(os.path.basename(filepath), filepath); self.append(img); return img
+    def remove(self, image, do_unlink: bool = True) -> None: list.remove(self, image)
+
+class _Timers:
+    def __init__(self): self._registered = set()
+    def register(self, function, first_interval=0.0, persistent=False): self._registered.add(function)
+    def unregister(self, function): self._registered.discard(function)
+    def is_registered(self, function) -> bool: return function in self._registered
+
+class Scene(PropertyGroup):
+    """Scene stand-in; new_scene() adds the add-on's scene properties as class annotations."""
+    __annotations__ = {}
+    library = None
+    @property
+    def name_full(self) -> str: return self.name
+
+class Text(PropertyGroup):
+    """Text data-block stand-in, used as the board store; new_scene() adds the store properties."""
+    __annotations__ = {}
+    library = None
+    use_fake_user = False
+    def write(self, text: str) -> None: pass
+    @property
+    def name_full(self) -> str: return self.name
+
+class _Texts(Collection):
+    def __init__(self): super().__init__(Text)
+    def new(self, name: str):
+        text = self.add(); text.name = name; return text
+    def get(self, key, default=None):
+        if isinstance(key, tuple): # (name, library path)
+            return next((item for item in self if (item.name, item.library) == key), default)
+        return super().get(key, default)
+
+def _make_module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name); module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+context = types.SimpleNamespace(scene=None, area=None, region=None, window=None, window_manager=None)
+
+def install() -> types.ModuleType:
+    """Installs the stand-in as bpy and bpy_extras (and mathutils, if missing) in sys.modules and returns it."""
+    if getattr(sys.modules.get("bpy"), "STANDIN", False): return sys.modules["bpy"] # Already installed (e.g. by conftest.py)
+    handlers = _make_module(
+        "bpy.app.handlers", persistent=lambda f: f,
+        load_post=[], load_pre=[], undo_post=[], redo_post=[], save_pre=[], depsgraph_update_post=[],
+    )
+    app = types.SimpleNamespace(handlers=handlers, timers=_Timers(), background=True, version=(0, 0, 0), version_string="standin", debug_python=False)
+    props = _make_module("bpy.props", **{
+        kind: _prop_function(kind) for kind in (
+            "StringProperty", "BoolProperty", "IntProperty", "FloatProperty", "FloatVectorProperty",
+            "EnumProperty", "PointerProperty", "CollectionProperty",
+        )
+    })
+    bpy_types = _make_module("bpy.types", PropertyGroup=PropertyGroup, Image=Image, Scene=Scene, Text=Text)
+    bpy_types.__getattr__ = lambda name: type(name, (_Struct,), {}) # Operator, Panel, UIList, ...
+    data = types.SimpleNamespace(images=_Images(), scenes=Collection(Scene), texts=_Texts(), filepath="", objects=Collection(), collections=Collection())
+    utils = types.SimpleNamespace(
+        register_class=lambda cls: None, unregister_class=lambda cls: None,
+        register_classes_factory=lambda classes: (lambda: None, lambda: None),
+        user_resource=lambda *args, **kw: os.path.join(os.path.expanduser("~"), ".refboard_bench"),
+        previews=types.SimpleNamespace(new=lambda: {}, remove=lambda p: None),
+    )
+    path = types.SimpleNamespace(abspath=lambda p, library=None: p, clean_name=lambda n: n)
+    bpy = _make_module(
+        "bpy", app=app, props=props, types=bpy_types, data=data, utils=utils, path=path,
+        context=context, ops=types.SimpleNamespace(), STANDIN=True,
+    )
+    sys.modules["bpy.app"] = app
+    io_utils = _make_module("bpy_extras.io_utils", ExportHelper=_Struct, ImportHelper=_Struct)
+    _make_module("bpy_extras", io_utils=io_utils)
+    if "mathutils" not in sys.modules:
+        try: import mathutils # noqa: F401 (the real one, e.g. from the bpy wheel)
+        except ImportError: _make_module("mathutils", Vector=tuple, Euler=tuple, Matrix=object, Quaternion=tuple)
+    return bpy
+
+def new_scene(properties_module) -> Scene:
+    """Creates a scene carrying the add-on's scene and store properties, as properties.register() would add them."""
+    Scene.__annotations__.update(properties_module.scene_props)
+    Text.__annotations__.update(properties_module.store_props)
+    PropertyGroup._specs_cache.pop(Scene, None); PropertyGroup._specs_cache.pop(Text, None)
+    scene = Scene(); scene.name = "Scene"
+    sys.modules["bpy"].data.scenes.append(scene)
+    context.scene = scene
+    return scene
@@ -0,0 +1,116 @@
+import bpy
+import os
+import numpy as np
+from bpy.app.handlers import persistent
+# Relative import of core
+from . import core
+
+# Runtime-only aggregates per board, keyed by the board's uid (see core.get_board_key).
+# Nothing here is saved into the .blend file; everything can be rebuilt from the pins.
+_cache = {}
+
+class BoardStats:
+    """Cached per-board counters. Read them through get_board_stats(), never build directly."""
+    __slots__ = (
+        "pin_count", "selected", "selected_valid", "valid_images", "missing_images",
+        "valid_mask", "filter_mask", "filter_key",
+        "selection_gen", "images_gen", "order_gen",
+    )
+
+    def __init__(self, pin_count: int):
+        self.pin_count = pin_count
+        self.selected = 0          # Pins with is_selected
+        self.selected_valid = 0    # Selected pins that have an image (placeable)
+        self.valid_images = 0      # Pins with an image whose data is available
+        self.missing_images = 0    # Pins without image, or whose source file is gone
+        self.valid_mask = np.zeros(pin_count, dtype=bool)
+        self.filter_mask = None
+        self.filter_key = None
+        self.selection_gen = -1
+        self.images_gen = -1
+        self.order_gen = -1        # valid_mask is per index: moving pins invalidates it
+
+def _image_is_missing(img) -> bool:
+    if img.packed_file or img.source not in {'FILE', 'SEQUENCE', 'MOVIE'}:
+        return False
+    return not os.path.exists(bpy.path.abspath(img.filepath, library=img.library))
+
+def _update_images(stats: BoardStats, board) -> None:
+    missing_by_image = {} # Images shared by several pins are checked once
+    valid = stats.valid_mask
+    missing_count = 0
+    for i, pin in enumerate(board.pins):
+        img = pin.image
+        if img is None:
+            valid[i] = False; missing_count += 1
+            continue
+        missing = missing_by_image.get(img.name_full)
+        if missing is None:
+            missing = missing_by_image[img.name_full] = _image_is_missing(img)
+        valid[i] = not missing
+        missing_count += missing
+    stats.valid_images = int(np.count_nonzero(valid))
+    stats.missing_images = missing_count
+    stats.images_gen = core.get_generation('images')
+    stats.order_gen = core.get_generation('order')
+
+def _update_selection(stats: BoardStats, board) -> None:
+    selection = core.get_selection(board)
+    stats.selected = int(np.count_nonzero(selection))
+    stats.selected_valid = int(np.count_nonzero(selection & stats.valid_mask))
+    stats.selection_gen = core.get_generation('selection')
+
+def get_board_stats(board) -> BoardStats:
+    """
+    Returns the cached counters of a board. While nothing changed this is a dict lookup
+    plus a few integer compares, so it is safe to call from poll() and draw().
+    """
+    key = core.get_board_key(board)
+    pin_count = len(board.pins)
+    stats = _cache.get(key)
+    if stats is None or stats.pin_count != pin_count: # Pins were added or removed
+        stats = _cache[key] = BoardStats(pin_count)
+    if stats.images_gen != core.get_generation('images') or stats.order_gen != core.get_generation('order'):
+        _update_images(stats, board)
+        stats.selection_gen = -1 # selected_valid depends on the image mask
+    if stats.selection_gen != core.get_generation('selection'):
+        _update_selection(stats, board)
+    return stats
+
+def get_filter_mask(board) -> np.ndarray:
+    """Cached version of core.get_filter_mask(), rebuilt when the filters or pin texts change."""
+    stats = get_board_stats(board)
+    filter_key = (board.applied_pin_filter, board.applied_tag_filter, core.get_generation('text'), core.get_generation('order'))
+    if stats.filter_mask is None or stats.filter_key != filter_key:
+        stats.filter_mask = core.get_filter_mask(board)
+        stats.filter_key = filter_key
+    return stats.filter_mask
+
+def invalidate(board=None) -> None:
+    """Drops the cache of one board, or of all boards if no board is given."""
+    if board is None: _cache.clear()
+    else: _cache.pop(core.get_board_key(board), None)
+
+# --- Handlers ---
+# Undo and file loading re-create all RNA data, so pointers used as keys are no longer valid.
+@persistent
+def _clear_cache_handler(*_args):
+    invalidate()
+    core.tag_changed()
+
+_handlers = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    for handler_list in _handlers:
+        if _clear_cache_handler not in handler_list:
+            handler_list.append(_clear_cache_handler)
+
+def unregister():
+    for handler_list in _handlers:
+        if _clear_cache_handler in handler_list:
+            handler_list.remove(_clear_cache_handler)
+    invalidate()
@@ -0,0 +1,394 @@
+import bpy
+import math
+import numpy as np
+from collections import OrderedDict
+from bpy.app.handlers import persistent
+# Relative imports
+from . import core
+from . import image_utils
+from .scheduling import enqueue_task, request_area_redraw
+
+# Free-form canvas of a board, drawn with the gpu module over an Image Editor region.
+# Pin rectangles of the whole board are computed at once with numpy from the canvas positions
+# (foreach_get), so culling thousands of pins costs a few array operations per frame.
+# Every visible pin is drawn from the power-of-two mip level matching its size on screen.
+# Levels are made by background tasks (from the image preview up to PREVIEW_LEVEL, from a scaled
+# copy of the image above that, so full-resolution images are only read for pins zoomed in on)
+# and uploaded as GPU textures a few per frame. Until a level is ready the nearest cached one,
+# or the pin's dominant color, is drawn. Textures live in an LRU cache with a byte budget.
+
+BASE_SIZE = 512.0       # Canvas units of the longest side of a pin at canvas_scale 1
+MIN_LEVEL = 32          # Mip levels are the longest side in pixels, powers of two
+MAX_LEVEL = 4096
+PREVIEW_LEVEL = 256     # Levels up to this are made from the image preview
+CACHE_BUDGET = 384 * 1024 * 1024 # Bytes of GPU textures kept before the least recently used are freed
+UPLOADS_PER_FRAME = 6   # Textures created per redraw, so streaming never stalls a frame
+STALE_FRAMES = 3        # Queued loads not requested again within this many frames are dropped
+MIN_TEXTURE_PIXELS = 6  # Pins smaller than this on screen are drawn as a flat color
+GRID_PADDING = 0.08     # Gap between auto-placed pins, relative to BASE_SIZE
+BACKGROUND = (0.11, 0.11, 0.11, 1.0)
+SELECTION_COLOR = (1.0, 0.55, 0.1, 1.0)
+HINT = "Wheel: Zoom  ·  MMB / Drag Empty: Pan  ·  Drag: Move  ·  Alt+Wheel: Scale  ·  Home: Frame All  ·  Esc: Close"
+
+_canvas_areas = {} # Area pointer -> uid of the board shown in it
+_draw_handle = None
+_gpu = {}          # Shaders and the unit quad batch, created on the first draw
+_board_data = {}   # Board uid -> per-board arrays that only change with the pin order
+
+def fit_size(level: int, aspect: float) -> tuple[int, int]:
+    """(width, height) with the longest side equal to level."""
+    if aspect >= 1.0: return level, max(1, round(level / aspect))
+    return max(1, round(level * aspect)), level
+
+def level_for(pixels: float) -> int:
+    """The smallest mip level at least as large as the given on-screen size."""
+    level = MIN_LEVEL
+    while level < pixels and level < MAX_LEVEL: level *= 2
+    return level
+
+def _levels_near(level: int):
+    """The level, then smaller levels, then larger ones: the order fallbacks are tried in."""
+    candidate = level
+    while candidate >= MIN_LEVEL: yield candidate; candidate //= 2
+    candidate = level * 2
+    while candidate <= MAX_LEVEL: yield candidate; candidate *= 2
+
+def _tag_redraw() -> None:
+    for area_pointer in _canvas_areas: request_area_redraw(area_pointer)
+
+# --- Mip cache ---
+class MipCache:
+    """GPU textures of pins at power-of-two sizes, keyed by (pin uid, level)."""
+    def __init__(self, budget: int = CACHE_BUDGET):
+        self.budget = budget; self.used = 0
+        self.textures = OrderedDict() # (uid, level) -> (GPUTexture, bytes), least recently used first
+        self.ready = {}     # (uid, level) -> (width, height, float32 RGBA rows bottom-up), awaiting upload
+        self.pending = set()  # Keys queued as background tasks
+        self.requested = {} # Key -> frame it was last asked for
+        self.sources = {}   # uid -> pointer of the image its levels were made from
+        self.aspects = {}   # uid -> width / height, once known
+        self.native = {}    # uid -> longest side of the full image, once read
+        self.frame = 0
+
+    def clear(self) -> None:
+        self.textures.clear(); self.ready.clear(); self.pending.clear(); self.requested.clear()
+        self.sources.clear(); self.aspects.clear(); self.native.clear(); self.used = 0
+
+    def forget(self, uid: str) -> None:
+        """Drops all levels of a pin (its image changed)."""
+        for key in [key for key in self.textures if key[0] == uid]:
+            self.used -= self.textures.pop(key)[1]
+        for key in [key for key in self.ready if key[0] == uid]: del self.ready[key]
+        self.sources.pop(uid, None); self.aspects.pop(uid, None); self.native.pop(uid, None)
+
+    def validate(self, board) -> None:
+        """Forgets pins of the board whose image is no longer the one their levels were made from."""
+        for pin in board.pins:
+            source = self.sources.get(pin.uid)
+            if source is not None and source != (pin.image.as_pointer() if pin.image else 0):
+                self.forget(pin.uid)
+
+    def best(self, uid: str, level: int):
+        """(texture, level) of the wanted level or the nearest cached one; (None, 0) if there is none."""
+        native = self.native.get(uid)
+        if native: level = min(level, level_for(native))
+        for candidate in _levels_near(level):
+            key = (uid, candidate)
+            entry = self.textures.get(key)
+            if entry is not None:
+                self.textures.move_to_end(key)
+                return entry[0], candidate
+        return None, 0
+
+    def request(self, store_key: str, board_uid: str, uid: str, hint: int, level: int) -> None:
+        """Queues making the level unless it is cached, waiting for upload or already queued."""
+        native = self.native.get(uid)
+        if native: level = min(level, level_for(native))
+        key = (uid, level)
+        if key in self.textures or key in self.ready: return
+        self.requested[key] = self.frame
+        if key in self.pending: return
+        self.pending.add(key)
+        enqueue_task(lambda: self._load(store_key, board_uid, uid, hint, level))
+
+    def _load(self, store_key: str, board_uid: str, uid: str, hint: int, level: int) -> None:
+        key = (uid, level)
+        try:
+            if self.frame - self.requested.get(key, -STALE_FRAMES - 1) > STALE_FRAMES: return # Scrolled away
+            store = core.find_store(store_key)
+            board = core.find_board(store, board_uid)[1] if store else None
+            idx = core.find_pin_index(board, uid, hint) if board else -1
+            img = board.pins[idx].image if idx >= 0 else None
+            if img is None: return
+            pixels = self._make_level(uid, img, level)
+        finally:
+            self.pending.discard(key); self.requested.pop(key, None)
+        if pixels is not None:
+            self.ready[key] = pixels; self.sources[uid] = img.as_pointer()
+            _tag_redraw()
+
+    def _make_level(self, uid: str, img: bpy.types.Image, level: int):
+        from .contact_sheet import resample, read_pin_pixels
+        if level <= PREVIEW_LEVEL:
+            rgba = image_utils.get_preview_rgba(img)
+            if rgba is None: return None
+            height, width = rgba.shape[:2]
+            self.aspects[uid] = width / height
+            w, h = fit_size(min(level, max(width, height)), width / height)
+            rgba = resample(rgba.astype(np.float32) / 255.0, w, h)
+        else:
+            was_loaded = img.has_data
+            try:
+                width, height = img.size # Loads the image once, the scaled copy below reuses it
+                if not width or not height: return None
+                self.native[uid] = max(width, height); self.aspects[uid] = width / height
+                w, h = fit_size(min(level, max(width, height)), width / height)
+                rgba = read_pin_pixels(img, w, h)
+            finally:
+                if not was_loaded: img.buffers_free()
+        return w, h, np.ascontiguousarray(rgba[::-1], dtype=np.float32).ravel()
+
+    def upload(self, limit: int = UPLOADS_PER_FRAME) -> None:
+        """Turns up to limit ready levels into GPU textures and frees textures beyond the budget."""
+        import gpu
+        for key in list(self.ready)[:limit]:
+            width, height, pixels = self.ready.pop(key)
+            texture = gpu.types.GPUTexture((width, height), format='RGBA8', data=gpu.types.Buffer('FLOAT', len(pixels), pixels))
+            self.textures[key] = (texture, width * height * 4); self.used += width * height * 4
+        while self.used > self.budget and len(self.textures) > 1:
+            _key, (_texture, size) = self.textures.popitem(last=False)
+            self.used -= size
+
+_cache = MipCache()
+
+# --- Geometry (canvas units, y down; screen is region pixels, y up) ---
+def _get_board_data(board) -> dict:
+    key = (len(board.pins), core.get_generation('order'), len(_cache.aspects))
+    data = _board_data.get(board.uid)
+    if data is None or data["key"] != key:
+        uids = data["uids"] if data and data["key"][:2] == key[:2] else [pin.uid for pin in board.pins]
+        aspects = np.fromiter((_cache.aspects.get(uid, 1.0) for uid in uids), dtype=np.float32, count=len(uids))
+        data = _board_data[board.uid] = {"key": key, "uids": uids, "aspects": aspects}
+    return data
+
+def _read_floats(board, prop: str) -> np.ndarray:
+    values = np.empty(len(board.pins), dtype=np.float32)
+    board.pins.foreach_get(prop, values)
+    return values
+
+def get_positions(board) -> tuple[np.ndarray, np.ndarray]:
+    """Canvas x and y (top-left corner) of every pin."""
+    return _read_floats(board, "canvas_x"), _read_floats(board, "canvas_y")
+
+def get_pin_sizes(board) -> tuple[np.ndarray, np.ndarray]:
+    """Width and height of every pin in canvas units."""
+    aspects = _get_board_data(board)["aspects"]
+    scales = _read_floats(board, "canvas_scale") * BASE_SIZE
+    wide = aspects >= 1.0
+    return np.where(wide, scales, scales * aspects), np.where(wide, scales / aspects, scales)
+
+def get_screen_rects(board, width: int, height: int) -> tuple[np.ndarray, ...]:
+    """(x, y, width, height) arrays of all pins in region pixels, y of the bottom edge."""
+    zoom = board.canvas_zoom
+    widths, heights = get_pin_sizes(board)
+    x = (_read_floats(board, "canvas_x") - board.canvas_view_x) * zoom + width / 2
+    top = height / 2 - (_read_floats(board, "canvas_y") - board.canvas_view_y) * zoom
+    return x, top - heights * zoom, widths * zoom, heights * zoom
+
+def hit_test(board, width: int, height: int, x: float, y: float) -> int:
+    """Index of the topmost pin at the region position, or -1."""
+    if not board.pins: return -1
+    sx, sy, sw, sh = get_screen_rects(board, width, height)
+    hits = np.flatnonzero((sx <= x) & (x < sx + sw) & (sy <= y) & (y < sy + sh))
+    return int(hits[-1]) if len(hits) else -1
+
+# --- View and arrangement ---
+def zoom_at(board, width: int, height: int, x: float, y: float, factor: float) -> None:
+    """Zooms by factor keeping the canvas point under the region position in place."""
+    zoom = board.canvas_zoom
+    canvas_x = board.canvas_view_x + (x - width / 2) / zoom
+    canvas_y = board.canvas_view_y - (y - height / 2) / zoom
+    board.canvas_zoom = zoom * factor
+    zoom = board.canvas_zoom # Clamped by the property
+    board.canvas_view_x = canvas_x - (x - width / 2) / zoom
+    board.canvas_view_y = canvas_y + (y - height / 2) / zoom
+
+def frame_all(board, width: int, height: int) -> None:
+    """Centers the view on all pins and zooms so they fit the region."""
+    if not board.pins: return
+    widths, heights = get_pin_sizes(board)
+    xs, ys = get_positions(board)
+    left, top = xs.min(), ys.min()
+    right, bottom = (xs + widths).max(), (ys + heights).max()
+    board.canvas_view_x = float(left + right) / 2; board.canvas_view_y = float(top + bottom) / 2
+    board.canvas_zoom = 0.9 * min(width / max(right - left, 1.0), height / max(bottom - top, 1.0))
+
+def set_positions(board, indices, xs, ys) -> None:
+    """Moves the pins at indices to the canvas positions (bulk foreach_set)."""
+    all_x, all_y = get_positions(board)
+    all_x[indices] = xs; all_y[indices] = ys
+    board.pins.foreach_set("canvas_x", all_x); board.pins.foreach_set("canvas_y", all_y)
+
+def scale_pins(board, indices, factor: float) -> None:
+    scales = _read_floats(board, "canvas_scale")
+    scales[indices] = np.clip(scales[indices] * factor, 0.01, 100.0)
+    board.pins.foreach_set("canvas_scale", scales)
+
+def arrange_pins(board, indices, origin=(0.0, 0.0)) -> None:
+    """Lays the pins out at scale 1 in a square-ish grid starting at the origin, in the given order."""
+    from .contact_sheet import grid_layout
+    if not len(indices): return
+    data = _get_board_data(board)
+    cell = round(BASE_SIZE); padding = round(BASE_SIZE * GRID_PADDING)
+    columns = math.ceil(math.sqrt(len(indices)))
+    rects = grid_layout([float(data["aspects"][idx]) for idx in indices], columns, cell, padding)[2]
+    set_positions(board, indices, [origin[0] + r[0] for r in rects], [origin[1] + r[1] for r in rects])
+    placed = np.zeros(len(board.pins), dtype=bool); board.pins.foreach_get("canvas_placed", placed)
+    placed[indices] = True
+    board.pins.foreach_set("canvas_placed", placed)
+    scales = _read_floats(board, "canvas_scale"); scales[indices] = 1.0 # The grid cells are BASE_SIZE
+    board.pins.foreach_set("canvas_scale", scales)
+    _tag_redraw()
+
+def place_new_pins(board) -> int:
+    """Arranges pins without a canvas position below the ones that have one. Returns their count."""
+    placed = np.zeros(len(board.pins), dtype=bool); board.pins.foreach_get("canvas_placed", placed)
+    new = np.flatnonzero(~placed)
+    if not len(new): return 0
+    origin = (0.0, 0.0)
+    if placed.any():
+        heights = get_pin_sizes(board)[1]
+        xs, ys = get_positions(board)
+        origin = (float(xs[placed].min()) - round(BASE_SIZE * GRID_PADDING), float((ys + heights)[placed].max()))
+    arrange_pins(board, new, origin)
+    return len(new)
+
+# --- Canvas areas ---
+def is_canvas_area(area) -> bool:
+    return area is not None and area.as_pointer() in _canvas_areas
+
+def get_canvas_board(scene, area_pointer: int):
+    board_uid = _canvas_areas.get(area_pointer)
+    return core.find_board(scene, board_uid)[1] if board_uid else None
+
+def open_canvas(area, board) -> bool:
+    """Shows the board in the area (an Image Editor). Returns False if the area already was a canvas."""
+    global _draw_handle
+    if _draw_handle is None:
+        _draw_handle = bpy.types.SpaceImageEditor.draw_handler_add(_draw_canvas, (), 'WINDOW', 'POST_PIXEL')
+    was_canvas = area.as_pointer() in _canvas_areas
+    _canvas_areas[area.as_pointer()] = board.uid
+    place_new_pins(board)
+    area.tag_redraw()
+    return not was_canvas
+
+def close_canvas(area_pointer: int) -> None:
+    _canvas_areas.pop(area_pointer, None)
+    request_area_redraw(area_pointer)
+    if not _canvas_areas: _cache.clear() # Nothing shows the textures any more
+
+# --- Drawing ---
+def _get_gpu() -> dict:
+    if not _gpu:
+        import gpu
+        from gpu_extras.batch import batch_for_shader
+        image = gpu.shader.from_builtin('IMAGE')
+        quad = ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0))
+        _gpu.update(
+            image=image, quad=batch_for_shader(image, 'TRI_FAN', {"pos": quad, "texCoord": quad}),
+            flat=gpu.shader.from_builtin('FLAT_COLOR'), uniform=gpu.shader.from_builtin('UNIFORM_COLOR'),
+            lines=gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR'),
+        )
+    return _gpu
+
+def _rect_triangles(x, y, w, h) -> np.ndarray:
+    x1, y1 = x + w, y + h
+    return np.stack([x, y, x1, y, x1, y1, x, y, x1, y1, x, y1], axis=-1).reshape(-1, 2).astype(np.float32)
+
+def _rect_outlines(x, y, w, h) -> np.ndarray:
+    x1, y1 = x + w, y + h
+    return np.stack([x, y, x1, y, x1, y, x1, y1, x1, y1, x, y1, x, y1, x, y], axis=-1).reshape(-1, 2).astype(np.float32)
+
+def _draw_canvas():
+    context = bpy.context
+    area = context.area
+    board_uid = _canvas_areas.get(area.as_pointer()) if area else None
+    if board_uid is None: return
+    import gpu, blf
+    from gpu_extras.batch import batch_for_shader
+    shaders = _get_gpu()
+    region = context.region; width, height = region.width, region.height
+    board = core.find_board(context.scene, board_uid)[1]
+    gpu.state.blend_set('ALPHA')
+
+    uniform = shaders["uniform"]; uniform.bind()
+    uniform.uniform_float("color", BACKGROUND)
+    batch_for_shader(uniform, 'TRI_FAN', {"pos": ((0, 0), (width, 0), (width, height), (0, height))}).draw(uniform)
+
+    if board is not None and board.pins:
+        _cache.frame += 1
+        data = _get_board_data(board)
+        if data.get("images") != core.get_generation('images'): # Some pin got another image
+            _cache.validate(board); data["images"] = core.get_generation('images')
+        sx, sy, sw, sh = get_screen_rects(board, width, height)
+        visible = np.flatnonzero((sx < width) & (sx + sw > 0) & (sy < height) & (sy + sh > 0))
+        uids = data["uids"]
+        store_key = core.get_store_key(board.id_data)
+        flat = [] # Visible pins without a texture yet, or too small for one
+        image, quad = shaders["image"], shaders["quad"]
+        image.bind()
+        for idx in visible.tolist():
+            size = max(sw[idx], sh[idx])
+            if size < MIN_TEXTURE_PIXELS: flat.append(idx); continue
+            uid = uids[idx]
+            level = level_for(size)
+            texture, have = _cache.best(uid, level)
+            if have != level: _cache.request(store_key, board.uid, uid, idx, level)
+            if texture is None: flat.append(idx); continue
+            with gpu.matrix.push_pop():
+                gpu.matrix.translate((sx[idx], sy[idx])); gpu.matrix.scale((sw[idx], sh[idx]))
+                image.uniform_sampler("image", texture)
+                quad.draw(image)
+        if flat:
+            rgb = np.empty(len(board.pins) * 3, dtype=np.float32); board.pins.foreach_get("dominant_color", rgb)
+            colors = np.concatenate([rgb.reshape(-1, 3)[flat], np.ones((len(flat), 1), dtype=np.float32)], axis=1)
+            flat_shader = shaders["flat"]; flat_shader.bind()
+            batch_for_shader(flat_shader, 'TRIS', {
+                "pos": _rect_triangles(sx[flat], sy[flat], sw[flat], sh[flat]),
+                "color": np.repeat(colors, 6, axis=0),
+            }).draw(flat_shader)
+        selected = np.intersect1d(visible, np.flatnonzero(core.get_selection(board)))
+        if len(selected):
+            lines = shaders["lines"]; lines.bind()
+            lines.uniform_float("viewportSize", (width, height)); lines.uniform_float("lineWidth", 2.0)
+            lines.uniform_float("color", SELECTION_COLOR)
+            batch_for_shader(lines, 'LINES', {
+                "pos": _rect_outlines(sx[selected], sy[selected], sw[selected], sh[selected]),
+            }).draw(lines)
+        _cache.upload()
+        if _cache.ready: request_area_redraw(area.as_pointer()) # More levels are waiting for upload
+
+    blf.size(0, 12); blf.color(0, 0.6, 0.6, 0.6, 1.0)
+    blf.position(0, 10, 10, 0); blf.draw(0, f"{board.name if board else 'No board'}  ·  {HINT}")
+    gpu.state.blend_set('NONE')
+
+# Canvas areas and textures belong to the previous file's screens and data
+@persistent
+def _reset_on_load(*_args):
+    _canvas_areas.clear(); _board_data.clear(); _cache.clear()
+
+def register():
+    if _reset_on_load not in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(_reset_on_load)
+
+def unregister():
+    global _draw_handle
+    if _reset_on_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(_reset_on_load)
+    if _draw_handle is not None:
+        bpy.types.SpaceImageEditor.draw_handler_remove(_draw_handle, 'WINDOW')
+        _draw_handle = None
+    _reset_on_load(); _gpu.clear()
+
+# Loaded on first use, not at add-on startup: hooks itself up when imported (see __init__.lazy_modules)
+register()
@@ -0,0 +1,100 @@
+import bpy
+import os
+import sys
+# Relative import of the shared URL prefixes
+from .url_refresh import URL_PREFIXES
+
+# Reading the system clipboard for the Paste operator. Blender only exposes clipboard text,
+# so image data is read with the platform's own tools: wl-paste (Wayland) or xclip (X11),
+# osascript on macOS and the Win32 clipboard API through ctypes on Windows. Nothing is
+# written to disk; callers get the encoded image bytes.
+
+TIMEOUT = 3.0 # Seconds allowed for a clipboard tool
+IMAGE_TYPES = ("image/png", "image/jpeg", "image/webp", "image/gif", "image/bmp", "image/tiff")
+_SIGNATURES = {b"\x89PNG": ".png", b"\xff\xd8\xff": ".jpg", b"GIF8": ".gif", b"BM": ".bmp", b"RIFF": ".webp", b"II*\x00": ".tif", b"MM\x00*": ".tif"}
+
+def guess_extension(data: bytes) -> str:
+    """File extension of encoded image bytes from their signature ('.png' if unknown)."""
+    return next((ext for signature, ext in _SIGNATURES.items() if data.startswith(signature)), ".png")
+
+def _run(args: list[str]) -> bytes | None:
+    import subprocess # Imported on first use
+    try:
+        result = subprocess.run(args, capture_output=True, timeout=TIMEOUT, check=False)
+    except (OSError, subprocess.TimeoutExpired):
+        return None # Tool not installed or hanging
+    return result.stdout if result.returncode == 0 and result.stdout else None
+
+def _read_linux() -> bytes | None:
+    if os.environ.get("WAYLAND_DISPLAY"):
+        list_types, read_type = ["wl-paste", "--list-types"], ["wl-paste", "--no-newline", "--type"]
+    else:
+        list_types = ["xclip", "-selection", "clipboard", "-t", "TARGETS", "-o"]
+        read_type = ["xclip", "-selection", "clipboard", "-o", "-t"]
+    types = (_run(list_types) or b"").decode(errors="replace").split()
+    mime = next((t for t in IMAGE_TYPES if t in types), None)
+    return _run(read_type + [mime]) if mime else None
+
+def _read_macos() -> bytes | None:
+    for cls in ("PNGf", "TIFF", "JPEG"):
+        output = _run(["osascript", "-e", f"the clipboard as «class {cls}»"])
+        # osascript prints the data as «data PNGf89504E47...»
+        text = output.decode(errors="replace").strip() if output else ""
+        if text.startswith("«data ") and text.endswith("»"):
+            try: return bytes.fromhex(text[10:-1])
+            except ValueError: continue
+    return None
+
+def _read_windows() -> bytes | None:
+    import ctypes, struct
+    from ctypes import wintypes
+    user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+    user32.GetClipboardData.restype = wintypes.HANDLE
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]; kernel32.GlobalLock.restype = ctypes.c_void_p
+    kernel32.GlobalSize.argtypes = [wintypes.HGLOBAL]; kernel32.GlobalSize.restype = ctypes.c_size_t
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    CF_DIB = 8
+    png_format = user32.RegisterClipboardFormatW("PNG") # Set by browsers and most screenshot tools
+    if not user32.OpenClipboard(None): return None
+    try:
+        for fmt in (png_format, CF_DIB):
+            if not fmt or not user32.IsClipboardFormatAvailable(fmt): continue
+            handle = user32.GetClipboardData(fmt)
+            pointer = kernel32.GlobalLock(handle) if handle else None
+            if not pointer: continue
+            try: data = ctypes.string_at(pointer, kernel32.GlobalSize(handle))
+            finally: kernel32.GlobalUnlock(handle)
+            if fmt == png_format: return data
+            # A DIB is a BMP file without the 14 byte file header
+            header_size, _w, _h, _planes, bits, compression, _size, _x, _y, colors = struct.unpack_from("<IiiHHIIiiI", data)
+            palette = (colors or (1 << bits if bits <= 8 else 0)) * 4 + (12 if compression == 3 and header_size == 40 else 0)
+            return struct.pack("<2sIHHI", b"BM", 14 + len(data), 0, 0, 14 + header_size + palette) + data
+    finally:
+        user32.CloseClipboard()
+    return None
+
+def read_image() -> bytes | None:
+    """Encoded image bytes on the clipboard (PNG, JPEG, BMP, ...), or None."""
+    if sys.platform.startswith("win"): return _read_windows()
+    if sys.platform == "darwin": return _read_macos()
+    return _read_linux()
+
+def parse_text(text: str) -> tuple[list[str], list[str]]:
+    """
+    Splits clipboard text into (image file paths, http(s) URLs): one entry per line, file
+    paths as plain paths or file:// URIs (as copied from file managers). Other lines are ignored.
+    """
+    from urllib.parse import urlparse, unquote
+    paths, urls = [], []
+    for line in text.splitlines():
+        line = line.strip().strip('"')
+        if line.startswith(URL_PREFIXES): urls.append(line)
+        elif line.startswith("file://"):
+            path = unquote(urlparse(line).path)
+            if sys.platform.startswith("win") and path[:1] == "/" and path[2:3] == ":": path = path[1:] # /C:/...
+            if os.path.isfile(path): paths.append(path)
+        elif line and os.path.isfile(line): paths.append(line)
+    return list(dict.fromkeys(paths)), list(dict.fromkeys(urls))
+
+def read_text() -> str:
+    return bpy.context.window_manager.clipboard or ""
@@ -0,0 +1,174 @@
+import bpy
+import os
+import math
+import time
+import numpy as np
+# Relative imports
+from . import image_utils
+from .board_cache import get_filter_mask
+from .sorting import get_sorted_indices
+
+# Renders a board into one image (contact sheet grid or justified collage) band by band:
+# only one horizontal band of the output and the downscaled pixels of the pins crossing it
+# are in memory at any time, however large the board or the output resolution is.
+# Pins are read at their output size (from the preview when that is large enough, otherwise
+# from a scaled copy of the image that is freed right away).
+
+BAND_HEIGHT = 256 # Output rows rendered and written per step
+
+def get_export_pins(board) -> list:
+    """The pins with an image that pass the board's filters, in display (sort) order."""
+    mask = get_filter_mask(board)
+    order = get_sorted_indices(board)
+    indices = order.tolist() if order is not None else range(len(board.pins))
+    return [board.pins[idx] for idx in indices if mask[idx] and board.pins[idx].image]
+
+def get_aspect(img: bpy.types.Image) -> float:
+    """Width / height, from the preview if possible so the full image does not have to be loaded."""
+    preview = img.preview or img.preview_ensure()
+    width, height = preview.image_size if preview and preview.image_size[1] else img.size
+    return width / height if height else 1.0
+
+# --- Layouts: lists of (x, y, width, height) in output pixels, y down from the top ---
+def grid_layout(aspects, columns: int, cell: int, padding: int):
+    """Contact sheet: every image fitted and centered in a square cell."""
+    columns = max(1, min(columns, len(aspects)))
+    rows = math.ceil(len(aspects) / columns)
+    step = cell + padding
+    rects = []
+    for i, aspect in enumerate(aspects):
+        w, h = (cell, max(1, round(cell / aspect))) if aspect >= 1.0 else (max(1, round(cell * aspect)), cell)
+        x = padding + (i % columns) * step + (cell - w) // 2
+        y = padding + (i // columns) * step + (cell - h) // 2
+        rects.append((x, y, w, h))
+    return padding + columns * step, padding + rows * step, rects
+
+def collage_layout(aspects, width: int, row_height: int, padding: int):
+    """Justified rows: images keep their aspect and each full row is scaled to fill the width."""
+    rects = []; y = padding
+    row = []; row_aspect = 0.0
+    def flush(last):
+        nonlocal y
+        # A full row is scaled down to the width exactly, the last one keeps the target height
+        h = row_height if last else max(1, round((width - padding * (len(row) + 1)) / row_aspect))
+        x = padding
+        for i in row:
+            w = max(1, round(aspects[i] * h))
+            rects.append((x, y, w, h)); x += w + padding
+        y += h + padding
+    for i, aspect in enumerate(aspects):
+        row.append(i); row_aspect += aspect
+        if row_aspect * row_height + padding * (len(row) + 1) >= width:
+            flush(last=False); row = []; row_aspect = 0.0
+    if row: flush(last=True)
+    return width, y, rects
+
+# --- Pixels ---
+def _box_weights(size_in: int, size_out: int) -> np.ndarray:
+    """(size_out, size_in) matrix averaging the input pixels each output pixel covers."""
+    edges = np.arange(size_out + 1) * (size_in / size_out)
+    j = np.arange(size_in)[None, :]
+    overlap = np.clip(np.minimum(edges[1:, None], j + 1) - np.maximum(edges[:-1, None], j), 0.0, None)
+    return overlap / overlap.sum(axis=1, keepdims=True)
+
+def resample(rgba: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Box-filter resize of an (h, w, c) float array to (height, width, c)."""
+    if rgba.shape[:2] == (height, width): return rgba
+    wy = _box_weights(rgba.shape[0], height); wx = _box_weights(rgba.shape[1], width)
+    return np.einsum('yi,ijc,xj->yxc', wy, rgba, wx, optimize=True)
+
+def _linear_to_srgb(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * rgb ** (1 / 2.4) - 0.055)
+
+def read_pin_pixels(img: bpy.types.Image, width: int, height: int) -> np.ndarray:
+    """
+    Returns the image at (height, width) as float RGBA 0..1, top row first. Uses the preview if it
+    is at least that large; otherwise scales a temporary copy, so the original stays unloaded.
+    """
+    preview = img.preview or img.preview_ensure()
+    if preview and preview.image_size[0] >= width and preview.image_size[1] >= height:
+        rgba = image_utils.get_preview_rgba(img)
+        if rgba is not None:
+            return resample(rgba.astype(np.float32) / 255.0, width, height)
+    was_loaded = img.has_data
+    copy = img.copy()
+    try:
+        copy.scale(width, height)
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        copy.pixels.foreach_get(pixels)
+        rgba = pixels.reshape(height, width, 4)[::-1]
+        if copy.is_float: rgba = np.concatenate([_linear_to_srgb(rgba[..., :3]), rgba[..., 3:]], axis=2)
+    finally:
+        bpy.data.images.remove(copy)
+        if not was_loaded: img.buffers_free()
+    return rgba
+
+def render_bands(images, rects, width: int, height: int, background, band_height: int = BAND_HEIGHT, progress=None):
+    """
+    Yields the output as (rows, width, 3) uint8 bands, top to bottom. Scaled pin pixels are kept
+    only while the pin overlaps the current band.
+    """
+    background = np.asarray(background[:3], dtype=np.float32)
+    cache = {} # pin index -> scaled RGBA, for pins spanning several bands
+    by_top = sorted(range(len(rects)), key=lambda i: rects[i][1])
+    next_pin = 0
+    for top in range(0, height, band_height):
+        bottom = min(top + band_height, height)
+        band = np.empty((bottom - top, width, 3), dtype=np.float32); band[:] = background
+        while next_pin < len(by_top) and rects[by_top[next_pin]][1] < bottom:
+            i = by_top[next_pin]; next_pin += 1
+            x, y, w, h = rects[i]
+            cache[i] = read_pin_pixels(images[i], w, h)
+            if progress: progress(next_pin)
+        for i in list(cache):
+            x, y, w, h = rects[i]
+            y0, y1 = max(y, top), min(y + h, bottom)
+            x1 = min(x + w, width)
+            if y0 < y1 and x < x1:
+                rgba = cache[i][y0 - y:y1 - y, :x1 - x]
+                alpha = rgba[..., 3:]
+                band[y0 - top:y1 - top, x:x1] = rgba[..., :3] * alpha + band[y0 - top:y1 - top, x:x1] * (1.0 - alpha)
+            if y + h <= bottom: del cache[i] # Done with this pin
+        yield (np.clip(band, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+def export_contact_sheet(board, filepath: str, layout: str = 'GRID', columns: int = 6, cell_size: int = 256,
+                         sheet_width: int = 2048, row_height: int = 256, padding: int = 8,
+                         background=(0.1, 0.1, 0.1), file_format: str = 'PNG', quality: int = 90,
+                         progress=None) -> dict:
+    """
+    Writes the board's filtered, sorted pins as one image. PNG is streamed band by band;
+    JPEG is encoded by Blender from that PNG, which needs the full sheet in memory once.
+    Returns stats (pins, width, height, seconds).
+    """
+    start = time.perf_counter()
+    pins = get_export_pins(board)
+    if not pins: raise ValueError("No pins with images pass the current filters")
+    images = [pin.image for pin in pins]
+    aspects = [get_aspect(img) for img in images]
+    if layout == 'GRID':
+        width, height, rects = grid_layout(aspects, columns, cell_size, padding)
+    else:
+        width, height, rects = collage_layout(aspects, sheet_width, row_height, padding)
+
+    png_path = filepath if file_format == 'PNG' else filepath + ".tmp.png"
+    tmp_path = png_path + ".part"
+    try:
+        with open(tmp_path, 'wb') as f:
+            writer = image_utils.PNGWriter(f, width, height, channels=3)
+            for band in render_bands(images, rects, width, height, background, progress=progress):
+                writer.write_rows(band)
+            writer.close()
+        os.replace(tmp_path, png_path)
+    finally:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+
+    if file_format == 'JPEG':
+        sheet = bpy.data.images.load(png_path, check_existing=False)
+        try:
+            sheet.file_format = 'JPEG'
+            sheet.save(filepath=filepath, quality=quality)
+        finally:
+            bpy.data.images.remove(sheet)
+            os.remove(png_path)
+    return {"pins": len(pins), "width": width, "height": height, "seconds": time.perf_counter() - start}
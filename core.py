@@ -1,15 +1,309 @@
 import bpy
+import time
+import uuid
+import numpy as np
+
+# --- Change tracking ---
+# Update callbacks and bulk writers only bump a counter per kind of change, which is O(1).
+# Runtime caches remember the generation they were built at and rebuild lazily when it moved on.
+_generations = {
+    'selection': 0, # is_selected flags
+    'images': 0,    # pin image pointers / image data
+    'text': 0,      # pin names, notes, tags, links
+    'order': 0,     # pin order inside a board (moves)
+    'palette': 0,   # extracted color palettes
+}
+
+def tag_changed(*kinds: str) -> None:
+    """Marks one or more kinds of pin data as changed (all kinds if none are given)."""
+    for kind in kinds or tuple(_generations):
+        _generations[kind] += 1
+
+def get_generation(kind: str) -> int:
+    return _generations[kind]
 
 def get_active_board(context: bpy.types.Context) -> bpy.types.PropertyGroup | None:
     """
-    Gets the currently active reference board from the scene.
+    Gets the currently active reference board of the scene's view of the board store.
     Returns the board PropertyGroup or None if no board is active or found.
     """
     scene = context.scene
-    if not hasattr(scene, "refboard_boards") or not hasattr(scene, "refboard_active_board_index"):
-        return None
+    if not hasattr(scene, "refboard_active_board_index"): return None
+    boards = get_boards(scene)
     idx = scene.refboard_active_board_index
-    if 0 <= idx < len(scene.refboard_boards):
-        return scene.refboard_boards[idx]
+    if 0 <= idx < len(boards):
+        return boards[idx]
     return None
 
+# --- Board store ---
+# Boards are stored once per file, in a Text data-block (the store), not on every scene:
+# copying a scene or linking one from a library does not duplicate them. Scenes point to
+# the store and keep only their view of it (the active board index).
+STORE_NAME = ".RefBoard Boards" # Leading dot: hidden in ID selectors
+_STORE_HEADER = "# Board data of the RefBoard add-on, kept in this data-block's properties.\n"
+
+def get_store(owner=None, create: bool = False) -> bpy.types.Text | None:
+    """
+    The board store of a scene (the current scene if none is given); a store passed as owner
+    is returned as is. Scenes that point to no store use the file's local one. With create,
+    a missing store is added and the scene is pointed to it. Returns None if there is none.
+    """
+    if isinstance(owner, bpy.types.Text): return owner
+    scene = owner or bpy.context.scene
+    store = getattr(scene, "refboard_store", None)
+    if store is not None: return store
+    store = bpy.data.texts.get((STORE_NAME, None))
+    if create:
+        if store is None:
+            store = bpy.data.texts.new(STORE_NAME)
+            store.use_fake_user = True # Kept even when no scene points to it
+            store.write(_STORE_HEADER)
+        if scene.library is None: scene.refboard_store = store
+    return store
+
+def get_boards(owner=None):
+    """The board collection of a scene or store (see get_store), an empty tuple without store."""
+    store = get_store(owner)
+    return store.refboard_boards if store is not None else ()
+
+def get_stores() -> list:
+    """All stores of the file holding boards, local and linked."""
+    return [text for text in bpy.data.texts if len(text.refboard_boards)]
+
+def find_store(name_full: str) -> bpy.types.Text | None:
+    """The store with the given full name (see get_store_key), for deferred lookups."""
+    return next((text for text in bpy.data.texts if text.name_full == name_full), None)
+
+def get_store_key(owner) -> str:
+    """Stable name of the store of a scene or store, to find it again with find_store()."""
+    store = get_store(owner)
+    return store.name_full if store is not None else ""
+
+def get_board_key(board):
+    """Stable key of a board for runtime caches: its uid (the RNA pointer changes when boards move)."""
+    return board.uid or board.as_pointer() # Linked boards of older files may have no uid
+
+def _store_views(store) -> list:
+    """The editable scenes showing the boards of the store."""
+    return [scene for scene in bpy.data.scenes if scene.library is None and get_store(scene) == store]
+
+def remove_board(store, index: int) -> None:
+    """Removes a board and keeps the active board of every scene showing the store."""
+    boards = store.refboard_boards
+    boards.remove(index)
+    for scene in _store_views(store):
+        active = scene.refboard_active_board_index
+        if active > index or (active == index and active > 0): active -= 1
+        scene.refboard_active_board_index = min(active, len(boards) - 1)
+
+def move_board(store, old_index: int, new_index: int) -> None:
+    """Moves a board and keeps the active board of every scene showing the store."""
+    store.refboard_boards.move(old_index, new_index)
+    for scene in _store_views(store):
+        active = scene.refboard_active_board_index
+        if active == old_index: active = new_index
+        elif old_index < active <= new_index: active -= 1
+        elif new_index <= active < old_index: active += 1
+        scene.refboard_active_board_index = active
+
+def get_preferences(context: bpy.types.Context | None = None):
+    """Returns the add-on preferences, or None if the add-on is not registered as such (e.g. run as script)."""
+    context = context or bpy.context
+    addon = context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+# --- Pin creation ---
+def new_pin(board, img: bpy.types.Image | None = None) -> bpy.types.PropertyGroup:
+    """Adds a pin to the board, with a fresh uid and date, optionally showing an image."""
+    pin = board.pins.add()
+    pin.uid = uuid.uuid4().hex
+    pin.date_added = time.time()
+    if img is not None:
+        pin.image = img
+        pin.name = img.name; pin.pin_name = img.name
+    return pin
+
+def new_board(scene: bpy.types.Scene, name: str) -> bpy.types.PropertyGroup:
+    """Adds a board with a fresh uid to the scene's store (does not change the active board)."""
+    board = get_store(scene, create=True).refboard_boards.add()
+    board.uid = uuid.uuid4().hex
+    board.name = name
+    return board
+
+def copy_pin_data(src, dst) -> None:
+    """Copies all user data of a pin to another one. The image is shared, not duplicated."""
+    dst.name = src.name
+    dst.image = src.image
+    dst.pin_name = src.pin_name; dst.note = src.note
+    dst.external_link = src.external_link; dst.tags = src.tags
+    dst.source_etag = src.source_etag; dst.source_last_modified = src.source_last_modified
+    dst.source_hash = src.source_hash
+    dst.date_added = src.date_added
+    dst.dominant_color = src.dominant_color
+    dst.canvas_x = src.canvas_x; dst.canvas_y = src.canvas_y
+    dst.canvas_scale = src.canvas_scale; dst.canvas_placed = src.canvas_placed
+    dst.palette.clear()
+    for src_swatch in src.palette:
+        swatch = dst.palette.add(); swatch.color = src_swatch.color; swatch.weight = src_swatch.weight
+
+def transfer_pins(src_board, dst_board, indices, move: bool = False) -> tuple[int, int]:
+    """
+    Copies (or moves) the pins at the given indices of src_board to dst_board in one pass.
+    Only property data is copied; the Image data-blocks are shared. Pins whose image is
+    already on the target board are skipped (and stay on the source board when moving).
+    Returns (transferred, skipped duplicates).
+    """
+    existing = {pin.image.name_full for pin in dst_board.pins if pin.image}
+    transferred = []; duplicates = 0
+    for idx in sorted(indices):
+        src = src_board.pins[idx]
+        if src.image is not None:
+            if src.image.name_full in existing:
+                duplicates += 1; continue
+            existing.add(src.image.name_full)
+        dst = new_pin(dst_board)
+        copy_pin_data(src, dst)
+        if move: dst.uid = src.uid # Same pin, new place: keep its identity
+        transferred.append(idx)
+    if move:
+        for idx in reversed(transferred): # From the end so indices do not shift
+            src_board.pins.remove(idx)
+        if transferred:
+            src_board.active_pin_index = min(src_board.active_pin_index, len(src_board.pins) - 1)
+    tag_changed('selection', 'order')
+    return len(transferred), duplicates
+
+def copy_board_data(src, dst) -> None:
+    """Copies a board's settings and pins to another, empty board. Uids are kept: it is the same board."""
+    dst.name = src.name; dst.uid = src.uid
+    dst.thumbnail_size = src.thumbnail_size
+    dst.active_pin_index = src.active_pin_index; dst.select_anchor_index = src.select_anchor_index
+    if src.pin_filter or src.tag_filter: # Setting them schedules a filter update
+        dst.pin_filter = src.pin_filter; dst.tag_filter = src.tag_filter
+    dst.applied_pin_filter = src.applied_pin_filter; dst.applied_tag_filter = src.applied_tag_filter
+    dst.library_uid = src.library_uid
+    dst.library_offset = src.library_offset; dst.library_total = src.library_total
+    dst.sort_mode = src.sort_mode; dst.sort_reverse = src.sort_reverse
+    dst.canvas_view_x = src.canvas_view_x; dst.canvas_view_y = src.canvas_view_y
+    dst.canvas_zoom = src.canvas_zoom
+    for src_pin in src.pins:
+        pin = dst.pins.add()
+        copy_pin_data(src_pin, pin)
+        pin.uid = src_pin.uid; pin.is_selected = src_pin.is_selected
+    tag_changed()
+
+def _pin_signature(board) -> tuple:
+    """Content of a board's pins, to recognize the copies of a board made by copying its scene."""
+    return tuple((pin.uid, pin.image.name_full if pin.image else "", pin.pin_name, pin.note, pin.tags, pin.external_link)
+                 for pin in board.pins)
+
+def migrate_scene_boards() -> int:
+    """
+    Moves the boards that files of older versions kept on each scene (Scene.refboard_boards)
+    into the file's store. A board found in several scenes (the scene was copied) is stored once,
+    recognized by its uid, or by its name for boards older than uids, and the content of its pins;
+    same-uid boards whose pins differ are kept apart, named after their scene. Boards and pins
+    without uid get one right away. The active board of every scene is kept. Returns the number
+    of boards added to the store.
+    """
+    added = 0
+    migrated = {} # (store, board uid or name, pin signature) -> index of the board in the store
+    for scene in bpy.data.scenes:
+        legacy = getattr(scene, "refboard_boards", ())
+        if scene.library is not None or not len(legacy): continue
+        store = get_store(scene, create=True)
+        boards = store.refboard_boards
+        indices = []
+        for src in legacy:
+            key = (store.name_full, src.uid or src.name, _pin_signature(src))
+            idx, found = find_board(store, src.uid) if src.uid else (-1, None)
+            if key in migrated or (found is not None and _pin_signature(found) == key[2]):
+                indices.append(migrated.get(key, idx)); continue # Same board, migrated from another scene
+            board = boards.add()
+            copy_board_data(src, board)
+            if found is not None: # Diverged copy: a board of its own
+                board.name = f"{src.name} ({scene.name})"
+                board.uid = ""
+                for pin in board.pins: pin.uid = ""
+            ensure_board_uids(board)
+            migrated[key] = len(boards) - 1
+            indices.append(len(boards) - 1); added += 1
+        active = scene.refboard_active_board_index
+        scene.refboard_active_board_index = indices[active] if 0 <= active < len(indices) else -1
+        legacy.clear()
+    return added
+
+def find_board(scene: bpy.types.Scene, board_uid: str) -> tuple[int, bpy.types.PropertyGroup | None]:
+    """Returns (index, board) of the board with the given uid in the scene's store (or a store), or (-1, None)."""
+    for idx, board in enumerate(get_boards(scene)):
+        if board.uid == board_uid: return idx, board
+    return -1, None
+
+def find_pin_index(board, pin_uid: str, hint: int = -1) -> int:
+    """Returns the index of the pin with the given uid, or -1. Checks the hint index first."""
+    if 0 <= hint < len(board.pins) and board.pins[hint].uid == pin_uid: return hint
+    for idx, pin in enumerate(board.pins):
+        if pin.uid == pin_uid: return idx
+    return -1
+
+def ensure_board_uids(board) -> int:
+    """Gives the board and its pins without uid a new one. Returns the number of items updated."""
+    updated = 0
+    if not board.uid:
+        board.uid = uuid.uuid4().hex; updated += 1
+    for pin in board.pins:
+        if not pin.uid:
+            pin.uid = uuid.uuid4().hex; updated += 1
+    return updated
+
+def ensure_pin_uids(scene: bpy.types.Scene) -> int:
+    """Gives every board and pin of the scene's store without uid a new one. Returns the number of items updated."""
+    return sum(ensure_board_uids(board) for board in get_boards(scene))
+
+# --- Filtering ---
+def parse_tags(text: str) -> set[str]:
+    """Splits a comma-separated tag string into a set of lower-case tags."""
+    return {t.strip() for t in text.lower().split(',') if t.strip()}
+
+def pin_matches_filter(pin, name_filter: str, tag_filter: str, filter_tags: set[str]) -> bool:
+    """
+    Checks a single pin against the (already lower-cased) name/note and tag filters.
+    A pin passes the tag filter if the raw filter text is found in its tags,
+    or if at least one of the comma-separated filter tags matches one of its tags.
+    """
+    if name_filter:
+        p_name = pin.pin_name.lower() if pin.pin_name else ""
+        p_note = pin.note.lower() if pin.note else ""
+        if name_filter not in p_name and name_filter not in p_note: return False
+    if tag_filter:
+        p_tags = pin.tags.lower()
+        if tag_filter not in p_tags and not filter_tags.intersection(parse_tags(p_tags)): return False
+    return True
+
+def get_filter_mask(board) -> np.ndarray:
+    """
+    Returns a boolean array (one entry per pin) that is True for every pin
+    passing the board's applied name/note and tag filters. All True if no filter is set.
+    """
+    count = len(board.pins)
+    name_filter = board.applied_pin_filter.lower()
+    tag_filter = board.applied_tag_filter.lower()
+    if not name_filter and not tag_filter:
+        return np.ones(count, dtype=bool)
+    filter_tags = parse_tags(tag_filter)
+    return np.fromiter(
+        (pin_matches_filter(pin, name_filter, tag_filter, filter_tags) for pin in board.pins),
+        dtype=bool, count=count
+    )
+
+# --- Selection (bulk access through foreach_get/foreach_set) ---
+def get_selection(board) -> np.ndarray:
+    """Reads the is_selected flag of all pins into a boolean array in one call."""
+    selection = np.zeros(len(board.pins), dtype=bool)
+    board.pins.foreach_get("is_selected", selection)
+    return selection
+
+def set_selection(board, selection: np.ndarray) -> None:
+    """Writes a boolean array back to the is_selected flag of all pins in one call."""
+    board.pins.foreach_set("is_selected", np.ascontiguousarray(selection, dtype=bool))
+    tag_changed('selection') # foreach_set does not run update callbacks
@@ -0,0 +1,206 @@
+import bpy
+import os
+import zlib
+import struct
+import numpy as np
+# Relative import of the instrumentation layer
+from . import instrumentation
+
+# Small, dependency-free helpers around image data shared by the library, import/export and
+# contact-sheet code. Everything here works in background mode as well.
+
+HASH_PROP = "refboard_hash" # ID property caching the content hash on Image data-blocks
+_CHUNK_SIZE = 1 << 20
+
+# --- Content hashing ---
+def hash_bytes(data: bytes) -> str:
+    import hashlib # Imported on first use, like the other heavy modules
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path: str) -> str | None:
+    """SHA-256 of a file, read in chunks. None if the file cannot be read."""
+    import hashlib
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def get_image_hash(img: bpy.types.Image, compute: bool = True) -> str | None:
+    """
+    Returns the content hash of the image's source data (packed bytes or file),
+    cached as an ID property on the image. None if there is no source data.
+    """
+    cached = img.get(HASH_PROP)
+    if cached or not compute: return cached
+    if img.packed_file:
+        digest = hash_bytes(img.packed_file.data)
+    elif img.source == 'FILE' and img.filepath:
+        digest = hash_file(bpy.path.abspath(img.filepath, library=img.library))
+    else:
+        digest = None
+    if digest and not img.library:
+        img[HASH_PROP] = digest
+    return digest
+
+def get_source_size(img: bpy.types.Image) -> int | None:
+    """Size in bytes of the image's source data (packed bytes or file), None if there is none."""
+    if img.packed_file: return img.packed_file.size
+    if img.source == 'FILE' and img.filepath:
+        try: return os.path.getsize(bpy.path.abspath(img.filepath, library=img.library))
+        except OSError: return None
+    return None
+
+class ContentSet:
+    """
+    Content hashes of a group of images (e.g. of a board) for duplicate checks. Cached hashes are
+    used as they are; an image that was never hashed is only hashed, reading its whole source,
+    when its source size equals the size of the data checked against it.
+    """
+    def __init__(self, images):
+        self.hashes = set()
+        self._unhashed = {} # source size -> images without cached hash
+        for img in {img.as_pointer(): img for img in images}.values():
+            digest = get_image_hash(img, compute=False)
+            if digest: self.hashes.add(digest); continue
+            size = get_source_size(img)
+            if size is not None: self._unhashed.setdefault(size, []).append(img)
+
+    def contains(self, digest: str, size: int | None) -> bool:
+        """Whether content with this hash is in the set. Without size, only known hashes are compared."""
+        if digest in self.hashes: return True
+        for img in self._unhashed.pop(size, ()) if size is not None else ():
+            other = get_image_hash(img)
+            if other: self.hashes.add(other)
+        return digest in self.hashes
+
+    def add(self, digest: str) -> None:
+        self.hashes.add(digest)
+
+def find_images_by_hash() -> dict[str, bpy.types.Image]:
+    """Maps already known content hashes to images (only images with a cached hash are listed)."""
+    return {img[HASH_PROP]: img for img in bpy.data.images if img.get(HASH_PROP)}
+
+def get_image_bytes(img: bpy.types.Image) -> bytes | None:
+    """Returns the encoded source data of an image (packed data or file contents)."""
+    if img.packed_file: return img.packed_file.data
+    if img.source == 'FILE' and img.filepath:
+        try:
+            with open(bpy.path.abspath(img.filepath, library=img.library), 'rb') as f: return f.read()
+        except OSError: return None
+    return None
+
+def load_image_from_bytes(name: str, data: bytes, digest: str | None = None) -> bpy.types.Image:
+    """
+    Creates a packed Image data-block directly from encoded file bytes (PNG, JPEG, ...),
+    without writing a temporary file.
+    """
+    img = bpy.data.images.new(name, 8, 8)
+    instrumentation.count("image_loads")
+    img.pack(data=data, data_len=len(data))
+    img.source = 'FILE'
+    img[HASH_PROP] = digest or hash_bytes(data)
+    return img
+
+# --- Thumbnails ---
+def get_preview_rgba(img: bpy.types.Image) -> np.ndarray | None:
+    """Returns the image preview as an (h, w, 4) uint8 array, top row first; None if unavailable."""
+    preview = img.preview or img.preview_ensure()
+    if not preview or not preview.image_size[0] or not preview.image_size[1]: return None
+    width, height = preview.image_size
+    pixels = np.zeros(width * height * 4, dtype=np.float32)
+    preview.image_pixels_float.foreach_get(pixels)
+    rgba = (np.clip(pixels, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8).reshape(height, width, 4)
+    return rgba[::-1] # Blender stores rows bottom-up
+
+# --- PNG encoding ---
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+def png_header(width: int, height: int, channels: int = 4) -> bytes:
+    color_type = {3: 2, 4: 6}[channels] # RGB / RGBA, 8 bit
+    return b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+
+def png_scanlines(rows: np.ndarray) -> bytes:
+    """Raw PNG scanlines (filter type 0) for an (h, w, channels) uint8 array."""
+    rows = np.ascontiguousarray(rows, dtype=np.uint8)
+    filtered = np.zeros((rows.shape[0], rows.shape[1] * rows.shape[2] + 1), dtype=np.uint8)
+    filtered[:, 1:] = rows.reshape(rows.shape[0], -1)
+    return filtered.tobytes()
+
+def encode_png(rgba: np.ndarray, level: int = 6) -> bytes:
+    """Encodes an (h, w, 3|4) uint8 array (top row first) as PNG bytes."""
+    height, width, channels = rgba.shape
+    return (
+        png_header(width, height, channels)
+        + _png_chunk(b"IDAT", zlib.compress(png_scanlines(rgba), level))
+        + _png_chunk(b"IEND", b"")
+    )
+
+class PNGWriter:
+    """
+    Streams an 8-bit PNG to an open binary file a band of rows at a time, so the full image
+    never has to be in memory. Call write_rows() top to bottom, then close().
+    """
+    def __init__(self, f, width: int, height: int, channels: int = 3, level: int = 6):
+        self.f = f; self.width = width; self.height = height; self.channels = channels
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(level)
+        f.write(png_header(width, height, channels))
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """Appends (n, width, channels) uint8 rows."""
+        data = self.compressor.compress(png_scanlines(rows))
+        if data: self.f.write(_png_chunk(b"IDAT", data))
+        self.rows_written += rows.shape[0]
+
+    def close(self) -> None:
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG has {self.height} rows, {self.rows_written} written")
+        self.f.write(_png_chunk(b"IDAT", self.compressor.flush()) + _png_chunk(b"IEND", b""))
+
+def decode_png(data: bytes) -> np.ndarray | None:
+    """
+    Decodes 8-bit RGB/RGBA PNGs without scanline filters, as written by encode_png().
+    Returns an (h, w, 4) uint8 array (top row first), or None for any other PNG.
+    """
+    if data[:8] != b"\x89PNG\r\n\x1a\n": return None
+    pos = 8; idat = []; width = height = channels = None
+    while pos + 8 <= len(data):
+        length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]; pos += 12 + length
+        if tag == b"IHDR":
+            width, height, depth, color_type, _c, _f, interlace = struct.unpack(">IIBBBBB", body)
+            channels = {2: 3, 6: 4}.get(color_type)
+            if depth != 8 or channels is None or interlace: return None
+        elif tag == b"IDAT": idat.append(body)
+        elif tag == b"IEND": break
+    if not width or not idat: return None
+    try: raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8)
+    except zlib.error: return None
+    if raw.size != height * (width * channels + 1): return None
+    raw = raw.reshape(height, width * channels + 1)
+    if raw[:, 0].any(): return None # Filtered scanlines are not supported
+    pixels = raw[:, 1:].reshape(height, width, channels)
+    if channels == 3:
+        pixels = np.concatenate([pixels, np.full((height, width, 1), 255, dtype=np.uint8)], axis=2)
+    return pixels
+
+def set_preview_rgba(img: bpy.types.Image, rgba: np.ndarray) -> None:
+    """Sets the image preview from an (h, w, 4) uint8 array so Blender does not have to generate it."""
+    height, width = rgba.shape[:2]
+    preview = img.preview or img.preview_ensure()
+    preview.image_size = (width, height)
+    pixels = (rgba[::-1].astype(np.float32) / 255.0).ravel() # Blender stores rows bottom-up
+    preview.image_pixels_float.foreach_set(pixels)
+
+def write_thumbnail(img: bpy.types.Image, path: str) -> bool:
+    """Writes the image preview as PNG file. Returns False if no preview is available."""
+    rgba = get_preview_rgba(img)
+    if rgba is None: return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f: f.write(encode_png(rgba))
+    return True
@@ -0,0 +1,150 @@
+import bpy
+import os
+import time
+# Relative imports
+from . import core
+from .palette import assign_palette
+from .scheduling import enqueue_task
+from . import instrumentation
+
+# Shared import path for image files: used by the modal Add Pin From File operator and
+# by scripted imports. Work is done in steps so callers can spread it over several ticks.
+
+def _abspath(path: str) -> str:
+    return os.path.normcase(os.path.abspath(bpy.path.abspath(path)))
+
+def queue_pin_finalize(owner, board, pin_indices) -> None:
+    """
+    Queues preview generation and palette extraction for pins as background tasks.
+    Pins are looked up again by uid when the task runs, so board edits in between are safe.
+    owner is the scene showing the board or the board store (see core.get_store).
+    """
+    store_key = core.get_store_key(owner); board_uid = board.uid
+    for idx in pin_indices:
+        pin_uid = board.pins[idx].uid
+        def task(idx=idx, pin_uid=pin_uid):
+            store = core.find_store(store_key)
+            if store is None: return
+            _board_idx, board = core.find_board(store, board_uid)
+            if board is None: return
+            pin_idx = core.find_pin_index(board, pin_uid, hint=idx)
+            if pin_idx < 0: return
+            pin = board.pins[pin_idx]
+            if pin.image is None: return
+            if not pin.image.preview: pin.image.preview_ensure(); instrumentation.count("preview_requests")
+            if not len(pin.palette): assign_palette(pin)
+        enqueue_task(task)
+
+class ImageIngest:
+    """
+    Adds image files to a board, a chunk at a time (see step()).
+    Known images are reused, new files are loaded once without the extra reload,
+    and duplicates on the board are skipped using a set instead of a scan per file.
+    """
+
+    def __init__(self, owner, board, paths):
+        self.owner = owner # The scene showing the board, or the board store (see core.get_store)
+        self.board_uid = board.uid
+        self.board_index, _board = core.find_board(owner, board.uid)
+        self.paths = list(paths)
+        self.position = 0
+        self.added = 0; self.skipped = 0
+        self.errors = []   # (path, message)
+        self.new_pins = []   # (uid, index when added): pins may be moved or removed between steps
+        self.start_time = time.perf_counter()
+        # Built once instead of per file: Blender's own check_existing scans all images on every load
+        self.images_by_path = {
+            _abspath(img.filepath): img for img in bpy.data.images
+            if img.source == 'FILE' and img.filepath and not img.library
+        }
+        self.board_images = {pin.image.as_pointer() for pin in board.pins if pin.image}
+
+    @property
+    def total(self) -> int: return len(self.paths)
+
+    @property
+    def done(self) -> bool: return self.position >= len(self.paths)
+
+    @property
+    def new_pin_indices(self) -> list[int]:
+        """Current indices of the pins added so far that still exist, looked up by uid."""
+        board = self.get_board()
+        if board is None: return []
+        indices = (core.find_pin_index(board, uid, hint) for uid, hint in self.new_pins)
+        return [idx for idx in indices if idx >= 0]
+
+    def add_pin(self, board, img: bpy.types.Image):
+        """Adds a pin for the image and counts it as added by this import."""
+        pin = core.new_pin(board, img)
+        self.board_images.add(img.as_pointer())
+        self.new_pins.append((pin.uid, len(board.pins) - 1))
+        self.added += 1
+        return pin
+
+    def get_board(self):
+        """The target board, looked up again (the board collection may have been reallocated)."""
+        boards = core.get_boards(self.owner)
+        if 0 <= self.board_index < len(boards) and boards[self.board_index].uid == self.board_uid:
+            return boards[self.board_index]
+        self.board_index, board = core.find_board(self.owner, self.board_uid)
+        return board
+
+    def eta(self) -> float:
+        """Estimated remaining seconds, based on the speed so far."""
+        if not self.position: return 0.0
+        elapsed = time.perf_counter() - self.start_time
+        return elapsed / self.position * (len(self.paths) - self.position)
+
+    def load_image(self, fpath: str) -> bpy.types.Image:
+        key = _abspath(fpath)
+        img = self.images_by_path.get(key)
+        if img is not None:
+            img.reload() # Already in the file: pick up changes on disk
+        else:
+            img = bpy.data.images.load(fpath, check_existing=False) # Fresh: loaded once, no reload
+            instrumentation.count("image_loads")
+            self.images_by_path[key] = img
+        return img
+
+    def step(self, max_files: int = 0, time_budget: float = 0.0) -> bool:
+        """
+        Imports the next files, up to max_files and/or until time_budget seconds are used
+        (0 = no limit). Returns True when all files are done.
+        """
+        board = self.get_board()
+        if board is None:
+            self.errors.append(("", "Target board was removed")); self.position = len(self.paths)
+            return True
+        deadline = time.perf_counter() + time_budget if time_budget else None
+        count = 0
+        while self.position < len(self.paths):
+            fpath = self.paths[self.position]; self.position += 1
+            if os.path.isfile(fpath):
+                try:
+                    img = self.load_image(fpath)
+                    if img.as_pointer() in self.board_images:
+                        self.skipped += 1
+                    else:
+                        self.add_pin(board, img)
+                except Exception as e:
+                    self.errors.append((fpath, str(e)))
+            else:
+                self.errors.append((fpath, "Not a file"))
+            count += 1
+            if max_files and count >= max_files: break
+            if deadline and time.perf_counter() >= deadline: break
+        return self.done
+
+    def finish(self, defer_previews: bool = True) -> None:
+        """Makes the last added pin active and schedules (or runs) preview and palette generation."""
+        board = self.get_board()
+        if board is None: return
+        if self.added: board.active_pin_index = len(board.pins) - 1
+        new_pin_indices = self.new_pin_indices
+        if defer_previews:
+            queue_pin_finalize(self.owner, board, new_pin_indices)
+        else:
+            for idx in new_pin_indices:
+                pin = board.pins[idx]
+                if not pin.image.preview: pin.image.preview_ensure(); instrumentation.count("preview_requests")
+                assign_palette(pin)
@@ -0,0 +1,154 @@
+import bpy
+import time
+import functools
+from collections import deque
+# Relative import of core
+from . import core
+
+# Opt-in timing of the add-on's own callbacks, for answering "RefBoard is slow" reports.
+# When enabled, execute/poll of every REFBOARD_OT_* class and draw of every REFBOARD_PT_* panel
+# and of REFBOARD_UL_pins are replaced by timed wrappers; disabling puts the original functions
+# back, so a disabled layer costs nothing. Samples go into a ring buffer of fixed size.
+# count() is called where the add-on does I/O-sized work (image loads, preview requests,
+# downloads) and is a single flag check while disabled.
+
+DEFAULT_BUFFER_SIZE = 10000
+COUNTERS = ("preview_requests", "image_loads", "bytes_downloaded")
+_HOOKED_METHODS = {"REFBOARD_OT_": ("execute", "poll"), "REFBOARD_PT_": ("draw",), "REFBOARD_UL_pins": ("draw_item", "filter_items")}
+_EXCLUDED = {"REFBOARD_PT_Debug"} # The debug panel would mostly measure itself
+
+_enabled = False
+_classes = ()        # Classes that may be instrumented, set by register()
+_originals = []      # (class, attribute, original value) to restore on disable
+_samples = deque(maxlen=DEFAULT_BUFFER_SIZE) # (hook, seconds, end time)
+_counters = dict.fromkeys(COUNTERS, 0)
+_profiler = None     # cProfile.Profile while profiling is on
+_depth = 0           # Nesting of timed calls; only the outermost one switches the profiler
+startup = {"import_ms": 0.0, "register_ms": 0.0} # Filled in by the add-on's __init__, always measured
+
+def is_enabled() -> bool:
+    return _enabled
+
+def count(name: str, amount: int = 1) -> None:
+    if _enabled: _counters[name] += amount
+
+def _record(hook: str, start: float) -> None:
+    end = time.perf_counter()
+    _samples.append((hook, end - start, end))
+
+def _timed(func, hook: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _depth
+        start = time.perf_counter()
+        if _profiler is not None and not _depth: _profiler.enable()
+        _depth += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _depth -= 1
+            if _profiler is not None and not _depth: _profiler.disable()
+            _record(hook, start)
+    return wrapper
+
+def _hooked_methods(cls) -> tuple:
+    if cls.__name__ in _EXCLUDED: return ()
+    for prefix, methods in _HOOKED_METHODS.items():
+        if cls.__name__.startswith(prefix): return methods
+    return ()
+
+def enable(buffer_size: int = DEFAULT_BUFFER_SIZE, profile: bool = False) -> None:
+    """Wraps the hooks of the registered classes (idempotent) and starts collecting."""
+    global _enabled, _samples, _profiler
+    if _samples.maxlen != buffer_size: _samples = deque(_samples, maxlen=buffer_size)
+    if not profile: _profiler = None
+    elif _profiler is None:
+        import cProfile
+        _profiler = cProfile.Profile()
+    if _enabled: return
+    for cls in _classes:
+        for attr in _hooked_methods(cls):
+            original = cls.__dict__.get(attr)
+            if original is None: continue # Inherited or not implemented
+            hook = f"{cls.__name__}.{attr}"
+            if isinstance(original, classmethod):
+                setattr(cls, attr, classmethod(_timed(original.__func__, hook)))
+            else:
+                setattr(cls, attr, _timed(original, hook))
+            _originals.append((cls, attr, original))
+    _enabled = True
+
+def disable() -> None:
+    """Restores the original functions. Collected data is kept until reset()."""
+    global _enabled, _profiler
+    for cls, attr, original in reversed(_originals):
+        setattr(cls, attr, original)
+    _originals.clear()
+    _enabled = False
+    if _profiler is not None: _profiler.disable()
+    _profiler = None
+
+def reset() -> None:
+    global _profiler
+    _samples.clear()
+    for name in _counters: _counters[name] = 0
+    if _profiler is not None: _profiler = type(_profiler)()
+
+def sync_with_preferences(prefs) -> None:
+    """Applies the instrumentation settings of the add-on preferences."""
+    if prefs is not None and prefs.use_instrumentation:
+        enable(prefs.instrumentation_buffer_size, prefs.instrumentation_profile)
+    else:
+        disable()
+
+# --- Reports ---
+def get_stats() -> list[dict]:
+    """Per-hook statistics of the samples in the buffer, slowest p95 first. Times in milliseconds."""
+    import numpy as np
+    by_hook = {}
+    for hook, seconds, _end in _samples:
+        by_hook.setdefault(hook, []).append(seconds)
+    stats = []
+    for hook, values in by_hook.items():
+        ms = np.array(values) * 1000.0
+        p50, p95 = np.percentile(ms, (50, 95))
+        stats.append({
+            "hook": hook, "calls": len(values), "total_ms": float(ms.sum()),
+            "p50_ms": float(p50), "p95_ms": float(p95), "max_ms": float(ms.max()),
+        })
+    stats.sort(key=lambda s: s["p95_ms"], reverse=True)
+    return stats
+
+def get_counters() -> dict:
+    return dict(_counters)
+
+def export_json(filepath: str) -> None:
+    import json
+    data = {
+        "blender": bpy.app.version_string,
+        "exported": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "buffer_size": _samples.maxlen,
+        "startup": dict(startup),
+        "counters": get_counters(),
+        "hooks": get_stats(),
+        "samples": [[hook, seconds * 1000.0, end] for hook, seconds, end in _samples],
+    }
+    with open(filepath, 'w', encoding="utf-8") as f: json.dump(data, f, indent=1)
+
+def export_profile(filepath: str) -> bool:
+    """Writes the cProfile stats (pstats format). False if profiling is not on."""
+    if _profiler is None: return False
+    _profiler.dump_stats(filepath)
+    return True
+
+# --- Registration ---
+def register(classes) -> None:
+    """Remembers the add-on classes and enables instrumentation if the preferences ask for it."""
+    global _classes
+    _classes = tuple(classes)
+    sync_with_preferences(core.get_preferences())
+
+def unregister() -> None:
+    global _classes
+    disable()
+    _classes = ()
@@ -0,0 +1,299 @@
+import bpy
+import os
+import time
+# Relative imports
+from . import core
+from . import image_utils
+from . import instrumentation
+from .preferences import get_default_library_path, is_library_enabled
+
+# Optional shared reference library: one SQLite database (per user or per studio share)
+# holding boards, pins, tags, content hashes, thumbnails and file locations of many .blend files.
+# Pin texts are indexed with FTS5 when the SQLite build supports it, with a LIKE fallback otherwise.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    source_file TEXT NOT NULL DEFAULT '',
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pins (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL,
+    board_id INTEGER NOT NULL REFERENCES boards(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    note TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    hash TEXT,
+    filepath TEXT NOT NULL DEFAULT '',
+    date_added REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pins_board ON pins(board_id, position);
+CREATE INDEX IF NOT EXISTS pins_hash ON pins(hash);
+CREATE TABLE IF NOT EXISTS pin_tags (
+    pin_id INTEGER NOT NULL REFERENCES pins(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pin_tags_tag ON pin_tags(tag);
+CREATE INDEX IF NOT EXISTS pin_tags_pin ON pin_tags(pin_id);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    thumbnail BLOB,
+    data BLOB
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS pins_fts USING fts5(
+    name, note, tags, link, content='pins', content_rowid='id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS pins_fts_insert AFTER INSERT ON pins BEGIN
+    INSERT INTO pins_fts(rowid, name, note, tags, link) VALUES (new.id, new.name, new.note, new.tags, new.link);
+END;
+CREATE TRIGGER IF NOT EXISTS pins_fts_delete AFTER DELETE ON pins BEGIN
+    INSERT INTO pins_fts(pins_fts, rowid, name, note, tags, link) VALUES ('delete', old.id, old.name, old.note, old.tags, old.link);
+END;
+CREATE TRIGGER IF NOT EXISTS pins_fts_update AFTER UPDATE ON pins BEGIN
+    INSERT INTO pins_fts(pins_fts, rowid, name, note, tags, link) VALUES ('delete', old.id, old.name, old.note, old.tags, old.link);
+    INSERT INTO pins_fts(rowid, name, note, tags, link) VALUES (new.id, new.name, new.note, new.tags, new.link);
+END;
+"""
+
+class LibraryDB:
+    """Thin wrapper around the library database connection."""
+
+    def __init__(self, path: str):
+        import sqlite3 # Loaded with the first library connection, not at add-on startup
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")   # Readers don't block the writer
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError: # SQLite built without FTS5
+            self.has_fts = False
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # --- Writing ---
+    def publish_board(self, board, source_file: str = "", with_thumbnails: bool = True) -> int:
+        """
+        Writes a scene board and all its pins to the library in one transaction, replacing an
+        earlier version of the same board. Images without a file on disk are stored as blobs.
+        Returns the number of pins written.
+        """
+        known_thumbs = {row[0] for row in self.conn.execute("SELECT hash FROM blobs WHERE thumbnail IS NOT NULL")}
+        pin_rows, tag_rows, blob_rows = [], [], {}
+        for position, pin in enumerate(board.pins):
+            img = pin.image
+            digest, filepath = None, ""
+            if img is not None:
+                digest = image_utils.get_image_hash(img)
+                if not img.packed_file and img.filepath:
+                    filepath = bpy.path.abspath(img.filepath, library=img.library)
+                if digest and digest not in known_thumbs and digest not in blob_rows:
+                    thumb = image_utils.get_preview_rgba(img) if with_thumbnails else None
+                    data = image_utils.get_image_bytes(img) if not filepath else None
+                    blob_rows[digest] = (image_utils.encode_png(thumb) if thumb is not None else None, data)
+            pin_rows.append((
+                pin.uid, position, pin.pin_name, pin.note, pin.tags, pin.external_link,
+                digest, filepath, pin.date_added,
+            ))
+            tag_rows.append(core.parse_tags(pin.tags))
+        with self.conn: # One transaction
+            self.conn.execute(
+                "INSERT INTO boards(uid, name, source_file, updated) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(uid) DO UPDATE SET name=excluded.name, source_file=excluded.source_file, updated=excluded.updated",
+                (board.uid, board.name, source_file, time.time())
+            )
+            board_id = self.conn.execute("SELECT id FROM boards WHERE uid=?", (board.uid,)).fetchone()[0]
+            self.conn.execute("DELETE FROM pins WHERE board_id=?", (board_id,))
+            for row, tags in zip(pin_rows, tag_rows):
+                pin_id = self.conn.execute(
+                    "INSERT INTO pins(uid, board_id, position, name, note, tags, link, hash, filepath, date_added) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (row[0], board_id, *row[1:])
+                ).lastrowid
+                if tags:
+                    self.conn.executemany("INSERT INTO pin_tags(pin_id, tag) VALUES (?, ?)", [(pin_id, t) for t in tags])
+            self.conn.executemany(
+                "INSERT INTO blobs(hash, thumbnail, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET thumbnail=COALESCE(blobs.thumbnail, excluded.thumbnail), "
+                "data=COALESCE(blobs.data, excluded.data)",
+                [(digest, thumb, data) for digest, (thumb, data) in blob_rows.items()]
+            )
+        return len(pin_rows)
+
+    def remove_board(self, board_uid: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM boards WHERE uid=?", (board_uid,))
+
+    # --- Reading ---
+    def list_boards(self) -> list:
+        return self.conn.execute(
+            "SELECT b.uid, b.name, b.source_file, COUNT(p.id) AS pin_count FROM boards b "
+            "LEFT JOIN pins p ON p.board_id = b.id GROUP BY b.id ORDER BY b.name"
+        ).fetchall()
+
+    def get_board(self, board_uid: str) -> "sqlite3.Row | None":
+        return self.conn.execute(
+            "SELECT b.uid, b.name, COUNT(p.id) AS pin_count FROM boards b "
+            "LEFT JOIN pins p ON p.board_id = b.id WHERE b.uid=? GROUP BY b.id", (board_uid,)
+        ).fetchone()
+
+    def fetch_pins(self, board_uid: str, offset: int, limit: int) -> list:
+        """One page of pins of a library board, in board order."""
+        return self.conn.execute(
+            "SELECT p.* FROM pins p JOIN boards b ON b.id = p.board_id "
+            "WHERE b.uid=? ORDER BY p.position LIMIT ? OFFSET ?", (board_uid, limit, offset)
+        ).fetchall()
+
+    def search(self, text: str, limit: int = 200) -> list:
+        """Pins of all library boards matching every word of text (as word prefixes), best match first."""
+        words = text.lower().split()
+        if not words: return []
+        columns = "p.uid, p.name, p.hash, p.filepath, p.tags, p.note, p.link, p.date_added, b.name AS board_name"
+        if self.has_fts:
+            # Quote each word so FTS syntax characters in user input are taken literally
+            match = " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+            return self.conn.execute(
+                f"SELECT {columns} FROM pins_fts f JOIN pins p ON p.id = f.rowid JOIN boards b ON b.id = p.board_id "
+                "WHERE pins_fts MATCH ? ORDER BY bm25(pins_fts) LIMIT ?", (match, limit)
+            ).fetchall()
+        where = " AND ".join("(p.name || ' ' || p.note || ' ' || p.tags || ' ' || p.link) LIKE ?" for _ in words)
+        return self.conn.execute(
+            f"SELECT {columns} FROM pins p JOIN boards b ON b.id = p.board_id WHERE {where} LIMIT ?",
+            (*[f"%{w}%" for w in words], limit)
+        ).fetchall()
+
+    def get_thumbnail(self, digest: str) -> bytes | None:
+        row = self.conn.execute("SELECT thumbnail FROM blobs WHERE hash=?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def get_data_size(self, digest: str) -> int | None:
+        row = self.conn.execute("SELECT length(data) FROM blobs WHERE hash=?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def get_data(self, digest: str) -> bytes | None:
+        row = self.conn.execute("SELECT data FROM blobs WHERE hash=?", (digest,)).fetchone()
+        return row[0] if row else None
+
+# --- Connection handling ---
+_libraries = {} # path -> LibraryDB
+
+def get_library_path(context: bpy.types.Context | None = None) -> str:
+    prefs = core.get_preferences(context)
+    path = prefs.library_path if prefs else ""
+    return bpy.path.abspath(path) if path else get_default_library_path()
+
+def is_enabled(context: bpy.types.Context | None = None) -> bool:
+    return is_library_enabled(context)
+
+def get_library(context: bpy.types.Context | None = None) -> LibraryDB:
+    """Returns the (cached) connection to the configured library, creating the database if needed."""
+    path = get_library_path(context)
+    library = _libraries.get(path)
+    if library is None:
+        library = _libraries[path] = LibraryDB(path)
+    return library
+
+def close_all() -> None:
+    for library in _libraries.values():
+        library.close()
+    _libraries.clear()
+
+# --- Materializing library pins in a scene ---
+def load_image_for_row(library: LibraryDB, row, images_by_hash: dict) -> bpy.types.Image | None:
+    """Finds or loads the image of a library pin: by hash, from its file, or from the stored blob."""
+    digest = row["hash"]
+    img = images_by_hash.get(digest) if digest else None
+    if img is not None: return img
+    filepath = row["filepath"]
+    if filepath and os.path.isfile(filepath):
+        img = bpy.data.images.load(filepath, check_existing=True)
+        instrumentation.count("image_loads")
+    elif digest:
+        data = library.get_data(digest)
+        if data: img = image_utils.load_image_from_bytes(row["name"] or digest[:12], data, digest)
+    if img is not None and digest:
+        if not img.get(image_utils.HASH_PROP): img[image_utils.HASH_PROP] = digest
+        images_by_hash[digest] = img
+    return img
+
+def get_row_size(library: LibraryDB, row) -> int | None:
+    """Size in bytes of a library pin's image source (its file, else the stored blob), without reading it."""
+    filepath = row["filepath"]
+    if filepath and os.path.isfile(filepath): return os.path.getsize(filepath)
+    return library.get_data_size(row["hash"]) if row["hash"] else None
+
+def add_rows_to_board(library: LibraryDB, board, rows) -> tuple[int, int]:
+    """Creates pins for library rows on a scene board. Returns (added, missing image) counts."""
+    images_by_hash = image_utils.find_images_by_hash()
+    added = missing = 0
+    for row in rows:
+        img = load_image_for_row(library, row, images_by_hash)
+        if img is None:
+            missing += 1; continue
+        pin = core.new_pin(board, img)
+        pin.pin_name = row["name"] or img.name
+        pin.note = row["note"]; pin.tags = row["tags"]; pin.external_link = row["link"]
+        if row["date_added"]: pin.date_added = row["date_added"]
+        added += 1
+    return added, missing
+
+def load_next_page(library: LibraryDB, board, page_size: int) -> tuple[int, int]:
+    """Pages the next pins of a mounted library board in from the database."""
+    rows = library.fetch_pins(board.library_uid, board.library_offset, page_size)
+    board.library_offset += len(rows)
+    return add_rows_to_board(library, board, rows)
+
+# --- Thumbnails of search results ---
+_previews = None
+
+def get_loaded_thumbnail_icon(digest: str) -> int:
+    """Icon id of a thumbnail already loaded by get_thumbnail_icon(), else 0. Safe to call from draw()."""
+    return _previews[digest].icon_id if _previews is not None and digest in _previews else 0
+
+def get_thumbnail_icon(library: LibraryDB, digest: str) -> int:
+    """
+    Icon id of the stored thumbnail for a content hash (0 if there is none). Loaded once per session;
+    this reads the database and writes a temporary file, so call it from operators, not from draw().
+    """
+    global _previews
+    if not digest: return 0
+    if _previews is None:
+        import bpy.utils.previews
+        _previews = bpy.utils.previews.new()
+    if digest in _previews: return _previews[digest].icon_id
+    data = library.get_thumbnail(digest)
+    if not data: return 0
+    import tempfile
+    thumb_dir = os.path.join(tempfile.gettempdir(), "refboard_thumbs")
+    path = os.path.join(thumb_dir, f"{digest}.png")
+    if not os.path.exists(path):
+        os.makedirs(thumb_dir, exist_ok=True)
+        with open(path, 'wb') as f: f.write(data)
+    return _previews.load(digest, path, 'IMAGE').icon_id
+
+def register():
+    pass
+
+def unregister():
+    global _previews
+    if _previews is not None:
+        import bpy.utils.previews
+        bpy.utils.previews.remove(_previews)
+        _previews = None
+    close_all()
+
+# Loaded on first use, not at add-on startup: hooks itself up when imported (see __init__.lazy_modules)
+register()
@@ -1,7 +1,9 @@
 import bpy
 from bpy.props import EnumProperty
 from bpy.types import Operator
-# Relative import is not needed, as get_active_board is not used here.
+# Relative imports
+from ..core import new_board, get_boards, get_store, remove_board, move_board
+from ..scheduling import request_redraw
 
 class REFBOARD_OT_AddBoard(Operator):
     bl_idname = "refboard.add_board"
@@ -9,16 +11,16 @@ class REFBOARD_OT_AddBoard(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     def execute(self, context):
         scene = context.scene
-        new_board = scene.refboard_boards.add()
+        boards = get_boards(scene)
         base_name = "Board"
         count = 1
-        existing_names = {b.name for b in scene.refboard_boards}
-        new_name = f"{base_name} {len(scene.refboard_boards)}"
+        existing_names = {b.name for b in boards}
+        new_name = f"{base_name} {len(boards) + 1}"
         while new_name in existing_names:
             count += 1
-            new_name = f"{base_name} {len(scene.refboard_boards) + count}"
-        new_board.name = new_name
-        scene.refboard_active_board_index = len(scene.refboard_boards) - 1
+            new_name = f"{base_name} {len(boards) + count}"
+        new_board(scene, new_name)
+        scene.refboard_active_board_index = len(get_boards(scene)) - 1
         return {'FINISHED'}
 
 class REFBOARD_OT_RemoveBoard(Operator):
@@ -27,15 +29,12 @@ class REFBOARD_OT_RemoveBoard(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     @classmethod
     def poll(cls, context):
-        return len(context.scene.refboard_boards) > 0 and context.scene.refboard_active_board_index >= 0
+        return len(get_boards(context.scene)) > 0 and context.scene.refboard_active_board_index >= 0
     def execute(self, context):
         scene = context.scene
-        boards = scene.refboard_boards
         index = scene.refboard_active_board_index
-        if 0 <= index < len(boards):
-            boards.remove(index)
-            scene.refboard_active_board_index = min(max(0, index - 1), len(boards) - 1)
-            if not boards: scene.refboard_active_board_index = -1
+        if 0 <= index < len(get_boards(scene)):
+            remove_board(get_store(scene), index) # Also updates the other scenes showing the boards
         return {'FINISHED'}
 
 class REFBOARD_OT_MoveBoard(Operator):
@@ -48,9 +47,8 @@ class REFBOARD_OT_MoveBoard(Operator):
         return context.scene.refboard_active_board_index >= 0
     def execute(self, context):
         scene = context.scene
-        boards = scene.refboard_boards
         old_index = scene.refboard_active_board_index
-        board_count = len(boards)
+        board_count = len(get_boards(scene))
         if self.direction == 'UP':
             if old_index <= 0: return {'CANCELLED'}
             new_index = old_index - 1
@@ -58,9 +56,8 @@ class REFBOARD_OT_MoveBoard(Operator):
             if old_index >= board_count - 1: return {'CANCELLED'}
             new_index = old_index + 1
         else: return {'CANCELLED'}
-        boards.move(old_index, new_index)
-        scene.refboard_active_board_index = new_index
-        if context.area: context.area.tag_redraw()
+        move_board(get_store(scene), old_index, new_index)
+        request_redraw(context)
         return {'FINISHED'}
 
 # List of classes for registration by this module.
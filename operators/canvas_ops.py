@@ -0,0 +1,145 @@
+import bpy
+import numpy as np
+from bpy.types import Operator
+# Relative imports (the canvas module itself is loaded with the first canvas, not at add-on startup)
+from ..core import get_active_board, get_selection, set_selection
+from ..scheduling import request_redraw
+from ..sorting import get_sorted_indices
+
+ZOOM_STEP = 1.15 # Zoom (and Alt+wheel scale) factor per wheel step
+
+def _window_region(area):
+    return next((region for region in area.regions if region.type == 'WINDOW'), None)
+
+class REFBOARD_OT_OpenCanvas(Operator):
+    """Shows the active board as a free-form canvas in an Image Editor (opens a new window if there is none)"""
+    bl_idname = "refboard.open_canvas"
+    bl_label = "Open Canvas"
+    bl_options = {'REGISTER'}
+    @classmethod
+    def poll(cls, context): return get_active_board(context) is not None and not bpy.app.background
+    def execute(self, context):
+        from .. import canvas
+        board = get_active_board(context)
+        window = context.window
+        area = next((area for area in window.screen.areas if area.type == 'IMAGE_EDITOR'), None)
+        if area is None:
+            bpy.ops.wm.window_new()
+            window = context.window_manager.windows[-1]
+            area = window.screen.areas[0]
+            area.type = 'IMAGE_EDITOR'
+        region = _window_region(area)
+        if canvas.open_canvas(area, board):
+            canvas.frame_all(board, region.width, region.height)
+            with context.temp_override(window=window, area=area, region=region):
+                bpy.ops.refboard.canvas_navigate('INVOKE_DEFAULT')
+        return {'FINISHED'}
+
+class REFBOARD_OT_CanvasNavigate(Operator):
+    """Canvas interaction: wheel zooms, middle mouse or dragging empty space pans, dragging pins moves them, Alt+wheel scales pins, Home frames all, Esc closes the canvas"""
+    bl_idname = "refboard.canvas_navigate"
+    bl_label = "Canvas Navigation"
+    bl_options = {'INTERNAL'}
+    def invoke(self, context, event):
+        from .. import canvas
+        if not canvas.is_canvas_area(context.area): return {'CANCELLED'}
+        self.area_pointer = context.area.as_pointer()
+        self.drag = None # 'PAN' or 'MOVE' while a mouse button is held
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        from .. import canvas
+        area = next((area for area in context.window.screen.areas if area.as_pointer() == self.area_pointer), None)
+        board = canvas.get_canvas_board(context.scene, self.area_pointer)
+        if area is None or area.type != 'IMAGE_EDITOR' or board is None:
+            canvas.close_canvas(self.area_pointer); return {'FINISHED'}
+        region = _window_region(area)
+        x, y = event.mouse_x - region.x, event.mouse_y - region.y
+        if self.drag:
+            self.modal_drag(board, event, x, y)
+            area.tag_redraw(); return {'RUNNING_MODAL'}
+        if not (0 <= x < region.width and 0 <= y < region.height): return {'PASS_THROUGH'}
+
+        if event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'}:
+            factor = ZOOM_STEP if event.type == 'WHEELUPMOUSE' else 1.0 / ZOOM_STEP
+            hit = canvas.hit_test(board, region.width, region.height, x, y) if event.alt else -1
+            if hit >= 0:
+                selection = get_selection(board)
+                canvas.scale_pins(board, np.flatnonzero(selection) if selection[hit] else [hit], factor)
+                bpy.ops.ed.undo_push(message="Scale Pins")
+            elif not event.alt:
+                canvas.zoom_at(board, region.width, region.height, x, y, factor)
+        elif event.type == 'MIDDLEMOUSE' and event.value == 'PRESS':
+            self.start_drag('PAN', board, x, y)
+        elif event.type == 'LEFTMOUSE' and event.value == 'PRESS':
+            self.click(board, region, event, x, y)
+        elif event.type in {'HOME', 'F'} and event.value == 'PRESS':
+            canvas.frame_all(board, region.width, region.height)
+        elif event.type == 'ESC' and event.value == 'PRESS':
+            canvas.close_canvas(self.area_pointer); return {'FINISHED'}
+        else:
+            return {'PASS_THROUGH'}
+        area.tag_redraw()
+        return {'RUNNING_MODAL'}
+
+    def click(self, board, region, event, x, y):
+        """Selects like the pin grid (Shift toggles) and starts moving the selection, or panning on empty space."""
+        from .. import canvas
+        hit = canvas.hit_test(board, region.width, region.height, x, y)
+        selection = get_selection(board)
+        if hit < 0:
+            if not event.shift and selection.any(): set_selection(board, np.zeros_like(selection))
+            self.start_drag('PAN', board, x, y)
+        else:
+            if event.shift: selection[hit] = not selection[hit]
+            elif not selection[hit]: selection[:] = False; selection[hit] = True
+            set_selection(board, selection)
+            board.active_pin_index = hit; board.select_anchor_index = hit
+            if selection[hit]: self.start_drag('MOVE', board, x, y)
+        request_redraw() # The sidebar shows the selection too
+
+    def start_drag(self, mode, board, x, y):
+        self.drag = mode; self.start = (x, y); self.moved = False
+        self.start_view = (board.canvas_view_x, board.canvas_view_y)
+        if mode == 'MOVE':
+            from .. import canvas
+            self.indices = np.flatnonzero(get_selection(board))
+            xs, ys = canvas.get_positions(board)
+            self.start_x = xs[self.indices]; self.start_y = ys[self.indices]
+
+    def modal_drag(self, board, event, x, y):
+        if event.type == 'MOUSEMOVE':
+            dx = (x - self.start[0]) / board.canvas_zoom; dy = (y - self.start[1]) / board.canvas_zoom
+            self.moved = True
+            if self.drag == 'PAN':
+                board.canvas_view_x = self.start_view[0] - dx; board.canvas_view_y = self.start_view[1] + dy
+            else:
+                from .. import canvas
+                canvas.set_positions(board, self.indices, self.start_x + dx, self.start_y - dy)
+        elif event.type in {'LEFTMOUSE', 'MIDDLEMOUSE'} and event.value == 'RELEASE':
+            if self.drag == 'MOVE' and self.moved: bpy.ops.ed.undo_push(message="Move Pins")
+            self.drag = None
+
+class REFBOARD_OT_ArrangeCanvas(Operator):
+    """Lays out all pins of the active board in a grid on the canvas, in display order"""
+    bl_idname = "refboard.arrange_canvas"
+    bl_label = "Arrange Canvas"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and len(board.pins) > 0
+    def execute(self, context):
+        from .. import canvas
+        board = get_active_board(context)
+        order = get_sorted_indices(board)
+        canvas.arrange_pins(board, order if order is not None else np.arange(len(board.pins)))
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_OpenCanvas,
+    REFBOARD_OT_CanvasNavigate,
+    REFBOARD_OT_ArrangeCanvas,
+)
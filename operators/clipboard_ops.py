@@ -0,0 +1,108 @@
+import bpy
+import os
+from bpy.types import Operator
+# Relative imports
+from ..core import get_active_board, new_pin, find_pin_index
+from ..ingest import ImageIngest, queue_pin_finalize
+from ..scheduling import request_redraw
+from .. import image_utils
+from .. import instrumentation
+from .. import url_refresh
+
+_addon_keymaps = [] # (keymap, item) pairs to remove on unregister
+
+class REFBOARD_OT_PasteFromClipboard(Operator):
+    """Adds the clipboard content to the active board: image data (packed from memory), copied image links or copied image files"""
+    bl_idname = "refboard.paste_from_clipboard"
+    bl_label = "Paste from Clipboard"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context): return get_active_board(context) is not None
+    def execute(self, context):
+        from .. import clipboard # Imported on first use
+        scene = context.scene; board = get_active_board(context)
+        self.new_pins = []; self.skipped = 0 # (uid, index when added) of the new pins
+        self.known = image_utils.find_images_by_hash()
+        self.board_content = None # Content of the board's images, gathered by the first add_bytes()
+        errors = []
+        data = clipboard.read_image()
+        if data:
+            self.add_bytes(board, data, "clipboard")
+        else:
+            paths, urls = clipboard.parse_text(clipboard.read_text())
+            if not paths and not urls:
+                self.report({'WARNING'}, "The clipboard holds no image, image link or image file."); return {'CANCELLED'}
+            if paths:
+                ingest = ImageIngest(scene, board, paths)
+                ingest.step()
+                board = ingest.get_board()
+                self.new_pins.extend(ingest.new_pins); self.skipped += ingest.skipped
+                errors.extend(ingest.errors)
+            if urls:
+                errors.extend(self.add_urls(board, urls))
+        for source, message in errors[:10]:
+            self.report({'ERROR'}, f"Paste failed '{os.path.basename(source) or source}': {message}")
+        new_pin_indices = [idx for idx in (find_pin_index(board, uid, hint) for uid, hint in self.new_pins) if idx >= 0]
+        if new_pin_indices:
+            board.active_pin_index = new_pin_indices[-1]
+            queue_pin_finalize(scene, board, new_pin_indices) # Previews and palettes in the background
+        if self.skipped: self.report({'INFO'}, f"Skipped {self.skipped} image(s) already on the board.")
+        self.report({'INFO'}, f"Pasted {len(new_pin_indices)} pin(s).")
+        request_redraw(context)
+        return {'FINISHED'} if new_pin_indices or self.skipped else {'CANCELLED'}
+
+    def add_bytes(self, board, data: bytes, name: str, url: str = "", validators=None) -> None:
+        """Adds a pin for encoded image bytes, reusing the image with the same content hash."""
+        from .. import clipboard
+        digest = image_utils.hash_bytes(data)
+        if self.board_content is None: # Cached hashes; other board images are only hashed on a size match
+            self.board_content = image_utils.ContentSet(pin.image for pin in board.pins if pin.image)
+        if self.board_content.contains(digest, len(data)):
+            self.skipped += 1; return
+        img = self.known.get(digest)
+        if img is None:
+            root, ext = os.path.splitext(name)
+            img = self.known[digest] = image_utils.load_image_from_bytes(
+                f"{root}_{digest[:8]}{ext or clipboard.guess_extension(data)}", data, digest)
+        pin = new_pin(board, img)
+        if url:
+            pin.external_link = url
+            url_refresh.set_source(pin, validators or {}, digest)
+        self.board_content.add(digest)
+        self.new_pins.append((pin.uid, len(board.pins) - 1))
+
+    def add_urls(self, board, urls: list[str]) -> list[tuple[str, str]]:
+        """Downloads image links in parallel and adds them from memory. Returns (url, error) pairs."""
+        from concurrent.futures import ThreadPoolExecutor
+        import urllib.parse
+        def fetch(url):
+            try: return url_refresh.fetch_conditional(url), None
+            except Exception as e: return None, str(getattr(e, "reason", e))
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(url_refresh.MAX_WORKERS, len(urls))) as pool:
+            for url, (result, error) in zip(urls, pool.map(fetch, urls)):
+                if error: errors.append((url, error)); continue
+                _status, data, validators = result
+                instrumentation.count("bytes_downloaded", len(data))
+                name = os.path.basename(urllib.parse.urlparse(url).path) or "web_image"
+                self.add_bytes(board, data, name, url, validators)
+        return errors
+
+# --- Keymap ---
+def register_keymaps() -> None:
+    """Ctrl+Shift+V pastes into the active board from any editor (editor shortcuts take precedence)."""
+    keyconfig = bpy.context.window_manager.keyconfigs.addon
+    if keyconfig is None: return # Background mode
+    keymap = keyconfig.keymaps.new(name="Window", space_type='EMPTY')
+    item = keymap.keymap_items.new(REFBOARD_OT_PasteFromClipboard.bl_idname, 'V', 'PRESS', ctrl=True, shift=True)
+    _addon_keymaps.append((keymap, item))
+
+def unregister_keymaps() -> None:
+    for keymap, item in _addon_keymaps:
+        keymap.keymap_items.remove(item)
+    _addon_keymaps.clear()
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_PasteFromClipboard,
+)
@@ -0,0 +1,109 @@
+import bpy
+import numpy as np
+from bpy.props import BoolProperty, EnumProperty, IntProperty
+from bpy.types import Operator
+# Relative imports
+from ..core import get_active_board, get_boards, get_selection, set_selection
+from ..palette import assign_palette, get_color_index
+from ..scheduling import request_redraw
+
+class REFBOARD_OT_ComputePalettes(Operator):
+    """Extracts the main colors of the pin images of the active board"""
+    bl_idname = "refboard.compute_palettes"
+    bl_label = "Compute Palettes"
+    bl_options = {'REGISTER', 'UNDO'}
+    overwrite: BoolProperty(name="Overwrite", default=False, description="Also recompute existing palettes")
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and len(board.pins) > 0
+    def execute(self, context):
+        board = get_active_board(context)
+        if not board: return {'CANCELLED'}
+        pins = [pin for pin in board.pins if pin.image and (self.overwrite or not len(pin.palette))]
+        wm = context.window_manager
+        wm.progress_begin(0, len(pins))
+        computed = 0
+        try:
+            for i, pin in enumerate(pins):
+                try:
+                    computed += assign_palette(pin)
+                except Exception as e: self.report({'WARNING'}, f"Palette failed for '{pin.pin_name}': {e}")
+                wm.progress_update(i + 1)
+        finally:
+            wm.progress_end()
+        self.report({'INFO'}, f"Computed {computed} palette(s).")
+        request_redraw(context)
+        return {'FINISHED'}
+
+def select_similar_pins(scene, color, tolerance: float, active_only: bool, extend: bool) -> tuple[int, int]:
+    """Selects pins with a palette color near the given color. Returns (pin count, board count)."""
+    hits = get_color_index(scene).query(color, tolerance)
+    active_idx = scene.refboard_active_board_index
+    if active_only:
+        hits = [hit for hit in hits if hit[0] == active_idx]
+    # Group hits per board and write each board's selection in one call
+    hits_per_board = {}
+    for board_idx, pin_idx, _dist in hits:
+        hits_per_board.setdefault(board_idx, []).append(pin_idx)
+    for board_idx, board in enumerate(get_boards(scene)):
+        if active_only and board_idx != active_idx: continue
+        selection = get_selection(board) if extend else np.zeros(len(board.pins), dtype=bool)
+        selection[hits_per_board.get(board_idx, [])] = True
+        set_selection(board, selection)
+    return len(hits), len(hits_per_board)
+
+class REFBOARD_OT_SearchByColor(Operator):
+    """Selects the pins whose palette contains a color similar to the search color"""
+    bl_idname = "refboard.search_by_color"
+    bl_label = "Find Similar Colors"
+    bl_options = {'REGISTER', 'UNDO'}
+    scope: EnumProperty(
+        items=[('ACTIVE', "Active Board", ""), ('ALL', "All Boards", "")],
+        name="Scope", default='ACTIVE'
+    )
+    extend: BoolProperty(name="Extend", default=False, description="Keep the current selection")
+    @classmethod
+    def poll(cls, context): return len(get_boards(context.scene)) > 0
+    def execute(self, context):
+        scene = context.scene
+        pin_count, board_count = select_similar_pins(
+            scene, scene.refboard_color_query, scene.refboard_color_tolerance,
+            active_only=self.scope == 'ACTIVE', extend=self.extend
+        )
+        if not pin_count:
+            self.report({'INFO'}, "No pins with a similar color.")
+        else:
+            self.report({'INFO'}, f"Found {pin_count} pin(s) on {board_count} board(s).")
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_SearchBySwatch(Operator):
+    """Uses this palette color of the active pin as search color and selects similar pins"""
+    bl_idname = "refboard.search_by_swatch"
+    bl_label = "Find Pins With This Color"
+    bl_options = {'REGISTER', 'UNDO'}
+    index: IntProperty(name="Swatch", default=0)
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and 0 <= board.active_pin_index < len(board.pins)
+    def execute(self, context):
+        board = get_active_board(context)
+        pin = board.pins[board.active_pin_index]
+        if not (0 <= self.index < len(pin.palette)): return {'CANCELLED'}
+        scene = context.scene
+        scene.refboard_color_query = pin.palette[self.index].color
+        pin_count, _board_count = select_similar_pins(
+            scene, scene.refboard_color_query, scene.refboard_color_tolerance, active_only=True, extend=False
+        )
+        self.report({'INFO'}, f"Found {pin_count} pin(s) with a similar color.")
+        request_redraw(context)
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_ComputePalettes,
+    REFBOARD_OT_SearchByColor,
+    REFBOARD_OT_SearchBySwatch,
+)
@@ -0,0 +1,52 @@
+import bpy
+from bpy.props import StringProperty, EnumProperty
+from bpy.types import Operator
+# Relative import of the instrumentation layer
+from .. import instrumentation
+
+class REFBOARD_OT_ExportInstrumentation(Operator):
+    """Saves the collected timings as JSON, or the profiler data as .prof (pstats) file"""
+    bl_idname = "refboard.export_instrumentation"
+    bl_label = "Export Timings"
+    bl_options = {'REGISTER'}
+    filepath: StringProperty(subtype='FILE_PATH')
+    format: EnumProperty(
+        items=[
+            ('JSON', "JSON", "Counters, per-hook statistics and raw samples"),
+            ('PROFILE', "cProfile", "Python profiler statistics, e.g. for snakeviz or pstats"),
+        ], name="Format", default='JSON'
+    )
+    @classmethod
+    def poll(cls, context): return instrumentation.is_enabled()
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "refboard_timings.json" if self.format == 'JSON' else "refboard_profile.prof"
+        context.window_manager.fileselect_add(self); return {'RUNNING_MODAL'}
+    def execute(self, context):
+        if self.format == 'JSON':
+            filepath = bpy.path.ensure_ext(self.filepath, ".json")
+            instrumentation.export_json(filepath)
+        else:
+            filepath = bpy.path.ensure_ext(self.filepath, ".prof")
+            if not instrumentation.export_profile(filepath):
+                self.report({'WARNING'}, "Enable 'Collect cProfile Data' in the add-on preferences first.")
+                return {'CANCELLED'}
+        self.report({'INFO'}, f"Saved {filepath}")
+        return {'FINISHED'}
+
+class REFBOARD_OT_ResetInstrumentation(Operator):
+    """Clears the collected timings and counters"""
+    bl_idname = "refboard.reset_instrumentation"
+    bl_label = "Reset Timings"
+    bl_options = {'REGISTER'}
+    @classmethod
+    def poll(cls, context): return instrumentation.is_enabled()
+    def execute(self, context):
+        instrumentation.reset()
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_ExportInstrumentation,
+    REFBOARD_OT_ResetInstrumentation,
+)
@@ -0,0 +1,164 @@
+import bpy
+import time
+from bpy.props import EnumProperty, IntProperty
+from bpy.types import Operator
+# Relative imports
+from ..core import get_active_board, get_boards, get_preferences, new_board
+from ..preferences import is_library_enabled
+from .. import image_utils
+from ..scheduling import request_redraw
+# The library module (SQLite) is loaded by the first library operation, not at add-on startup
+
+def _library_poll(context) -> bool:
+    return is_library_enabled(context)
+
+class REFBOARD_OT_PublishBoard(Operator):
+    """Stores the active board in the shared library so it can be searched and mounted from other .blend files"""
+    bl_idname = "refboard.publish_board"
+    bl_label = "Publish Board to Library"
+    bl_options = {'REGISTER'}
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return _library_poll(context) and board is not None and not board.library_uid
+    def execute(self, context):
+        from .. import library
+        board = get_active_board(context)
+        start = time.perf_counter()
+        try:
+            count = library.get_library(context).publish_board(board, source_file=bpy.data.filepath)
+        except Exception as e:
+            self.report({'ERROR'}, f"Publish failed: {e}"); return {'CANCELLED'}
+        self.report({'INFO'}, f"Published {count} pin(s) of '{board.name}' in {time.perf_counter() - start:.2f}s.")
+        return {'FINISHED'}
+
+_board_items = [] # Keep enum strings referenced (Blender does not copy dynamic enum items)
+
+def _library_board_items(self, context):
+    global _board_items
+    from .. import library
+    try:
+        rows = library.get_library(context).list_boards()
+    except Exception:
+        rows = []
+    _board_items = [(row["uid"], f"{row['name']} ({row['pin_count']})", row["source_file"]) for row in rows]
+    return _board_items or [('NONE', "No Boards", "")]
+
+class REFBOARD_OT_MountLibraryBoard(Operator):
+    """Adds a board that shows a library board; its pins are loaded page by page"""
+    bl_idname = "refboard.mount_library_board"
+    bl_label = "Mount Library Board"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_property = "library_board"
+    library_board: EnumProperty(name="Library Board", items=_library_board_items)
+    @classmethod
+    def poll(cls, context): return _library_poll(context)
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+    def execute(self, context):
+        from .. import library
+        if self.library_board == 'NONE': return {'CANCELLED'}
+        db = library.get_library(context)
+        row = db.get_board(self.library_board)
+        if row is None:
+            self.report({'WARNING'}, "Board not found in library."); return {'CANCELLED'}
+        scene = context.scene
+        board = new_board(scene, row["name"])
+        board.library_uid = row["uid"]; board.library_total = row["pin_count"]
+        scene.refboard_active_board_index = len(get_boards(scene)) - 1
+        prefs = get_preferences(context)
+        added, missing = library.load_next_page(db, board, prefs.library_page_size if prefs else 200)
+        self.report({'INFO'}, f"Mounted '{board.name}': {added} of {board.library_total} pin(s) loaded"
+                    + (f", {missing} image(s) not found." if missing else "."))
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_LoadLibraryPins(Operator):
+    """Loads the next page of pins of the mounted library board"""
+    bl_idname = "refboard.load_library_pins"
+    bl_label = "Load More Pins"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return _library_poll(context) and board and board.library_uid and board.library_offset < board.library_total
+    def execute(self, context):
+        from .. import library
+        board = get_active_board(context)
+        prefs = get_preferences(context)
+        added, missing = library.load_next_page(library.get_library(context), board, prefs.library_page_size if prefs else 200)
+        self.report({'INFO'}, f"Loaded {added} pin(s)" + (f", {missing} image(s) not found." if missing else "."))
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_SearchLibrary(Operator):
+    """Full-text search over all boards of the shared library"""
+    bl_idname = "refboard.search_library"
+    bl_label = "Search Library"
+    bl_options = {'REGISTER'}
+    @classmethod
+    def poll(cls, context): return _library_poll(context) and context.scene.refboard_library_query.strip() != ""
+    def execute(self, context):
+        from .. import library
+        scene = context.scene
+        start = time.perf_counter()
+        db = library.get_library(context)
+        rows = db.search(scene.refboard_library_query)
+        elapsed = time.perf_counter() - start
+        results = scene.refboard_library_results
+        results.clear()
+        for row in rows:
+            hit = results.add()
+            hit.name = row["name"]; hit.board_name = row["board_name"]; hit.pin_uid = row["uid"]
+            hit.hash = row["hash"] or ""; hit.filepath = row["filepath"]
+            hit.note = row["note"]; hit.tags = row["tags"]; hit.link = row["link"]; hit.date_added = row["date_added"]
+        for digest in {row["hash"] for row in rows if row["hash"]}: # Cached for the result list to draw
+            library.get_thumbnail_icon(db, digest)
+        scene.refboard_library_result_index = -1
+        self.report({'INFO'}, f"Found {len(rows)} pin(s) in {elapsed * 1000:.1f} ms.")
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_AddLibraryHits(Operator):
+    """Adds library search results to the active board"""
+    bl_idname = "refboard.add_library_hits"
+    bl_label = "Add to Active Board"
+    bl_options = {'REGISTER', 'UNDO'}
+    index: IntProperty(name="Result", default=-1, description="Result to add (-1 = all results)")
+    @classmethod
+    def poll(cls, context):
+        return _library_poll(context) and get_active_board(context) is not None and len(context.scene.refboard_library_results) > 0
+    def execute(self, context):
+        from .. import library
+        scene = context.scene; board = get_active_board(context)
+        hits = scene.refboard_library_results
+        hits = [hits[self.index]] if 0 <= self.index < len(hits) else list(hits)
+        db = library.get_library(context)
+        # Keep the one-pin-per-image rule of the board: drop hits whose content is already there before loading
+        board_content = image_utils.ContentSet(pin.image for pin in board.pins if pin.image)
+        rows = []; skipped = 0
+        for hit in hits:
+            row = {
+                "name": hit.name, "hash": hit.hash or None, "filepath": hit.filepath,
+                "note": hit.note, "tags": hit.tags, "link": hit.link, "date_added": hit.date_added,
+            }
+            if row["hash"]:
+                if board_content.contains(row["hash"], library.get_row_size(db, row)): skipped += 1; continue
+                board_content.add(row["hash"])
+            rows.append(row)
+        added, missing = library.add_rows_to_board(db, board, rows)
+        if added: board.active_pin_index = len(board.pins) - 1
+        self.report({'INFO'}, f"Added {added} pin(s)" + (f", skipped {skipped} already on the board" if skipped else "")
+                    + (f", {missing} image(s) not found." if missing else "."))
+        request_redraw(context)
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_PublishBoard,
+    REFBOARD_OT_MountLibraryBoard,
+    REFBOARD_OT_LoadLibraryPins,
+    REFBOARD_OT_SearchLibrary,
+    REFBOARD_OT_AddLibraryHits,
+)
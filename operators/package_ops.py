@@ -0,0 +1,63 @@
+import bpy
+import time
+from bpy.props import StringProperty, BoolProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+# Relative imports
+from ..core import get_active_board, get_boards
+from .. import package_io
+from ..scheduling import request_redraw
+
+class REFBOARD_OT_ExportBoardPackage(Operator, ExportHelper):
+    """Exports the active board with its images and thumbnails into a single package file"""
+    bl_idname = "refboard.export_board_package"
+    bl_label = "Export Board Package"
+    bl_options = {'REGISTER'}
+    filename_ext = package_io.PACKAGE_EXT
+    filter_glob: StringProperty(default="*" + package_io.PACKAGE_EXT, options={'HIDDEN'})
+    with_thumbnails: BoolProperty(name="Include Thumbnails", default=True, description="Store previews for a faster import")
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and len(board.pins) > 0
+    def invoke(self, context, event):
+        self.filepath = bpy.path.clean_name(get_active_board(context).name) + self.filename_ext
+        return ExportHelper.invoke(self, context, event)
+    def execute(self, context):
+        board = get_active_board(context)
+        start = time.perf_counter()
+        try:
+            stats = package_io.export_board(board, self.filepath, self.with_thumbnails)
+        except Exception as e:
+            self.report({'ERROR'}, f"Export failed: {e}"); return {'CANCELLED'}
+        self.report({'INFO'}, f"Exported {stats['pins']} pin(s), {stats['blobs']} image(s), "
+                    f"{stats['bytes'] / 1e6:.1f} MB in {time.perf_counter() - start:.2f}s.")
+        if stats["missing"]: self.report({'WARNING'}, f"{stats['missing']} pin(s) had no image data.")
+        return {'FINISHED'}
+
+class REFBOARD_OT_ImportBoardPackage(Operator, ImportHelper):
+    """Imports a board package as a new board, reusing images that are already in the file"""
+    bl_idname = "refboard.import_board_package"
+    bl_label = "Import Board Package"
+    bl_options = {'REGISTER', 'UNDO'}
+    filename_ext = package_io.PACKAGE_EXT
+    filter_glob: StringProperty(default="*" + package_io.PACKAGE_EXT, options={'HIDDEN'})
+    def execute(self, context):
+        scene = context.scene
+        start = time.perf_counter()
+        try:
+            board, stats = package_io.import_board(scene, self.filepath)
+        except Exception as e:
+            self.report({'ERROR'}, f"Import failed: {e}"); return {'CANCELLED'}
+        scene.refboard_active_board_index = len(get_boards(scene)) - 1
+        self.report({'INFO'}, f"Imported '{board.name}': {stats['pins']} pin(s), {stats['loaded']} new image(s), "
+                    f"{stats['reused']} reused, in {time.perf_counter() - start:.2f}s.")
+        if stats["missing"]: self.report({'WARNING'}, f"{stats['missing']} pin(s) without image.")
+        request_redraw(context)
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_ExportBoardPackage,
+    REFBOARD_OT_ImportBoardPackage,
+)
@@ -1,39 +1,77 @@
 import bpy
 import os
-from bpy.props import StringProperty, CollectionProperty, EnumProperty
+import numpy as np
+from bpy.props import StringProperty, CollectionProperty, EnumProperty, IntProperty
 from bpy.types import Operator, OperatorFileListElement
 # Relative import of core
-from ..core import get_active_board
+from .. import api
+from ..core import get_active_board, get_selection, set_selection, tag_changed
+from ..sorting import get_sorted_indices
+from ..ingest import ImageIngest
+from ..board_cache import get_board_stats, get_filter_mask
+from ..scheduling import request_redraw
 
 class REFBOARD_OT_AddPinFromFile(Operator):
+    """Add new pin(s) from image files. Large imports run in chunks and can be cancelled with Esc"""
     bl_idname = "refboard.add_pin_from_file"
     bl_label = "Add Pin From File"
     bl_options = {'REGISTER', 'UNDO'}
     filepath: StringProperty(subtype='FILE_PATH', options={'HIDDEN'})
     files: CollectionProperty(type=OperatorFileListElement, options={'HIDDEN'})
     directory: StringProperty(subtype='DIR_PATH', options={'HIDDEN'})
+    files_per_tick: IntProperty(
+        name="Files per Step", default=8, min=1, max=256, options={'HIDDEN'},
+        description="Number of files imported between two UI updates"
+    )
+    _timer = None
+    _ingest = None
     @classmethod
     def poll(cls, context): return get_active_board(context) is not None
     def execute(self, context):
         board = get_active_board(context)
         if not board: self.report({'WARNING'}, "No board"); return {'CANCELLED'}
-        num_added = 0
-        if self.files:
-            for file_elem in self.files:
-                fpath = os.path.join(self.directory, file_elem.name)
-                if os.path.exists(fpath) and os.path.isfile(fpath):
-                    try:
-                        img = bpy.data.images.load(fpath, check_existing=True); img.reload()
-                        if any(pin.image == img for pin in board.pins):
-                            self.report({'INFO'}, f"Skip duplicate: {img.name}"); continue
-                        new_pin = board.pins.add(); new_pin.image = img
-                        new_pin.name = img.name; new_pin.pin_name = img.name
-                        if not img.preview: img.preview_ensure()
-                        num_added += 1
-                    except Exception as e: self.report({'ERROR'}, f"Load failed '{file_elem.name}': {e}")
-            if num_added > 0: board.active_pin_index = len(board.pins) - 1
-            return {'FINISHED'}
-        self.report({'WARNING'}, "No files selected"); return {'CANCELLED'}
+        if not self.files:
+            self.report({'WARNING'}, "No files selected"); return {'CANCELLED'}
+        paths = [os.path.join(self.directory, file_elem.name) for file_elem in self.files]
+        self._ingest = ImageIngest(context.scene, board, paths)
+        if context.window is None or len(paths) <= self.files_per_tick:
+            # Small import or no window (scripts): do it in one go
+            self._ingest.step()
+            return self._finish(context)
+        wm = context.window_manager
+        wm.progress_begin(0, len(paths))
+        self._timer = wm.event_timer_add(0.001, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.report({'WARNING'}, f"Import cancelled after {self._ingest.position} of {self._ingest.total} file(s).")
+            return self._finish(context) # Keep what was imported, as one undo step
+        if event.type == 'TIMER':
+            ingest = self._ingest
+            done = ingest.step(max_files=self.files_per_tick, time_budget=0.1)
+            context.window_manager.progress_update(ingest.position)
+            context.workspace.status_text_set(
+                f"RefBoard: importing {ingest.position}/{ingest.total} file(s), "
+                f"about {ingest.eta():.0f}s left. Esc to cancel."
+            )
+            request_redraw(context)
+            if done: return self._finish(context)
+        return {'PASS_THROUGH'}
+    def _finish(self, context):
+        ingest = self._ingest
+        if self._timer is not None:
+            wm = context.window_manager
+            wm.event_timer_remove(self._timer); self._timer = None
+            wm.progress_end()
+            context.workspace.status_text_set(None)
+        ingest.finish(defer_previews=True) # Previews and palettes are generated in the background
+        for fpath, message in ingest.errors[:10]:
+            self.report({'ERROR'}, f"Load failed '{os.path.basename(fpath)}': {message}")
+        if ingest.skipped: self.report({'INFO'}, f"Skipped {ingest.skipped} duplicate(s).")
+        self.report({'INFO'}, f"Added {ingest.added} pin(s).")
+        request_redraw(context)
+        return {'FINISHED'}
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self); return {'RUNNING_MODAL'}
 
@@ -53,13 +91,17 @@ class REFBOARD_OT_RemovePin(Operator):
             board.pins.remove(idx)
             board.active_pin_index = min(max(0, idx - 1), len(board.pins) - 1)
             if not board.pins: board.active_pin_index = -1
+            tag_changed('selection', 'order') # Pins below the removed one shift up
         return {'FINISHED'}
 
 class REFBOARD_OT_MovePin(Operator):
     bl_idname = "refboard.move_pin"
     bl_label = "Move Pin"
     bl_options = {'REGISTER', 'UNDO'}
-    direction: EnumProperty(items=[('UP', "Up", ""), ('DOWN', "Down", "")], name="Direction", default='UP')
+    direction: EnumProperty(
+        items=[('UP', "Up", ""), ('DOWN', "Down", ""), ('TOP', "To Top", ""), ('BOTTOM', "To Bottom", "")],
+        name="Direction", default='UP'
+    )
     @classmethod
     def poll(cls, context):
         board = get_active_board(context)
@@ -74,10 +116,42 @@ class REFBOARD_OT_MovePin(Operator):
         elif self.direction == 'DOWN':
             if old_idx >= count - 1: return {'CANCELLED'}
             new_idx = old_idx + 1
+        elif self.direction == 'TOP':
+            if old_idx <= 0: return {'CANCELLED'}
+            new_idx = 0
+        elif self.direction == 'BOTTOM':
+            if old_idx >= count - 1: return {'CANCELLED'}
+            new_idx = count - 1
         else: return {'CANCELLED'}
         board.pins.move(old_idx, new_idx); board.active_pin_index = new_idx
-        if context.area: context.area.tag_redraw()
+        tag_changed('order')
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_MovePinToIndex(Operator):
+    """Moves the active pin directly to the given position in the board"""
+    bl_idname = "refboard.move_pin_to_index"
+    bl_label = "Move Pin to Position"
+    bl_options = {'REGISTER', 'UNDO'}
+    target_index: IntProperty(name="Position", default=0, min=0, description="New index of the active pin (0 = first)")
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and 0 <= board.active_pin_index < len(board.pins)
+    def invoke(self, context, event):
+        self.target_index = get_active_board(context).active_pin_index
+        return context.window_manager.invoke_props_dialog(self)
+    def execute(self, context):
+        board = get_active_board(context)
+        if not board: return {'CANCELLED'}
+        old_idx = board.active_pin_index
+        new_idx = min(self.target_index, len(board.pins) - 1)
+        if old_idx == new_idx: return {'CANCELLED'}
+        board.pins.move(old_idx, new_idx); board.active_pin_index = new_idx # Single move, no stepping
+        tag_changed('order')
+        request_redraw(context)
         return {'FINISHED'}
+
 class REFBOARD_OT_RemoveSelectedPins(Operator):
     """Removes all selected pins from the active board"""
     bl_idname = "refboard.remove_selected_pins"
@@ -86,53 +160,26 @@ class REFBOARD_OT_RemoveSelectedPins(Operator):
 
     @classmethod
     def poll(cls, context):
-        # Active if there is an active board and at least one pin
+        # Active if at least one pin is selected (cached counter, no scan of the pins)
         board = get_active_board(context)
-        return board and len(board.pins) > 0
-        # It's difficult to check if *at least one* is selected using standard UIList means.
-        # Therefore, for now, we just check if there is anything to delete.
+        return board and get_board_stats(board).selected > 0
 
     def execute(self, context):
         board = get_active_board(context)
         if not board: return {'CANCELLED'}
 
-        # --- ACTUAL BATCH DELETION LOGIC ---
-        indices_to_remove = []
-        # Collect indices of all pins where is_selected == True
-        for i, pin in enumerate(board.pins):
-            if pin.is_selected:
-                indices_to_remove.append(i)
-
-        if not indices_to_remove:
-             self.report({'INFO'}, "No pins marked for removal.")
-             return {'CANCELLED'}
-
-        removed_count = len(indices_to_remove) # Store the count for the report
-
-        # Important: Delete from the end of the list so that indices do not shift
-        indices_to_remove.sort(reverse=True)
-        for index in indices_to_remove:
-            # Logic for cleaning up linked data can be added here if necessary
-            # pin_to_remove = board.pins[index]
-            # if pin_to_remove.image and pin_to_remove.image.users <= 1:
-            #     # Caution: Delete the image only if it is not used anywhere else?
-            #     # bpy.data.images.remove(pin_to_remove.image, do_unlink=True)
-            #     pass # For now, do not delete the Image data-block itself
-            board.pins.remove(index) # Remove the pin itself (PropertyGroup) from the collection
-
+        removed_count = api.remove(api.query(board, selected=True), board=board)
+        if not removed_count:
+            self.report({'INFO'}, "No pins marked for removal.")
+            return {'CANCELLED'}
         self.report({'INFO'}, f"Removed {removed_count} selected pin(s).")
 
-        # After deletion, deselect the remaining pins (just in case)
-        # and reset the active index
-        for pin in board.pins:
-            pin.is_selected = False
+        # Deselect the remaining pins (just in case) and reset the active index
+        api.select(board, state=False)
         board.active_pin_index = -1
-
-        # Update UI
-        if context.area:
-            context.area.tag_redraw()
-
+        request_redraw(context)
         return {'FINISHED'}
+
 class REFBOARD_OT_SelectAllPins(Operator):
     """Selects all pins on the active board"""
     bl_idname = "refboard.select_all_pins"
@@ -140,38 +187,39 @@ class REFBOARD_OT_SelectAllPins(Operator):
     bl_options = {'REGISTER', 'UNDO'} # Add UNDO
 
     select_mode: bpy.props.BoolProperty(name="Select", default=True)
+    use_filter: bpy.props.BoolProperty(
+        name="Only Filtered", default=True,
+        description="Only affect pins that pass the current name/note and tag filters"
+    )
 
     @classmethod
     def poll(cls, context):
         # Active if there is an active board and at least one pin
         board = get_active_board(context)
-        return board and len(board.pins) > 0
+        return board and get_board_stats(board).pin_count > 0
 
     def execute(self, context):
         board = get_active_board(context)
         if not board: return {'CANCELLED'}
 
-        selected_count = 0
-        deselected_count = 0
-
-        for pin in board.pins:
-            if self.select_mode: # If "Select All" mode
-                if not pin.is_selected: # Select only if not already selected
-                    pin.is_selected = True
-                    selected_count += 1
-            else: # If "Deselect All" mode
-                 if pin.is_selected: # Deselect only if it was selected
-                    pin.is_selected = False
-                    deselected_count += 1
+        # Work on whole arrays instead of touching every pin from Python
+        selection = get_selection(board)
+        mask = get_filter_mask(board) if self.use_filter else np.ones_like(selection)
+        if self.select_mode: # If "Select All" mode
+            new_selection = selection | mask
+        else: # If "Deselect All" mode
+            new_selection = selection & ~mask
+        changed_count = int(np.count_nonzero(new_selection != selection))
+        if changed_count:
+            set_selection(board, new_selection)
 
         if self.select_mode:
-            self.report({'INFO'}, f"Selected {selected_count} pin(s).")
+            self.report({'INFO'}, f"Selected {changed_count} pin(s).")
         else:
-            self.report({'INFO'}, f"Deselected {deselected_count} pin(s).")
+            self.report({'INFO'}, f"Deselected {changed_count} pin(s).")
 
         # Update UI to redraw checkboxes
-        if context.area:
-            context.area.tag_redraw()
+        request_redraw(context)
 
         return {'FINISHED'}
 
@@ -179,11 +227,81 @@ class REFBOARD_OT_SelectAllPins(Operator):
 # we used the 'select_mode' BoolProperty in a single operator.
 # This saves a bit of code. In the UI, we will call this operator
 # with different values for select_mode.
+
+class REFBOARD_OT_InvertPinSelection(Operator):
+    """Inverts the selection of the pins on the active board"""
+    bl_idname = "refboard.invert_pin_selection"
+    bl_label = "Invert Pin Selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_filter: bpy.props.BoolProperty(
+        name="Only Filtered", default=True,
+        description="Only invert pins that pass the current name/note and tag filters"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and get_board_stats(board).pin_count > 0
+
+    def execute(self, context):
+        board = get_active_board(context)
+        if not board: return {'CANCELLED'}
+        selection = get_selection(board)
+        mask = get_filter_mask(board) if self.use_filter else np.ones_like(selection)
+        set_selection(board, selection ^ mask) # Pins hidden by the filter keep their state
+        self.report({'INFO'}, f"Inverted selection of {int(np.count_nonzero(mask))} pin(s).")
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_SelectPin(Operator):
+    """Toggle this pin's selection. Shift-click to select the range from the last clicked pin"""
+    bl_idname = "refboard.select_pin"
+    bl_label = "Select Pin"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty(name="Index", default=-1, options={'SKIP_SAVE'})
+    extend_range: bpy.props.BoolProperty(name="Range", default=False, options={'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        return get_active_board(context) is not None
+
+    def invoke(self, context, event):
+        self.extend_range = event.shift
+        return self.execute(context)
+
+    def execute(self, context):
+        board = get_active_board(context)
+        if not board or not (0 <= self.index < len(board.pins)): return {'CANCELLED'}
+        anchor = board.select_anchor_index
+        if self.extend_range and 0 <= anchor < len(board.pins) and anchor != self.index:
+            # Select every visible pin between the anchor and the clicked pin (inclusive),
+            # following the order in which the grid shows them
+            selection = get_selection(board)
+            mask = get_filter_mask(board)
+            order = get_sorted_indices(board)
+            if order is None: order = np.arange(len(selection))
+            positions = np.empty_like(order); positions[order] = np.arange(len(order))
+            lo, hi = sorted((positions[anchor], positions[self.index]))
+            in_range = np.zeros_like(selection)
+            in_range[order[lo:hi + 1]] = True
+            set_selection(board, selection | (in_range & mask))
+        else:
+            pin = board.pins[self.index]
+            pin.is_selected = not pin.is_selected
+        board.select_anchor_index = self.index
+        request_redraw(context)
+        return {'FINISHED'}
+
 # List of classes for registration by this module
 classes = (
     REFBOARD_OT_AddPinFromFile,
     REFBOARD_OT_RemovePin,
     REFBOARD_OT_MovePin,
+    REFBOARD_OT_MovePinToIndex,
     REFBOARD_OT_RemoveSelectedPins,
     REFBOARD_OT_SelectAllPins,
+    REFBOARD_OT_InvertPinSelection,
+    REFBOARD_OT_SelectPin,
 )
\ No newline at end of file
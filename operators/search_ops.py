@@ -0,0 +1,82 @@
+import bpy
+from bpy.props import IntProperty
+from bpy.types import Operator
+# Relative imports
+from ..core import find_board, find_pin_index, get_boards, new_board, new_pin, copy_pin_data
+from ..scheduling import request_redraw
+
+class REFBOARD_OT_GlobalSearch(Operator):
+    """Searches pin names, notes, tags and links on every board of the scene"""
+    bl_idname = "refboard.global_search"
+    bl_label = "Search All Boards"
+    bl_options = {'REGISTER'}
+    @classmethod
+    def poll(cls, context): return len(get_boards(context.scene)) > 0
+    def execute(self, context):
+        from ..search_index import run_global_search # Loaded with the first search
+        found = run_global_search(context.scene)
+        self.report({'INFO'}, f"Found {found} pin(s).")
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_JumpToSearchHit(Operator):
+    """Makes the board and pin of this search result active"""
+    bl_idname = "refboard.jump_to_search_hit"
+    bl_label = "Jump to Pin"
+    bl_options = {'REGISTER', 'UNDO'}
+    index: IntProperty(name="Result", default=-1)
+    @classmethod
+    def poll(cls, context): return len(context.scene.refboard_search_results) > 0
+    def execute(self, context):
+        scene = context.scene
+        idx = self.index if self.index >= 0 else scene.refboard_search_result_index
+        if not (0 <= idx < len(scene.refboard_search_results)): return {'CANCELLED'}
+        hit = scene.refboard_search_results[idx]
+        board_idx, board = find_board(scene, hit.board_uid)
+        pin_idx = find_pin_index(board, hit.pin_uid) if board else -1
+        if pin_idx < 0:
+            self.report({'WARNING'}, "Pin no longer exists. Search again."); return {'CANCELLED'}
+        scene.refboard_active_board_index = board_idx
+        board.active_pin_index = pin_idx
+        scene.refboard_search_result_index = idx
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_CopySearchHitsToBoard(Operator):
+    """Copies all pins of the current search results to a new board (images are shared, not reloaded)"""
+    bl_idname = "refboard.copy_search_hits_to_board"
+    bl_label = "Copy Results to New Board"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context): return len(context.scene.refboard_search_results) > 0
+    def execute(self, context):
+        scene = context.scene
+        # Resolve all hits before adding a board, which may reallocate the board collection
+        boards_by_uid = {board.uid: board for board in get_boards(scene)}
+        sources = []
+        for hit in scene.refboard_search_results:
+            board = boards_by_uid.get(hit.board_uid)
+            pin_idx = find_pin_index(board, hit.pin_uid) if board else -1
+            if pin_idx >= 0: sources.append((hit.board_uid, pin_idx))
+        if not sources:
+            self.report({'WARNING'}, "No result pins found. Search again."); return {'CANCELLED'}
+        target = new_board(scene, f"Search: {scene.refboard_global_query}"[:63])
+        boards_by_uid = {board.uid: board for board in get_boards(scene)}
+        seen_images = set() # Same duplicate rule as adding files: one pin per image
+        for board_uid, pin_idx in sources:
+            src = boards_by_uid[board_uid].pins[pin_idx]
+            if src.image is not None:
+                if src.image.name_full in seen_images: continue
+                seen_images.add(src.image.name_full)
+            copy_pin_data(src, new_pin(target))
+        scene.refboard_active_board_index = len(get_boards(scene)) - 1
+        self.report({'INFO'}, f"Copied {len(target.pins)} pin(s) to '{target.name}'.")
+        request_redraw(context)
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_GlobalSearch,
+    REFBOARD_OT_JumpToSearchHit,
+    REFBOARD_OT_CopySearchHitsToBoard,
+)
@@ -0,0 +1,76 @@
+import bpy
+import os
+from bpy.props import StringProperty, EnumProperty, IntProperty, FloatVectorProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+# Relative import of core
+from ..core import get_active_board
+
+class REFBOARD_OT_ExportContactSheet(Operator, ExportHelper):
+    """Renders the filtered, sorted pins of the active board into one PNG or JPEG image"""
+    bl_idname = "refboard.export_contact_sheet"
+    bl_label = "Export Contact Sheet"
+    bl_options = {'REGISTER'}
+    filter_glob: StringProperty(default="*.png;*.jpg;*.jpeg", options={'HIDDEN'})
+    file_format: EnumProperty(
+        items=[('PNG', "PNG", "Lossless, written band by band"), ('JPEG', "JPEG", "Smaller files")],
+        name="Format", default='PNG'
+    )
+    quality: IntProperty(name="Quality", default=90, min=1, max=100, subtype='PERCENTAGE')
+    layout_mode: EnumProperty(
+        items=[
+            ('GRID', "Contact Sheet", "Every image fitted into an equal cell"),
+            ('COLLAGE', "Collage", "Justified rows, images keep their aspect ratio"),
+        ], name="Layout", default='GRID'
+    )
+    columns: IntProperty(name="Columns", default=6, min=1, max=100)
+    cell_size: IntProperty(name="Cell Size", default=256, min=16, max=4096, subtype='PIXEL')
+    sheet_width: IntProperty(name="Width", default=4096, min=256, max=32768, subtype='PIXEL')
+    row_height: IntProperty(name="Row Height", default=320, min=16, max=4096, subtype='PIXEL')
+    padding: IntProperty(name="Padding", default=8, min=0, max=256, subtype='PIXEL')
+    background: FloatVectorProperty(name="Background", size=3, subtype='COLOR', min=0.0, max=1.0, default=(0.08, 0.08, 0.08))
+
+    @property
+    def filename_ext(self): return ".jpg" if self.file_format == 'JPEG' else ".png"
+
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board and len(board.pins) > 0
+    def invoke(self, context, event):
+        self.filepath = bpy.path.clean_name(get_active_board(context).name) + self.filename_ext
+        return ExportHelper.invoke(self, context, event)
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "file_format")
+        if self.file_format == 'JPEG': layout.prop(self, "quality")
+        layout.prop(self, "layout_mode")
+        if self.layout_mode == 'GRID':
+            layout.prop(self, "columns"); layout.prop(self, "cell_size")
+        else:
+            layout.prop(self, "sheet_width"); layout.prop(self, "row_height")
+        layout.prop(self, "padding"); layout.prop(self, "background")
+    def execute(self, context):
+        from .. import contact_sheet # Imported on first use
+        board = get_active_board(context)
+        wm = context.window_manager
+        wm.progress_begin(0, len(board.pins))
+        try:
+            stats = contact_sheet.export_contact_sheet(
+                board, self.filepath, layout=self.layout_mode, columns=self.columns, cell_size=self.cell_size,
+                sheet_width=self.sheet_width, row_height=self.row_height, padding=self.padding,
+                background=self.background, file_format=self.file_format, quality=self.quality,
+                progress=wm.progress_update,
+            )
+        except (OSError, ValueError, RuntimeError) as e:
+            self.report({'ERROR'}, f"Export failed: {e}"); return {'CANCELLED'}
+        finally:
+            wm.progress_end()
+        self.report({'INFO'}, f"Saved {stats['pins']} pin(s) as {stats['width']}x{stats['height']} "
+                    f"'{os.path.basename(self.filepath)}' in {stats['seconds']:.1f}s.")
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_ExportContactSheet,
+)
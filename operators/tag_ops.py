@@ -0,0 +1,74 @@
+import bpy
+from bpy.props import EnumProperty, StringProperty, BoolProperty
+from bpy.types import Operator
+# Relative imports
+from ..core import get_active_board, get_boards
+from ..scheduling import request_redraw
+from .. import tag_index
+
+_scope_items = [
+    ('ACTIVE', "Active Board", "Only the pins of the active board"),
+    ('ALL', "All Boards", "The pins of every board"),
+]
+
+def _search_tags(self, context, edit_text): return tag_index.suggest(context.scene, edit_text)
+
+def _scope_boards(context, scope: str) -> list:
+    if scope == 'ALL': return list(get_boards(context.scene))
+    board = get_active_board(context)
+    return [board] if board else []
+
+class REFBOARD_OT_NormalizeTags(Operator):
+    """Rewrites tags in lower case with single spaces, drops duplicates and optionally merges singular/plural forms"""
+    bl_idname = "refboard.normalize_tags"
+    bl_label = "Normalize Tags"
+    bl_options = {'REGISTER', 'UNDO'}
+    scope: EnumProperty(items=_scope_items, name="Scope", default='ALL')
+    fold_plurals: BoolProperty(
+        name="Merge Plurals", default=True,
+        description="Merge forms like 'hand' and 'hands' into the one more pins use"
+    )
+    @classmethod
+    def poll(cls, context): return len(get_boards(context.scene)) > 0
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+    def execute(self, context):
+        boards = _scope_boards(context, self.scope)
+        mapping = tag_index.build_merge_map(tag_index.get_index(context.scene).counts, self.fold_plurals)
+        checked, changed = tag_index.rewrite_tags(boards, mapping)
+        self.report({'INFO'}, f"Normalized tags: {changed} of {checked} pin(s) changed.")
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_MergeTags(Operator):
+    """Replaces one or more tags by another tag on every pin (leave the new tag empty to remove them)"""
+    bl_idname = "refboard.merge_tags"
+    bl_label = "Merge Tags"
+    bl_options = {'REGISTER', 'UNDO'}
+    source_tags: StringProperty(
+        name="Tags", default="", description="Comma-separated tags to replace",
+        search=_search_tags, search_options={'SUGGESTION'}
+    )
+    target_tag: StringProperty(
+        name="Into", default="", description="Tag to use instead (empty removes the tags)",
+        search=_search_tags, search_options={'SUGGESTION'}
+    )
+    scope: EnumProperty(items=_scope_items, name="Scope", default='ALL')
+    @classmethod
+    def poll(cls, context): return len(get_boards(context.scene)) > 0
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+    def execute(self, context):
+        sources = {tag_index.normalize_tag(tag) for tag in tag_index.split_tags(self.source_tags)}
+        if not sources: self.report({'WARNING'}, "Enter the tags to merge."); return {'CANCELLED'}
+        target = tag_index.normalize_tag(self.target_tag.replace(',', ' '))
+        checked, changed = tag_index.rewrite_tags(_scope_boards(context, self.scope), dict.fromkeys(sources, target), normalize=False)
+        self.report({'INFO'}, f"{'Merged' if target else 'Removed'} {len(sources)} tag(s) on {changed} of {checked} pin(s).")
+        request_redraw(context)
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_NormalizeTags,
+    REFBOARD_OT_MergeTags,
+)
@@ -0,0 +1,84 @@
+import bpy
+import numpy as np
+from bpy.props import EnumProperty, StringProperty
+from bpy.types import Operator
+# Relative imports
+from ..core import get_active_board, get_boards, get_selection, set_selection, find_board, new_board, transfer_pins
+from ..board_cache import get_board_stats
+from ..scheduling import request_redraw
+
+_target_items = [] # Keep enum strings referenced (Blender does not copy dynamic enum items)
+
+def _target_board_items(self, context):
+    global _target_items
+    active = get_active_board(context)
+    _target_items = [
+        (board.uid, board.name, f"{len(board.pins)} pin(s)")
+        for board in get_boards(context.scene) if board.uid and board != active
+    ]
+    return _target_items or [('NONE', "No Other Boards", "")]
+
+def _selected_poll(context) -> bool:
+    board = get_active_board(context)
+    return board is not None and get_board_stats(board).selected > 0
+
+class REFBOARD_OT_TransferPins(Operator):
+    """Moves or copies the selected pins to another board without reloading their images"""
+    bl_idname = "refboard.transfer_pins"
+    bl_label = "Move/Copy Selected Pins"
+    bl_options = {'REGISTER', 'UNDO'}
+    mode: EnumProperty(
+        items=[('MOVE', "Move", "Remove the pins from this board"), ('COPY', "Copy", "Keep the pins on this board")],
+        name="Mode", default='MOVE'
+    )
+    target_board: EnumProperty(name="Target Board", items=_target_board_items)
+    @classmethod
+    def poll(cls, context): return _selected_poll(context) and len(get_boards(context.scene)) > 1
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+    def execute(self, context):
+        scene = context.scene; src = get_active_board(context)
+        _idx, dst = find_board(scene, self.target_board)
+        if dst is None or dst == src:
+            self.report({'WARNING'}, "Choose another board."); return {'CANCELLED'}
+        indices = np.flatnonzero(get_selection(src)).tolist()
+        count, duplicates = transfer_pins(src, dst, indices, move=self.mode == 'MOVE')
+        set_selection(src, np.zeros(len(src.pins), dtype=bool))
+        # The new pins on the target start unselected (is_selected is not copied); its own selection is kept
+        verb = "Moved" if self.mode == 'MOVE' else "Copied"
+        self.report({'INFO'}, f"{verb} {count} pin(s) to '{dst.name}'"
+                    + (f", skipped {duplicates} duplicate(s)." if duplicates else "."))
+        request_redraw(context)
+        return {'FINISHED'}
+
+class REFBOARD_OT_SplitPinsToBoard(Operator):
+    """Moves the selected pins to a new board"""
+    bl_idname = "refboard.split_pins_to_board"
+    bl_label = "Split Selected to New Board"
+    bl_options = {'REGISTER', 'UNDO'}
+    board_name: StringProperty(name="Name", default="")
+    @classmethod
+    def poll(cls, context): return _selected_poll(context)
+    def invoke(self, context, event):
+        self.board_name = f"{get_active_board(context).name} (Split)"
+        return context.window_manager.invoke_props_dialog(self)
+    def execute(self, context):
+        scene = context.scene
+        src_uid = get_active_board(context).uid
+        dst = new_board(scene, self.board_name or "Split")
+        dst_uid = dst.uid
+        # Adding a board may reallocate the board collection: look both boards up again
+        _idx, src = find_board(scene, src_uid)
+        dst_idx, dst = find_board(scene, dst_uid)
+        indices = np.flatnonzero(get_selection(src)).tolist()
+        count, _duplicates = transfer_pins(src, dst, indices, move=True)
+        scene.refboard_active_board_index = dst_idx
+        self.report({'INFO'}, f"Moved {count} pin(s) to new board '{dst.name}'.")
+        request_redraw(context)
+        return {'FINISHED'}
+
+# List of classes for registration by this module
+classes = (
+    REFBOARD_OT_TransferPins,
+    REFBOARD_OT_SplitPinsToBoard,
+)
@@ -1,15 +1,14 @@
 import bpy
 import os
-import tempfile
-import shutil
-import webbrowser
-import urllib.request
-import urllib.parse
-import hashlib
-from bpy.props import StringProperty
+from bpy.props import StringProperty, EnumProperty
 from bpy.types import Operator
 # Relative import of core
-from ..core import get_active_board
+from ..core import get_active_board, get_selection, new_pin
+from ..scheduling import request_redraw
+from ..palette import assign_palette
+from .. import instrumentation
+from .. import image_utils
+from .. import url_refresh
 
 class REFBOARD_OT_WebSearch(Operator):
     bl_idname = "refboard.web_search"
@@ -25,6 +24,7 @@ class REFBOARD_OT_WebSearch(Operator):
     @classmethod
     def poll(cls, context): return getattr(context.scene, "refboard_search_query", "") != ""
     def execute(self, context):
+        import webbrowser, urllib.parse # Imported on first use, they are slow to load at startup
         query = context.scene.refboard_search_query
         if self.search_engine in self.base_urls:
             try:
@@ -50,6 +50,7 @@ class REFBOARD_OT_AddPinFromURL(Operator):
         url = getattr(context.scene, "refboard_image_url", "")
         return board is not None and url.startswith(("http://", "https://"))
     def execute(self, context):
+        import tempfile, shutil, hashlib, urllib.request, urllib.parse # Imported on first use
         scene = context.scene; board = get_active_board(context)
         url = scene.refboard_image_url;
         if not board: self.report({'WARNING'}, "No board"); return {'CANCELLED'}
@@ -69,6 +70,7 @@ class REFBOARD_OT_AddPinFromURL(Operator):
             ctype = ''
             with urllib.request.urlopen(req) as resp, open(fpath, 'wb') as out:
                 ctype = resp.info().get('Content-Type', '').lower()
+                validators = url_refresh.get_validators(resp.info())
                 if ext == ".tmp": # Guess extension
                     new_ext = ext
                     if ctype.startswith('image/jpeg') or ctype.startswith('image/jpg'): new_ext = ".jpg"
@@ -79,24 +81,28 @@ class REFBOARD_OT_AddPinFromURL(Operator):
                         new_fname = f"refboard_{url_hash}_{safe_name}{new_ext}"
                         new_fpath = os.path.join(temp_dir, new_fname); ext = new_ext
                 shutil.copyfileobj(resp, out)
+            instrumentation.count("bytes_downloaded", os.path.getsize(fpath))
             if ext != ".tmp" and fpath != new_fpath: # Rename if ext guessed
                 try: os.rename(fpath, new_fpath); self.report({'INFO'}, f"Renamed to: {new_fname}"); fpath = new_fpath
                 except OSError as rn_err: self.report({'WARNING'}, f"Rename failed: {rn_err}.")
             if ctype and not ctype.startswith('image/'): raise ValueError(f"Not image (Type: {ctype})")
             self.report({'INFO'}, f"Loading: {os.path.basename(fpath)}")
+            digest = image_utils.hash_file(fpath)
             img = None
             try:
                 img = bpy.data.images.load(fpath, check_existing=True); img.reload(); img.preview_ensure()
+                instrumentation.count("image_loads"); instrumentation.count("preview_requests")
                 try:
                     if not img.packed_file: img.pack(); self.report({'INFO'}, f"Packed '{img.name}'.")
                 except RuntimeError as p_err: self.report({'WARNING'}, f"Pack fail: {p_err}.")
             except RuntimeError as l_err: raise ValueError(f"Load fail: {l_err}")
             if img is None: raise ValueError("Load result is None.")
-            new_pin = board.pins.add(); new_pin.image = img; new_pin.name = img.name
-            new_pin.pin_name = img.name; new_pin.external_link = url
+            pin = new_pin(board, img); pin.external_link = url
+            url_refresh.set_source(pin, validators, digest) # Lets Refresh from Source skip unchanged images
+            assign_palette(pin)
             board.active_pin_index = len(board.pins) - 1; scene.refboard_image_url = ""
             self.report({'INFO'}, f"Added pin '{img.name}'.")
-            if context.area: context.area.tag_redraw()
+            request_redraw(context)
             return {'FINISHED'}
         except ValueError as ve: self.report({'ERROR'}, f"Add failed: {ve}"); return {'CANCELLED'}
         except urllib.error.URLError as ue: self.report({'ERROR'}, f"URL/Net error: {ue.reason}"); return {'CANCELLED'}
@@ -106,8 +112,47 @@ class REFBOARD_OT_AddPinFromURL(Operator):
                 try: shutil.rmtree(temp_dir)
                 except Exception as cl_err: self.report({'WARNING'}, f"Cleanup failed: {cl_err}")
 
+class REFBOARD_OT_RefreshFromSource(Operator):
+    """Re-downloads pins added from a URL if their source image changed (conditional requests, unchanged images cost no download)"""
+    bl_idname = "refboard.refresh_from_source"
+    bl_label = "Refresh from Source"
+    bl_options = {'REGISTER', 'UNDO'}
+    scope: EnumProperty(
+        items=[
+            ('ACTIVE', "Active Pin", "Only the active pin"),
+            ('SELECTED', "Selected Pins", "The selected pins"),
+            ('BOARD', "Whole Board", "All pins of the active board"),
+        ], name="Scope", default='BOARD'
+    )
+    @classmethod
+    def poll(cls, context):
+        board = get_active_board(context)
+        return board is not None and len(board.pins) > 0
+    def execute(self, context):
+        board = get_active_board(context)
+        if self.scope == 'ACTIVE':
+            indices = [board.active_pin_index] if 0 <= board.active_pin_index < len(board.pins) else []
+        elif self.scope == 'SELECTED':
+            indices = get_selection(board).nonzero()[0].tolist()
+        else:
+            indices = None
+        count = len(url_refresh.get_url_pin_indices(board, indices))
+        if not count: self.report({'WARNING'}, "No pins with a web link to refresh."); return {'CANCELLED'}
+        wm = context.window_manager
+        wm.progress_begin(0, count)
+        try: stats = url_refresh.refresh_pins(board, indices, progress=wm.progress_update)
+        finally: wm.progress_end()
+        for url, message in stats["errors"][:5]: print(f"RefBoard: refresh of {url} failed: {message}")
+        self.report({'WARNING'} if stats["failed"] else {'INFO'},
+                    f"Checked {stats['checked']}: {stats['updated']} updated, "
+                    f"{stats['not_modified'] + stats['unchanged']} unchanged, {stats['failed']} failed "
+                    f"({stats['bytes'] / 1e6:.1f} MB in {stats['seconds']:.1f}s).")
+        request_redraw(context)
+        return {'FINISHED'}
+
 # List of classes for registration by this module
 classes = (
     REFBOARD_OT_WebSearch,
     REFBOARD_OT_AddPinFromURL,
+    REFBOARD_OT_RefreshFromSource,
 )
\ No newline at end of file
@@ -0,0 +1,149 @@
+import bpy
+import os
+# Relative imports
+from . import core
+from . import image_utils
+
+# Board package: a single ZIP archive (extension .refboard) with
+#   manifest.json          board settings and pins (names, notes, tags, links, palettes, ...)
+#   blobs/<sha256><ext>    original image files, stored once per content hash
+#   thumbs/<sha256>.png    pre-built previews, so import does not have to render them again
+# Images are stored without recompression; the manifest is deflated.
+
+PACKAGE_FORMAT = "refboard-package"
+PACKAGE_VERSION = 1
+PACKAGE_EXT = ".refboard"
+
+_FORMAT_EXTENSIONS = {
+    'PNG': ".png", 'JPEG': ".jpg", 'BMP': ".bmp", 'TARGA': ".tga", 'TARGA_RAW': ".tga",
+    'OPEN_EXR': ".exr", 'HDR': ".hdr", 'TIFF': ".tif", 'WEBP': ".webp",
+}
+
+def _image_extension(img: bpy.types.Image) -> str:
+    ext = os.path.splitext(img.filepath)[1].lower()
+    return ext or _FORMAT_EXTENSIONS.get(img.file_format, ".png")
+
+def export_board(board, filepath: str, with_thumbnails: bool = True) -> dict:
+    """
+    Writes the board to a package file. Image files on disk are streamed into the archive;
+    packed images are written from memory. Returns stats (pins, blobs, bytes).
+    """
+    import json, zipfile # Only needed once a package is written; kept out of add-on startup
+    pins = []; written = {}; stats = {"pins": 0, "blobs": 0, "missing": 0}
+    tmp_path = filepath + ".tmp"
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for pin in board.pins:
+                entry = {
+                    "uid": pin.uid, "name": pin.pin_name, "note": pin.note, "tags": pin.tags,
+                    "link": pin.external_link, "date_added": pin.date_added,
+                    "dominant_color": list(pin.dominant_color),
+                    "palette": [[*swatch.color, swatch.weight] for swatch in pin.palette],
+                    "blob": None,
+                }
+                img = pin.image
+                digest = image_utils.get_image_hash(img) if img else None
+                if digest and digest not in written:
+                    arcname = f"blobs/{digest}{_image_extension(img)}"
+                    if img.packed_file:
+                        zf.writestr(arcname, img.packed_file.data)
+                    else:
+                        zf.write(bpy.path.abspath(img.filepath, library=img.library), arcname) # Streamed from disk
+                    if with_thumbnails:
+                        thumb = image_utils.get_preview_rgba(img)
+                        if thumb is not None:
+                            zf.writestr(f"thumbs/{digest}.png", image_utils.encode_png(thumb))
+                    written[digest] = arcname; stats["blobs"] += 1
+                if digest:
+                    entry["blob"] = written[digest]; entry["image_name"] = img.name
+                else:
+                    stats["missing"] += 1
+                pins.append(entry)
+            manifest = {
+                "format": PACKAGE_FORMAT, "version": PACKAGE_VERSION,
+                "board": {
+                    "name": board.name, "thumbnail_size": board.thumbnail_size,
+                    "sort_mode": board.sort_mode, "sort_reverse": board.sort_reverse,
+                },
+                "pins": pins,
+            }
+            zf.writestr("manifest.json", json.dumps(manifest), compress_type=zipfile.ZIP_DEFLATED)
+        os.replace(tmp_path, filepath) # Never leave a half-written package behind
+    except BaseException: # Also on cancel (KeyboardInterrupt): drop the partial file, keep the error
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+    stats["pins"] = len(pins)
+    stats["bytes"] = os.path.getsize(filepath)
+    return stats
+
+def read_manifest(zf: "zipfile.ZipFile") -> dict:
+    import json
+    manifest = json.loads(zf.read("manifest.json"))
+    if manifest.get("format") != PACKAGE_FORMAT:
+        raise ValueError("Not a RefBoard package")
+    if manifest.get("version", 0) > PACKAGE_VERSION:
+        raise ValueError(f"Package version {manifest['version']} is newer than supported ({PACKAGE_VERSION})")
+    return manifest
+
+def import_board(scene: bpy.types.Scene, filepath: str):
+    """
+    Creates a new board from a package. Blobs are read one at a time and packed from memory;
+    images already present in bpy.data.images (same content hash) are reused instead.
+    Returns (board, stats).
+    """
+    import zipfile
+    stats = {"pins": 0, "loaded": 0, "reused": 0, "missing": 0}
+    with zipfile.ZipFile(filepath, 'r') as zf:
+        manifest = read_manifest(zf)
+        names = set(zf.namelist())
+        images_by_hash = image_utils.find_images_by_hash()
+        needed = {os.path.basename(p["blob"]).split('.')[0] for p in manifest["pins"] if p.get("blob")}
+        if needed - images_by_hash.keys():
+            # Hash local images once (cached on the image) to find more duplicates
+            for img in bpy.data.images:
+                if not img.get(image_utils.HASH_PROP) and (img.packed_file or img.source == 'FILE'):
+                    digest = image_utils.get_image_hash(img)
+                    if digest: images_by_hash.setdefault(digest, img)
+
+        images_by_blob = {}
+        for entry in manifest["pins"]:
+            arcname = entry.get("blob")
+            if not arcname or arcname in images_by_blob: continue
+            digest = os.path.basename(arcname).split('.')[0]
+            img = images_by_hash.get(digest)
+            if img is not None:
+                stats["reused"] += 1
+            elif arcname in names:
+                name = entry.get("image_name") or os.path.basename(arcname)
+                img = image_utils.load_image_from_bytes(name, zf.read(arcname), digest)
+                images_by_hash[digest] = img
+                thumb_name = f"thumbs/{digest}.png"
+                if thumb_name in names:
+                    thumb = image_utils.decode_png(zf.read(thumb_name))
+                    if thumb is not None: image_utils.set_preview_rgba(img, thumb)
+                stats["loaded"] += 1
+            images_by_blob[arcname] = img
+
+        # Build the board in one pass
+        board_data = manifest.get("board", {})
+        board = core.new_board(scene, board_data.get("name", os.path.splitext(os.path.basename(filepath))[0]))
+        board.thumbnail_size = board_data.get("thumbnail_size", board.thumbnail_size)
+        if board_data.get("sort_mode") in {item[0] for item in board.bl_rna.properties["sort_mode"].enum_items}:
+            board.sort_mode = board_data["sort_mode"]
+        board.sort_reverse = board_data.get("sort_reverse", False)
+        for entry in manifest["pins"]:
+            img = images_by_blob.get(entry.get("blob"))
+            if img is None: stats["missing"] += 1
+            pin = core.new_pin(board, img)
+            pin.pin_name = entry.get("name") or (img.name if img else "")
+            pin.note = entry.get("note", ""); pin.tags = entry.get("tags", "")
+            pin.external_link = entry.get("link", "")
+            if entry.get("date_added"): pin.date_added = entry["date_added"]
+            if entry.get("dominant_color"): pin.dominant_color = entry["dominant_color"]
+            for r, g, b, weight in entry.get("palette", ()):
+                swatch = pin.palette.add(); swatch.color = (r, g, b); swatch.weight = weight
+            stats["pins"] += 1
+        core.tag_changed('palette')
+        board.active_pin_index = 0 if len(board.pins) else -1
+    return board, stats
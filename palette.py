@@ -0,0 +1,174 @@
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+# Relative import of core
+from . import core
+
+PALETTE_SIZE = 5        # Colors stored per pin
+SAMPLE_SIZE = 32        # Longest side of the downscaled thumbnail used for clustering
+KMEANS_ITERATIONS = 10
+
+# --- Pixel sampling ---
+def _downscale(pixels: np.ndarray, width: int, height: int, max_size: int) -> np.ndarray:
+    """Strided downscale of a flat RGBA buffer; returns an (N, 4) array."""
+    pixels = pixels.reshape(height, width, 4)
+    step = max(1, int(np.ceil(max(width, height) / max_size)))
+    return pixels[::step, ::step].reshape(-1, 4)
+
+def get_sample_pixels(img: bpy.types.Image, max_size: int = SAMPLE_SIZE) -> np.ndarray:
+    """
+    Returns an (N, 3) array of RGB samples of the image, taken from a thumbnail of at most
+    max_size pixels per side. Uses the (small) preview when possible and only falls back
+    to the full-resolution pixels if no preview can be generated.
+    """
+    preview = img.preview or img.preview_ensure()
+    if preview and preview.image_size[0] and preview.image_size[1]:
+        width, height = preview.image_size
+        pixels = np.zeros(width * height * 4, dtype=np.float32)
+        preview.image_pixels_float.foreach_get(pixels)
+    else:
+        width, height = img.size
+        if not width or not height: return np.zeros((0, 3), dtype=np.float32)
+        pixels = np.zeros(width * height * 4, dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+    samples = _downscale(pixels, width, height, max_size)
+    return samples[samples[:, 3] > 0.5, :3] # Ignore transparent areas
+
+# --- Clustering ---
+def compute_palette(samples: np.ndarray, k: int = PALETTE_SIZE, iterations: int = KMEANS_ITERATIONS):
+    """
+    Runs k-means on (N, 3) RGB samples. Returns (colors, weights) sorted by weight,
+    where colors is (k, 3) and weights are the share of samples in each cluster.
+    """
+    n = len(samples)
+    if n == 0: return np.zeros((0, 3), dtype=np.float32), np.zeros(0, dtype=np.float32)
+    k = min(k, n)
+    samples = samples.astype(np.float32, copy=False)
+    # Deterministic farthest-point initialisation: stable palettes for the same image
+    centers = np.empty((k, 3), dtype=np.float32)
+    centers[0] = samples.mean(axis=0)
+    dist = ((samples - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        centers[i] = samples[dist.argmax()]
+        dist = np.minimum(dist, ((samples - centers[i]) ** 2).sum(axis=1))
+    for _ in range(iterations):
+        labels = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=samples[:, c], minlength=k) for c in range(3)], axis=1)
+        used = counts > 0
+        new_centers = centers.copy()
+        new_centers[used] = sums[used] / counts[used, None]
+        converged = np.allclose(new_centers, centers, atol=1e-3)
+        centers = new_centers
+        if converged: break
+    labels = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    weights = np.bincount(labels, minlength=k).astype(np.float32) / n
+    order = np.argsort(-weights, kind='stable')
+    used = weights[order] > 0
+    return centers[order][used], weights[order][used]
+
+def assign_palette(pin) -> bool:
+    """Computes the palette of the pin's image and stores it on the pin. Returns False without image."""
+    if not pin.image: return False
+    colors, weights = compute_palette(get_sample_pixels(pin.image))
+    pin.palette.clear()
+    for color, weight in zip(colors.tolist(), weights.tolist()):
+        swatch = pin.palette.add()
+        swatch.color = np.clip(color, 0.0, 1.0); swatch.weight = weight
+    if len(colors):
+        pin.dominant_color = np.clip(colors[0], 0.0, 1.0)
+    core.tag_changed('palette')
+    return True
+
+# --- Color index ---
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Converts (N, 3) sRGB values in 0..1 to CIE Lab (D65), where distances match perception better."""
+    rgb = np.asarray(rgb, dtype=np.float32).reshape(-1, 3)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ np.array([
+        [0.4124, 0.2126, 0.0193],
+        [0.3576, 0.7152, 0.1192],
+        [0.1805, 0.0722, 0.9505],
+    ], dtype=np.float32)
+    xyz /= np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16.0 / 116.0)
+    return np.stack([116.0 * f[:, 1] - 16.0, 500.0 * (f[:, 0] - f[:, 1]), 200.0 * (f[:, 1] - f[:, 2])], axis=1)
+
+class ColorIndex:
+    """Flat arrays of all swatches of all boards of a scene, for vectorized nearest-color queries."""
+    def __init__(self):
+        self.signature = None
+        self.lab = np.zeros((0, 3), dtype=np.float32)   # One row per swatch
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.board_indices = np.zeros(0, dtype=np.int32)
+        self.pin_indices = np.zeros(0, dtype=np.int32)
+
+    def build(self, boards) -> None:
+        colors, weights, board_indices, pin_indices = [], [], [], []
+        for board_idx, board in enumerate(boards):
+            for pin_idx, pin in enumerate(board.pins):
+                for swatch in pin.palette:
+                    colors.append(swatch.color[:]); weights.append(swatch.weight)
+                    board_indices.append(board_idx); pin_indices.append(pin_idx)
+        self.lab = rgb_to_lab(np.array(colors, dtype=np.float32)) if colors else np.zeros((0, 3), dtype=np.float32)
+        self.weights = np.array(weights, dtype=np.float32)
+        self.board_indices = np.array(board_indices, dtype=np.int32)
+        self.pin_indices = np.array(pin_indices, dtype=np.int32)
+
+    def query(self, color, tolerance: float = 20.0, min_weight: float = 0.1) -> list[tuple[int, int, float]]:
+        """
+        Returns (board index, pin index, distance) of all pins having a swatch of at least
+        min_weight within tolerance (Lab delta E) of the color, nearest first.
+        """
+        if not len(self.lab): return []
+        dist = np.linalg.norm(self.lab - rgb_to_lab(color)[0], axis=1)
+        hits = (dist <= tolerance) & (self.weights >= min_weight)
+        if not hits.any(): return []
+        # Keep the best swatch per pin
+        keys = self.board_indices[hits].astype(np.int64) << 32 | self.pin_indices[hits]
+        order = np.lexsort((dist[hits], keys))
+        keys, first = np.unique(keys[order], return_index=True)
+        best = dist[hits][order][first]
+        by_distance = np.argsort(best, kind='stable')
+        return [(int(keys[i] >> 32), int(keys[i] & 0xFFFFFFFF), float(best[i])) for i in by_distance]
+
+_indices = {} # store pointer -> ColorIndex: scenes showing the same store share one index
+
+def get_color_index(scene: bpy.types.Scene) -> ColorIndex:
+    """Returns the color index of the scene's boards, rebuilding it only if palettes or pins changed."""
+    store = core.get_store(scene)
+    boards = store.refboard_boards if store is not None else ()
+    signature = (
+        core.get_generation('palette'), core.get_generation('order'),
+        tuple(len(board.pins) for board in boards),
+    )
+    key = store.as_pointer() if store is not None else 0
+    index = _indices.get(key)
+    if index is None:
+        index = _indices[key] = ColorIndex()
+    if index.signature != signature:
+        index.build(boards)
+        index.signature = signature
+    return index
+
+# --- Handlers ---
+@persistent
+def _clear_cache_handler(*_args):
+    _indices.clear()
+
+_handlers = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    for handler_list in _handlers:
+        if _clear_cache_handler not in handler_list:
+            handler_list.append(_clear_cache_handler)
+
+def unregister():
+    for handler_list in _handlers:
+        if _clear_cache_handler in handler_list:
+            handler_list.remove(_clear_cache_handler)
+    _indices.clear()
@@ -0,0 +1,68 @@
+import bpy
+import os
+from bpy.props import StringProperty, BoolProperty, IntProperty
+from bpy.types import AddonPreferences
+# Relative import of the instrumentation layer
+from . import instrumentation
+
+def is_library_enabled(context: bpy.types.Context | None = None) -> bool:
+    """True if the shared library is switched on (checked by polls, without loading the library module)."""
+    addon = (context or bpy.context).preferences.addons.get(__package__)
+    return bool(addon and addon.preferences.use_library)
+
+def get_default_library_path() -> str:
+    return os.path.join(bpy.utils.user_resource('CONFIG', path="refboard"), "library.sqlite")
+
+class RefBoardPreferences(AddonPreferences):
+    bl_idname = __package__
+
+    # --- Shared library ---
+    use_library: BoolProperty(
+        name="Use Shared Library", default=False,
+        description="Enable the SQLite reference library shared between .blend files"
+    )
+    library_path: StringProperty(
+        name="Library File", default="", subtype='FILE_PATH',
+        description="SQLite database of the shared library (empty = default location in the user config folder)"
+    )
+    library_page_size: IntProperty(
+        name="Pins per Page", default=200, min=10, max=5000,
+        description="Number of pins loaded at once when mounting a library board"
+    )
+
+    # --- Instrumentation ---
+    def _update_instrumentation(self, context): instrumentation.sync_with_preferences(self)
+    use_instrumentation: BoolProperty(
+        name="Performance Instrumentation", default=False, update=_update_instrumentation,
+        description="Time the add-on's operators, panels and pin list and show the results in a Debug panel. Off costs nothing"
+    )
+    instrumentation_buffer_size: IntProperty(
+        name="Samples Kept", default=instrumentation.DEFAULT_BUFFER_SIZE, min=100, max=1000000,
+        update=_update_instrumentation,
+        description="Number of most recent timings kept in memory"
+    )
+    instrumentation_profile: BoolProperty(
+        name="Collect cProfile Data", default=False, update=_update_instrumentation,
+        description="Also run the Python profiler during instrumented calls (slower), for export as .prof"
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        box = layout.box()
+        box.prop(self, "use_library")
+        col = box.column(); col.enabled = self.use_library
+        col.prop(self, "library_path")
+        if not self.library_path:
+            col.label(text=f"Default: {get_default_library_path()}", icon='INFO')
+        col.prop(self, "library_page_size")
+        box = layout.box()
+        box.prop(self, "use_instrumentation")
+        col = box.column(); col.enabled = self.use_instrumentation
+        col.prop(self, "instrumentation_buffer_size")
+        col.prop(self, "instrumentation_profile")
+        startup = instrumentation.startup
+        box.label(text=f"Startup cost: import {startup['import_ms']:.1f} ms, register {startup['register_ms']:.1f} ms", icon='TIME')
+
+classes = (
+    RefBoardPreferences,
+)
@@ -1,71 +1,234 @@
 import bpy
 from bpy.props import (
-    StringProperty, IntProperty, FloatProperty, CollectionProperty,
+    StringProperty, IntProperty, FloatProperty, FloatVectorProperty, CollectionProperty,
     PointerProperty, BoolProperty, EnumProperty,
 )
+# Relative import of core
+from bpy.app.handlers import persistent
+from .core import tag_changed, ensure_board_uids, migrate_scene_boards, get_stores
+from .scheduling import schedule_filter_update, request_redraw
+from .sorting import SORT_MODES, invalidate_pin
+from . import tag_index
+
+# --- Update callbacks ---
+# Only bump change counters here: they run for every edit, so they must stay O(1).
+def _update_pin_selection(self, context): tag_changed('selection')
+def _update_pin_image(self, context): tag_changed('images'); invalidate_pin(self)
+def _update_pin_color(self, context): tag_changed('palette'); invalidate_pin(self) # Sort keys only, no image rescan
+def _update_pin_text(self, context):
+    from . import search_index # Loaded on first use (a dict lookup afterwards)
+    tag_changed('text'); invalidate_pin(self); search_index.invalidate_pin(self)
+def _update_pin_tags(self, context): _update_pin_text(self, context); tag_index.update_pin(self)
+def _search_tags(self, context, edit_text): return tag_index.suggest(self.id_data, edit_text) # Pins and boards
+def _update_global_query(self, context):
+    from . import search_index
+    search_index.run_global_search(self)
+def _update_board_sort(self, context): request_redraw(context)
+def _update_board_filter(self, context): schedule_filter_update(self) # Applied after a short idle time
+
+# --- Property Group for a palette color (sRGB encoded, as extracted and as rgb_to_lab expects) ---
+class RefBoardSwatch(bpy.types.PropertyGroup):
+    color: FloatVectorProperty(
+        name="Color", size=3, subtype='COLOR_GAMMA', min=0.0, max=1.0, default=(0.0, 0.0, 0.0)
+    )
+    weight: FloatProperty(
+        name="Weight", default=0.0, min=0.0, max=1.0, subtype='FACTOR',
+        description="Share of the image covered by this color"
+    )
 
 # --- Property Group for Pin ---
 class RefBoardPin(bpy.types.PropertyGroup):
     image: PointerProperty(
-        type=bpy.types.Image, description="The reference image data-block"
+        type=bpy.types.Image, description="The reference image data-block",
+        update=_update_pin_image
     )
     note: StringProperty(
-        name="Note", default="", description="Optional text note"
+        name="Note", default="", description="Optional text note", update=_update_pin_text
     )
     pin_name: StringProperty(
-        name="Pin Name", default="", description="Custom display name"
+        name="Pin Name", default="", description="Custom display name", update=_update_pin_text
     )
     external_link: StringProperty(
-        name="External Link", default="", description="URL associated with pin"
+        name="External Link", default="", description="URL associated with pin", update=_update_pin_text
     )
     tags: StringProperty(
-        name="Tags", default="", description="Comma-separated tags"
+        name="Tags", default="", description="Comma-separated tags", update=_update_pin_tags,
+        search=_search_tags, search_options={'SUGGESTION'}
     )
     is_selected: BoolProperty(
         name="Selected",
         description="Mark this pin for batch operations",
-        default=False
+        default=False,
+        update=_update_pin_selection
+    )
+    uid: StringProperty(
+        default="", options={'HIDDEN'}, description="Stable unique id of the pin (used by caches)"
+    )
+    date_added: FloatProperty(
+        name="Date Added", default=0.0, options={'HIDDEN'}, description="Time the pin was added (seconds since epoch)"
+    )
+    dominant_color: FloatVectorProperty(
+        name="Dominant Color", size=3, subtype='COLOR_GAMMA', min=0.0, max=1.0, default=(0.0, 0.0, 0.0),
+        description="Most prominent color of the image", update=_update_pin_color
     )
+    palette: CollectionProperty(
+        type=RefBoardSwatch, description="Main colors of the image, most prominent first"
+    )
+    # HTTP cache validators and content hash of the download, for refreshing URL pins (see url_refresh.py)
+    source_etag: StringProperty(default="", options={'HIDDEN'}, description="ETag of the downloaded image")
+    source_last_modified: StringProperty(default="", options={'HIDDEN'}, description="Last-Modified of the downloaded image")
+    source_hash: StringProperty(default="", options={'HIDDEN'}, description="Content hash of the downloaded image")
+    # Free arrangement on the canvas view (canvas units, y down; see canvas.py)
+    canvas_x: FloatProperty(name="Canvas X", default=0.0, description="Left edge of the pin on the canvas")
+    canvas_y: FloatProperty(name="Canvas Y", default=0.0, description="Top edge of the pin on the canvas")
+    canvas_scale: FloatProperty(name="Canvas Scale", default=1.0, min=0.01, max=100.0, description="Size of the pin on the canvas")
+    canvas_placed: BoolProperty(default=False, options={'HIDDEN'}, description="Set once the pin has a canvas position")
 # --- Property Group for Board ---
 class RefBoardBoard(bpy.types.PropertyGroup):
     name: StringProperty(name="Board Name", default="New Board")
+    uid: StringProperty(default="", options={'HIDDEN'}, description="Stable unique id of the board")
     pins: CollectionProperty(type=RefBoardPin)
     thumbnail_size: FloatProperty(
         name="Thumbnail Size", default=100.0, min=20, max=600, soft_max=256,
         subtype='PIXEL', description="Desired base size for thumbnails"
     )
     active_pin_index: IntProperty(default=-1)
-    pin_filter: StringProperty(name="Name/Note Filter", default="")
-    tag_filter: StringProperty(name="Tag Filter", default="")
+    select_anchor_index: IntProperty(
+        default=-1, description="Pin index of the last click, used as the start of shift-click range selection"
+    )
+    pin_filter: StringProperty(
+        name="Name/Note Filter", default="", options={'TEXTEDIT_UPDATE'}, update=_update_board_filter
+    )
+    tag_filter: StringProperty(
+        name="Tag Filter", default="", options={'TEXTEDIT_UPDATE'}, update=_update_board_filter,
+        search=_search_tags, search_options={'SUGGESTION'}
+    )
+    # Filter values actually used by the pin list (copied from the fields above once typing pauses)
+    applied_pin_filter: StringProperty(default="", options={'HIDDEN'})
+    applied_tag_filter: StringProperty(default="", options={'HIDDEN'})
+    # Set when the board is mounted from the shared library; pins are paged in on demand
+    library_uid: StringProperty(default="", options={'HIDDEN'}, description="Uid of the library board this board shows")
+    library_offset: IntProperty(default=0, options={'HIDDEN'}, description="Number of library pins already paged in")
+    library_total: IntProperty(default=0, options={'HIDDEN'}, description="Number of pins of the library board")
+    # Display order of the pin grid; does not change the order of board.pins
+    sort_mode: EnumProperty(
+        items=SORT_MODES, name="Sort By", default='MANUAL', update=_update_board_sort
+    )
+    sort_reverse: BoolProperty(
+        name="Descending", default=False, description="Reverse the sort order", update=_update_board_sort
+    )
+    # Canvas view: the canvas point shown at the center of the region, and pixels per canvas unit
+    canvas_view_x: FloatProperty(default=0.0, options={'HIDDEN'})
+    canvas_view_y: FloatProperty(default=0.0, options={'HIDDEN'})
+    canvas_zoom: FloatProperty(default=0.25, min=0.001, max=64.0, options={'HIDDEN'})
+
+# --- Property Group for a global search result ---
+class RefBoardSearchHit(bpy.types.PropertyGroup):
+    # 'name' holds the display name of the pin
+    board_uid: StringProperty(options={'HIDDEN'})
+    pin_uid: StringProperty(options={'HIDDEN'})
+    board_name: StringProperty(name="Board")
+    image: PointerProperty(type=bpy.types.Image)
+
+# --- Property Group for a shared library search result ---
+class RefBoardLibraryHit(bpy.types.PropertyGroup):
+    # 'name' holds the display name of the pin
+    board_name: StringProperty(name="Board")
+    pin_uid: StringProperty(options={'HIDDEN'})
+    hash: StringProperty(options={'HIDDEN'})
+    filepath: StringProperty(options={'HIDDEN'})
+    note: StringProperty(options={'HIDDEN'})
+    tags: StringProperty(options={'HIDDEN'})
+    link: StringProperty(options={'HIDDEN'})
+    date_added: FloatProperty(options={'HIDDEN'})
 
 # List of property classes
 prop_classes = (
+    RefBoardSwatch,
     RefBoardPin,
     RefBoardBoard,
+    RefBoardSearchHit,
+    RefBoardLibraryHit,
 )
 
-# Scene Properties
-scene_props = {
+# Board store properties, on the Text data-block holding the boards of the file (see core.get_store)
+store_props = {
     'refboard_boards': CollectionProperty(type=RefBoardBoard),
+}
+
+# Scene Properties: the scene's view of the board store and its search state
+scene_props = {
+    'refboard_store': PointerProperty(
+        type=bpy.types.Text, name="Board Store", options={'HIDDEN'},
+        description="Data-block holding the boards shown in this scene"
+    ),
     'refboard_active_board_index': IntProperty(name="Active Board Index", default=-1),
     'refboard_search_query': StringProperty(name="Search Query", default=""),
+    'refboard_global_query': StringProperty(
+        name="Search All Boards", default="", update=_update_global_query,
+        description="Words to find in pin names, notes, tags and links of every board"
+    ),
+    'refboard_search_results': CollectionProperty(type=RefBoardSearchHit),
+    'refboard_search_result_index': IntProperty(name="Active Search Result", default=-1),
+    'refboard_library_query': StringProperty(
+        name="Search Library", default="", description="Words to find in the shared reference library"
+    ),
+    'refboard_library_results': CollectionProperty(type=RefBoardLibraryHit),
+    'refboard_library_result_index': IntProperty(name="Active Library Result", default=-1),
     'refboard_image_url': StringProperty(name="Image URL", default=""),
+    'refboard_color_query': FloatVectorProperty(
+        name="Search Color", size=3, subtype='COLOR_GAMMA', min=0.0, max=1.0, default=(0.8, 0.5, 0.3),
+        description="Find pins whose palette contains a color similar to this one"
+    ),
+    'refboard_color_tolerance': FloatProperty(
+        name="Tolerance", default=20.0, min=1.0, max=100.0,
+        description="Maximum perceptual color distance (Lab delta E) of a match"
+    ),
     'refboard_show_web_tools': BoolProperty( # <-- NEW PROPERTY
         name="Show Web Tools",
         description="Toggle visibility of the Web Tools section",
         default=False # Hidden by default
     ),
+    # Boards of files saved by older versions; moved to the store when such a file is loaded
+    'refboard_boards': CollectionProperty(type=RefBoardBoard, options={'HIDDEN'}),
 }
 
+# Files of older versions keep their boards on the scenes: they are moved to the store first.
+# Pins created by older versions of the add-on have no uid yet. They get one right away, before
+# anything can look pins up by uid: this is a string check per pin, cheap even for large boards.
+@persistent
+def _ensure_pin_uids_on_load(*_args):
+    migrate_scene_boards()
+    for store in get_stores():
+        if store.library is not None: continue # Linked boards are read-only
+        for board in store.refboard_boards: ensure_board_uids(board)
+
+def _migrate_after_register():
+    _ensure_pin_uids_on_load()
+    return None # Run once
+
 def register():
     for cls in prop_classes:
         bpy.utils.register_class(cls)
+    for name, prop in store_props.items():
+        setattr(bpy.types.Text, name, prop)
     for name, prop in scene_props.items():
         setattr(bpy.types.Scene, name, prop)
+    if _ensure_pin_uids_on_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_ensure_pin_uids_on_load)
+    # Enabled with a file of an older version open: data is not accessible during register
+    bpy.app.timers.register(_migrate_after_register, first_interval=0.0)
 
 def unregister():
+    if _ensure_pin_uids_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_ensure_pin_uids_on_load)
+    if bpy.app.timers.is_registered(_migrate_after_register):
+        bpy.app.timers.unregister(_migrate_after_register)
     for name in reversed(list(scene_props.keys())):
         if hasattr(bpy.types.Scene, name):
             delattr(bpy.types.Scene, name)
+    for name in store_props:
+        if hasattr(bpy.types.Text, name):
+            delattr(bpy.types.Text, name)
     for cls in reversed(prop_classes):
         bpy.utils.unregister_class(cls)
\ No newline at end of file
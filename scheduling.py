@@ -0,0 +1,117 @@
+import bpy
+import time
+from collections import deque
+from bpy.app.handlers import persistent
+# Relative import of core
+from . import core
+
+# Small scheduling layer on top of bpy.app.timers:
+#  - redraw requests are collected and flushed at most once per frame,
+#  - filter edits are applied only after the user stopped typing for a moment,
+#  - background tasks (previews, palettes) run in small time slices between frames.
+
+REDRAW_INTERVAL = 1.0 / 60.0 # Seconds, one frame at 60 fps
+FILTER_DELAY = 0.25          # Seconds of idle time before a filter edit is applied
+TASK_BUDGET = 0.01           # Seconds of background work per timer tick
+TASK_INTERVAL = 0.02         # Seconds between background ticks, leaves time for the UI
+
+_pending_areas = set()   # Area pointers to redraw; None means "all 3D Views"
+_pending_filters = set() # (store key, board path) of boards with unapplied filter edits
+_tasks = deque()         # Callables run by _run_tasks()
+
+# --- Redraws ---
+def _flush_redraws():
+    pending = _pending_areas.copy(); _pending_areas.clear()
+    wm = bpy.context.window_manager
+    for window in (wm.windows if wm else ()):
+        for area in window.screen.areas:
+            if area.as_pointer() in pending or (None in pending and area.type == 'VIEW_3D'):
+                area.tag_redraw()
+    return None # Run once
+
+def request_redraw(context: bpy.types.Context | None = None) -> None:
+    """
+    Asks for a redraw of the context's area (or of all 3D Views without context).
+    Any number of requests within one frame result in a single redraw per area.
+    """
+    area = getattr(context, "area", None) if context else None
+    request_area_redraw(area.as_pointer() if area else None)
+
+def request_area_redraw(area_pointer: int | None) -> None:
+    """Like request_redraw(), for an area known only by its pointer (None: all 3D Views)."""
+    _pending_areas.add(area_pointer)
+    if not bpy.app.timers.is_registered(_flush_redraws):
+        bpy.app.timers.register(_flush_redraws, first_interval=REDRAW_INTERVAL)
+
+# --- Debounced filters ---
+def apply_filters(board) -> bool:
+    """Copies the typed filter text to the values used for filtering. Returns True if they changed."""
+    if board.applied_pin_filter == board.pin_filter and board.applied_tag_filter == board.tag_filter:
+        return False
+    board.applied_pin_filter = board.pin_filter
+    board.applied_tag_filter = board.tag_filter
+    return True
+
+def _flush_filters():
+    pending = _pending_filters.copy(); _pending_filters.clear()
+    changed = False
+    for store_key, board_path in pending:
+        store = core.find_store(store_key)
+        if store is None: continue
+        try: board = store.path_resolve(board_path)
+        except ValueError: continue # Board was removed meanwhile
+        changed |= apply_filters(board)
+    if changed:
+        request_redraw()
+    return None # Run once
+
+def schedule_filter_update(board) -> None:
+    """Restarts the idle timer for this board's filters; called on every keystroke."""
+    _pending_filters.add((core.get_store_key(board.id_data), board.path_from_id()))
+    if bpy.app.timers.is_registered(_flush_filters):
+        bpy.app.timers.unregister(_flush_filters)
+    bpy.app.timers.register(_flush_filters, first_interval=FILTER_DELAY)
+
+# --- Background tasks ---
+def _run_tasks(budget: float = TASK_BUDGET):
+    deadline = time.perf_counter() + budget
+    while _tasks and time.perf_counter() < deadline:
+        task = _tasks.popleft()
+        try: task()
+        except Exception as e: print(f"RefBoard: background task failed: {e}")
+    request_redraw()
+    return TASK_INTERVAL if _tasks else None
+
+def enqueue_task(task) -> None:
+    """Runs task() later on the main thread, a few tasks per tick, without blocking the UI."""
+    _tasks.append(task)
+    if bpy.app.background: # No event loop to run timers in, do it right away
+        _run_tasks(budget=float('inf'))
+        return
+    if not bpy.app.timers.is_registered(_run_tasks):
+        bpy.app.timers.register(_run_tasks, first_interval=TASK_INTERVAL)
+
+def pending_task_count() -> int:
+    return len(_tasks)
+
+# Files saved with a typed but not yet applied filter start in a consistent state
+@persistent
+def _apply_filters_on_load(*_args):
+    for store in core.get_stores():
+        if store.library is not None: continue # Linked boards are read-only
+        for board in store.refboard_boards:
+            apply_filters(board)
+
+def register():
+    if _apply_filters_on_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_apply_filters_on_load)
+
+def unregister():
+    if _apply_filters_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_apply_filters_on_load)
+    for timer in (_flush_redraws, _flush_filters, _run_tasks):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    _pending_areas.clear()
+    _pending_filters.clear()
+    _tasks.clear()
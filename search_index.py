@@ -0,0 +1,124 @@
+import bpy
+import re
+from bisect import bisect_left
+from bpy.app.handlers import persistent
+# Relative import of core
+from . import core
+
+# Shared full-text index over name, note, tags and link of every pin of every board.
+# The index is split into one segment per board (keyed by board uid), so editing a pin
+# only rebuilds the segment of its own board on the next query.
+
+MAX_RESULTS = 500
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+def tokenize(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+class _Segment:
+    __slots__ = ("pin_count", "order_gen", "tokens", "sorted_tokens")
+
+    def __init__(self, board):
+        self.pin_count = len(board.pins)
+        self.order_gen = core.get_generation('order')
+        self.tokens = {} # token -> set of pin indices
+        for pin_idx, pin in enumerate(board.pins):
+            _pin_to_board[pin.uid] = board.uid
+            text = " ".join((pin.pin_name, pin.image.name if pin.image else "", pin.note, pin.tags, pin.external_link))
+            for token in tokenize(text):
+                self.tokens.setdefault(token, set()).add(pin_idx)
+        self.sorted_tokens = sorted(self.tokens)
+
+    def is_valid(self, board) -> bool:
+        return self.pin_count == len(board.pins) and self.order_gen == core.get_generation('order')
+
+    def match_prefix(self, term: str) -> set[int]:
+        """Returns the pins having a token that starts with term (binary search on the sorted tokens)."""
+        result = set()
+        tokens = self.sorted_tokens
+        i = bisect_left(tokens, term)
+        while i < len(tokens) and tokens[i].startswith(term):
+            result |= self.tokens[tokens[i]]; i += 1
+        return result
+
+    def query(self, terms: list[str]) -> list[int]:
+        hits = None
+        for term in terms:
+            matches = self.match_prefix(term)
+            hits = matches if hits is None else hits & matches
+            if not hits: return []
+        return sorted(hits) if hits else []
+
+_segments = {}      # board uid -> _Segment
+_dirty_boards = set()
+_pin_to_board = {}  # pin uid -> board uid, to invalidate the right segment from a pin update
+
+def invalidate_pin(pin) -> None:
+    """Marks the segment of the pin's board as outdated. O(1), called from pin update callbacks."""
+    board_uid = _pin_to_board.get(pin.uid)
+    if board_uid: _dirty_boards.add(board_uid)
+
+def invalidate() -> None:
+    _segments.clear(); _dirty_boards.clear(); _pin_to_board.clear()
+
+def _get_segment(board) -> _Segment:
+    segment = _segments.get(board.uid)
+    if segment is None or board.uid in _dirty_boards or not segment.is_valid(board):
+        segment = _segments[board.uid] = _Segment(board)
+        _dirty_boards.discard(board.uid)
+    return segment
+
+def search(boards, text: str, limit: int = MAX_RESULTS) -> list[tuple[int, int]]:
+    """
+    Returns (board index, pin index) of the pins matching all words of the query,
+    each word as a prefix of a word in the pin's name, note, tags or link.
+    """
+    terms = sorted(tokenize(text), key=len, reverse=True) # Long terms narrow the result fastest
+    if not terms: return []
+    results = []
+    for board_idx, board in enumerate(boards):
+        if not board.uid: continue
+        for pin_idx in _get_segment(board).query(terms):
+            results.append((board_idx, pin_idx))
+            if len(results) >= limit: return results
+    return results
+
+def run_global_search(scene: bpy.types.Scene) -> int:
+    """Fills scene.refboard_search_results with the hits of scene.refboard_global_query."""
+    results = scene.refboard_search_results
+    results.clear()
+    boards = core.get_boards(scene)
+    for board_idx, pin_idx in search(boards, scene.refboard_global_query):
+        board = boards[board_idx]; pin = board.pins[pin_idx]
+        hit = results.add()
+        hit.name = pin.pin_name or (pin.image.name if pin.image else "")
+        hit.board_uid = board.uid; hit.pin_uid = pin.uid
+        hit.board_name = board.name
+        hit.image = pin.image
+    scene.refboard_search_result_index = -1
+    return len(results)
+
+# --- Handlers ---
+@persistent
+def _clear_cache_handler(*_args):
+    invalidate()
+
+_handlers = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    for handler_list in _handlers:
+        if _clear_cache_handler not in handler_list:
+            handler_list.append(_clear_cache_handler)
+
+def unregister():
+    for handler_list in _handlers:
+        if _clear_cache_handler in handler_list:
+            handler_list.remove(_clear_cache_handler)
+    invalidate()
+
+# Loaded on first use, not at add-on startup: hooks itself up when imported (see __init__.lazy_modules)
+register()
@@ -0,0 +1,168 @@
+import bpy
+import os
+import colorsys
+import numpy as np
+from bpy.app.handlers import persistent
+# Relative import of core
+from . import core
+
+# Sort modes shown in the Pins panel. 'MANUAL' keeps the physical order of board.pins.
+SORT_MODES = [
+    ('MANUAL', "Manual", "Order in which the pins are stored on the board"),
+    ('NAME', "Name", "Sort by pin name"),
+    ('DATE_ADDED', "Date Added", "Sort by the time the pin was added"),
+    ('IMAGE_SIZE', "Image Size", "Sort by pixel count of the image"),
+    ('ASPECT', "Aspect Ratio", "Sort by width / height of the image"),
+    ('FILE_SIZE', "File Size", "Sort by size of the image file or packed data"),
+    ('COLOR', "Dominant Color", "Sort by hue of the dominant color, grays last"),
+]
+
+# Sort keys are cached per pin (by uid) and per mode, and dropped when that pin changes.
+# The resulting display order is cached per board until a key of one of its pins, the pin count
+# or the order changes; editing a pin only invalidates the order of the pin's own board.
+_pin_keys = {}       # uid -> {mode: key}
+_pin_to_board = {}   # pin uid -> board key, filled when the board's order is computed
+_board_versions = {} # board key -> version, bumped when a key of one of its pins changes
+_orders = {}         # board key -> (signature, sorted indices, new order list)
+
+def invalidate_pin(pin) -> None:
+    """Forgets the cached sort keys of one pin. Called from the pin's update callbacks."""
+    _pin_keys.pop(pin.uid, None)
+    board_key = _pin_to_board.get(pin.uid)
+    if board_key is not None: _board_versions[board_key] = _board_versions.get(board_key, 0) + 1
+
+def invalidate() -> None:
+    _pin_keys.clear(); _pin_to_board.clear(); _orders.clear()
+    _board_versions.clear()
+
+# --- Key functions (per pin, cached) ---
+def _image_size_key(pin):
+    img = pin.image
+    return float(img.size[0] * img.size[1]) if img else 0.0
+
+def _aspect_key(pin):
+    img = pin.image
+    if not img or not img.size[1]: return 0.0
+    return img.size[0] / img.size[1]
+
+def _file_size_key(pin):
+    img = pin.image
+    if not img: return 0.0
+    if img.packed_file: return float(img.packed_file.size)
+    try: return float(os.path.getsize(bpy.path.abspath(img.filepath, library=img.library)))
+    except OSError: return 0.0
+
+def _preview_mean_color(img):
+    """Estimates the average color from the image preview; None if the preview is not ready yet."""
+    preview = img.preview
+    if not preview or not preview.image_size[0]: return None
+    pixels = np.zeros(preview.image_size[0] * preview.image_size[1] * 4, dtype=np.float32)
+    preview.image_pixels_float.foreach_get(pixels)
+    pixels = pixels.reshape(-1, 4)
+    weights = pixels[:, 3]
+    if not weights.any(): return None
+    return tuple(np.average(pixels[:, :3], axis=0, weights=weights))
+
+def _color_key(pin):
+    color = tuple(pin.dominant_color)
+    if not any(color): # Not extracted yet, estimate from the preview
+        color = _preview_mean_color(pin.image) if pin.image else None
+        if color is None: return None
+    r, g, b = color
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    # Chromatic colors by hue first, then grays/near-blacks by brightness
+    return h if s > 0.15 and v > 0.1 else 1.0 + v
+
+_KEY_FUNCS = {
+    'IMAGE_SIZE': _image_size_key,
+    'ASPECT': _aspect_key,
+    'FILE_SIZE': _file_size_key,
+    'COLOR': _color_key,
+}
+
+def _cached_keys(board, mode: str) -> tuple[list, bool]:
+    key_func = _KEY_FUNCS[mode]
+    keys = []; complete = True
+    for pin in board.pins:
+        uid = pin.uid
+        pin_keys = _pin_keys.get(uid) if uid else None
+        if pin_keys is None:
+            pin_keys = {}
+            if uid: _pin_keys[uid] = pin_keys
+        key = pin_keys.get(mode)
+        if key is None:
+            key = key_func(pin)
+            if key is None: key = 2.0; complete = False # Data not available yet; sort last for now
+            else: pin_keys[mode] = key
+        keys.append(key)
+    return keys, complete
+
+def _compute_keys(board, mode: str) -> tuple[np.ndarray, bool]:
+    count = len(board.pins)
+    if mode == 'DATE_ADDED': # Plain float property, read in one call
+        keys = np.zeros(count, dtype=np.float64)
+        board.pins.foreach_get("date_added", keys)
+        return keys, True
+    if mode == 'NAME':
+        return np.array([(pin.pin_name or (pin.image.name if pin.image else "")).lower() for pin in board.pins]), True
+    keys, complete = _cached_keys(board, mode)
+    return np.array(keys, dtype=np.float64), complete
+
+# --- Display order ---
+def get_sorted_indices(board) -> np.ndarray | None:
+    """
+    Returns the pin indices in display order for the board's sort mode,
+    or None when the board uses the manual (stored) order.
+    """
+    mode = board.sort_mode
+    if mode == 'MANUAL': return None
+    return _get_order(board)[0]
+
+def get_new_order(board) -> list:
+    """Returns the flt_neworder list for UIList.filter_items (empty list for manual order)."""
+    if board.sort_mode == 'MANUAL': return []
+    return _get_order(board)[1]
+
+def _get_order(board):
+    key = core.get_board_key(board)
+    signature = (
+        board.sort_mode, board.sort_reverse, len(board.pins),
+        _board_versions.get(key, 0), core.get_generation('order'),
+    )
+    cached = _orders.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+    for pin in board.pins:
+        if pin.uid: _pin_to_board[pin.uid] = key
+    keys, complete = _compute_keys(board, board.sort_mode)
+    order = np.argsort(keys, kind='stable')
+    if board.sort_reverse: order = order[::-1]
+    # filter_items expects the new display position of every pin, i.e. the inverse permutation
+    new_order = np.empty_like(order)
+    new_order[order] = np.arange(len(order))
+    new_order = new_order.tolist()
+    if complete: # Otherwise retry on the next redraw, e.g. once previews are ready
+        _orders[key] = (signature, order, new_order)
+    return order, new_order
+
+# --- Handlers ---
+@persistent
+def _clear_cache_handler(*_args):
+    invalidate()
+
+_handlers = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    for handler_list in _handlers:
+        if _clear_cache_handler not in handler_list:
+            handler_list.append(_clear_cache_handler)
+
+def unregister():
+    for handler_list in _handlers:
+        if _clear_cache_handler in handler_list:
+            handler_list.remove(_clear_cache_handler)
+    invalidate()
@@ -0,0 +1,174 @@
+import bpy
+import re
+import heapq
+from bpy.app.handlers import persistent
+# Relative import of core
+from . import core
+
+# File-wide tag vocabulary: every tag used on any pin of any board, with the number of pins
+# using it, in a prefix trie for autocompletion. Tag edits update the trie incrementally (the
+# last known tags of every pin are kept to diff against); adding, removing or moving pins
+# rebuilds it on the next query, like the search index segments.
+
+MAX_SUGGESTIONS = 20
+_SPACE_RE = re.compile(r"\s+")
+
+def split_tags(text: str) -> list[str]:
+    """The comma-separated tags of a string, in order, without empty entries."""
+    return [tag.strip() for tag in text.split(',') if tag.strip()]
+
+def normalize_tag(tag: str) -> str:
+    """Lower case, single spaces, no surrounding whitespace."""
+    return _SPACE_RE.sub(" ", tag.strip().lower())
+
+class _Node:
+    __slots__ = ("children", "count")
+    def __init__(self):
+        self.children = {}
+        self.count = 0 # Pins using the tag that ends at this node
+
+class TagIndex:
+    """Prefix trie of the tags of one board store with usage counts."""
+    def __init__(self, boards):
+        self.root = _Node()
+        self.counts = {}   # tag -> number of pins using it
+        self.pin_tags = {} # pin uid -> tags of the pin when last seen
+        self.pin_count = sum(len(board.pins) for board in boards)
+        self.order_gen = core.get_generation('order')
+        for board in boards:
+            for pin in board.pins: self.update_pin(pin)
+
+    def is_valid(self, boards) -> bool:
+        return (self.order_gen == core.get_generation('order')
+                and self.pin_count == sum(len(board.pins) for board in boards))
+
+    def _add(self, tag: str, amount: int) -> None:
+        node = self.root
+        for char in tag:
+            child = node.children.get(char)
+            if child is None:
+                if amount < 0: return
+                child = node.children[char] = _Node()
+            node = child
+        node.count += amount
+        count = self.counts.get(tag, 0) + amount
+        if count > 0: self.counts[tag] = count
+        else: self.counts.pop(tag, None) # Empty nodes stay, they are cheap and likely reused
+
+    def update_pin(self, pin) -> None:
+        """Applies the difference between the pin's current and last known tags."""
+        tags = frozenset(normalize_tag(tag) for tag in split_tags(pin.tags))
+        key = pin.uid or pin.as_pointer() # Only linked pins of older files can lack a uid
+        old = self.pin_tags.get(key, frozenset())
+        if tags == old: return
+        for tag in old - tags: self._add(tag, -1)
+        for tag in tags - old: self._add(tag, 1)
+        self.pin_tags[key] = tags
+
+    def complete(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> list[tuple[str, int]]:
+        """(tag, count) of the most used tags starting with prefix, most used first."""
+        prefix = normalize_tag(prefix)
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None: return []
+        found = []
+        stack = [(node, prefix)]
+        while stack:
+            node, text = stack.pop()
+            if node.count > 0: found.append((node.count, text))
+            stack.extend((child, text + char) for char, child in node.children.items())
+        return [(tag, count) for count, tag in heapq.nlargest(limit, found, key=lambda item: (item[0], -len(item[1])))]
+
+_indexes = {} # Store key -> TagIndex: scenes showing the same store share one index
+
+def get_index(owner) -> TagIndex:
+    """The tag index of the boards of a scene or store (see core.get_store)."""
+    key = core.get_store_key(owner); boards = core.get_boards(owner)
+    index = _indexes.get(key)
+    if index is None or not index.is_valid(boards):
+        index = _indexes[key] = TagIndex(boards)
+    return index
+
+def update_pin(pin) -> None:
+    """Called from the tags update callback: keeps an already built index of the pin's store current."""
+    index = _indexes.get(pin.id_data.name_full)
+    if index is not None: index.update_pin(pin)
+
+def invalidate() -> None:
+    _indexes.clear()
+
+def suggest(owner, edit_text: str) -> list[tuple[str, str]]:
+    """
+    Suggestions for a comma-separated tag field: the text with its last tag completed,
+    for StringProperty(search=...). Tags already in the field are not suggested again.
+    """
+    head, _sep, last = edit_text.rpartition(',')
+    present = {normalize_tag(tag) for tag in split_tags(head)}
+    head = f"{head.strip()}, " if head.strip() else ""
+    return [(head + tag, f"{count} pin(s)") for tag, count in get_index(owner).complete(last.strip(), MAX_SUGGESTIONS + len(present))
+            if tag not in present][:MAX_SUGGESTIONS]
+
+# --- Bulk rewriting ---
+def build_merge_map(counts: dict, fold_plurals: bool = True) -> dict:
+    """
+    Maps every tag of counts (tag -> pins, as in TagIndex.counts) to its canonical form.
+    With fold_plurals, a singular/plural pair ("hand"/"hands", "brush"/"brushes") maps to
+    whichever form more pins use.
+    """
+    canonical = {tag: tag for tag in counts}
+    if fold_plurals:
+        for tag in counts:
+            for suffix in ("es", "s"):
+                singular = tag[:-len(suffix)]
+                if tag.endswith(suffix) and len(singular) > 1 and singular in counts:
+                    canonical[tag] = canonical[singular] = tag if counts[tag] > counts[singular] else singular
+                    break
+    return canonical
+
+def rewrite_tags(boards, mapping: dict, normalize: bool = True) -> tuple[int, int]:
+    """
+    Rewrites the tags of all pins of the boards through the mapping (normalized tag -> new tag,
+    an empty new tag removes it); duplicates that result are dropped. Without normalize, only
+    pins with a mapped tag are touched and their other tags are kept as written. Only pins
+    whose text changes are written. Returns (pins checked, pins changed).
+    """
+    checked = changed = 0
+    for board in boards:
+        for pin in board.pins:
+            checked += 1
+            if not pin.tags: continue
+            old_tags = split_tags(pin.tags)
+            if not normalize and not any(normalize_tag(tag) in mapping for tag in old_tags): continue
+            tags = []; seen = set()
+            for tag in old_tags:
+                key = normalize_tag(tag)
+                tag = mapping[key] if key in mapping else (key if normalize else tag)
+                if tag and normalize_tag(tag) not in seen:
+                    tags.append(tag); seen.add(normalize_tag(tag))
+            text = ", ".join(tags)
+            if text != pin.tags:
+                pin.tags = text; changed += 1
+    return checked, changed
+
+# --- Handlers ---
+@persistent
+def _clear_cache_handler(*_args):
+    invalidate()
+
+_handlers = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    for handler_list in _handlers:
+        if _clear_cache_handler not in handler_list:
+            handler_list.append(_clear_cache_handler)
+
+def unregister():
+    for handler_list in _handlers:
+        if _clear_cache_handler in handler_list:
+            handler_list.remove(_clear_cache_handler)
+    invalidate()
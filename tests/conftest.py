@@ -0,0 +1,8 @@
+# The add-on folder is a package, so pytest imports its __init__ (and with it bpy) before running
+# the tests: install the bpy stand-in of the benchmarks first. Nothing is registered.
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import bpy_standin
+bpy_standin.install()
@@ -0,0 +1,107 @@
+"""
+Conditional URL refresh against a local HTTP server, outside Blender (bpy stand-in).
+
+    python -m pytest tests            (or: python -m unittest discover tests)
+"""
+import os
+import sys
+import hashlib
+import unittest
+import importlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from bench_pins import load_addon # Installs the bpy stand-in and imports the add-on package
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """Serves server.files (path -> bytes) as PNG; /etag/... paths send an ETag and honour If-None-Match."""
+    def do_GET(self):
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404); return
+        self.server.requests.append(self.path)
+        headers = {'Content-Type': 'image/png'}
+        if self.path.startswith("/etag/"):
+            headers['ETag'] = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                self.send_response(304); self.send_header('ETag', headers['ETag']); self.end_headers(); return
+        self.send_response(200)
+        for key, value in headers.items(): self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_args): pass
+
+class UrlRefreshTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        package, _mode = load_addon()
+        module = lambda sub: importlib.import_module(f"{package}.{sub}")
+        cls.core = module("core"); cls.image_utils = module("image_utils"); cls.url_refresh = module("url_refresh")
+        cls.scene = sys.modules["bpy_standin"].new_scene(module("properties"))
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        cls.server.files = {}; cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown(); cls.server.server_close()
+
+    def png(self, value: int) -> bytes:
+        return self.image_utils.encode_png(self.image_utils.np.full((4, 4, 4), value, dtype=self.image_utils.np.uint8))
+
+    def test_fetch_conditional(self):
+        url = self.base + "/etag/fetch.png"
+        self.server.files["/etag/fetch.png"] = first = self.png(10)
+        status, data, validators = self.url_refresh.fetch_conditional(url)
+        self.assertEqual((status, data), (200, first))
+        self.assertTrue(validators["etag"])
+        status, data, again = self.url_refresh.fetch_conditional(url, validators["etag"])
+        self.assertEqual((status, data, again["etag"]), (304, None, validators["etag"]))
+        self.server.files["/etag/fetch.png"] = second = self.png(20)
+        status, data, changed = self.url_refresh.fetch_conditional(url, validators["etag"])
+        self.assertEqual((status, data), (200, second))
+        self.assertNotEqual(changed["etag"], validators["etag"])
+
+    def test_refresh_pins(self):
+        files = self.server.files
+        files["/etag/same.png"] = self.png(30)
+        files["/etag/changed.png"] = self.png(40)
+        files["/plain.png"] = self.png(50)
+        board = self.core.new_board(self.scene, "Refresh")
+        for path in ("/etag/same.png", "/etag/changed.png", "/plain.png"):
+            _status, data, validators = self.url_refresh.fetch_conditional(self.base + path)
+            img = self.image_utils.load_image_from_bytes(os.path.basename(path), data)
+            pin = self.core.new_pin(board, img)
+            pin.external_link = self.base + path
+            self.url_refresh.set_source(pin, validators, self.image_utils.hash_bytes(data))
+        self.core.new_pin(board).external_link = "notes about the board" # Not a URL, not checked
+        files["/etag/changed.png"] = new_data = self.png(60)
+        old_images = [pin.image for pin in board.pins]
+        del self.server.requests[:]
+
+        stats = self.url_refresh.refresh_pins(board, workers=2)
+        self.assertEqual(stats["checked"], 3)
+        self.assertEqual((stats["not_modified"], stats["unchanged"], stats["updated"], stats["failed"]), (1, 1, 1, 0))
+        self.assertEqual(stats["bytes"], len(new_data) + len(files["/plain.png"]))
+        self.assertEqual(sorted(self.server.requests), ["/etag/changed.png", "/etag/same.png", "/plain.png"])
+        self.assertIs(board.pins[0].image, old_images[0])
+        self.assertIsNot(board.pins[1].image, old_images[1])
+        self.assertEqual(board.pins[1].source_hash, self.image_utils.hash_bytes(new_data))
+        self.assertIs(board.pins[2].image, old_images[2])
+
+        stats = self.url_refresh.refresh_pins(board) # The updated pin now sends the new ETag
+        self.assertEqual((stats["not_modified"], stats["unchanged"], stats["updated"]), (2, 1, 0))
+
+    def test_refresh_failure(self):
+        board = self.core.new_board(self.scene, "Broken")
+        self.core.new_pin(board).external_link = self.base + "/missing.png"
+        stats = self.url_refresh.refresh_pins(board)
+        self.assertEqual((stats["checked"], stats["failed"]), (1, 1))
+        self.assertEqual(stats["errors"][0][0], self.base + "/missing.png")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,30 @@
 import bpy
 from bpy.types import Panel
 # Relative imports
-from ..core import get_active_board
+from ..core import get_active_board, get_boards, get_store
+from ..board_cache import get_board_stats
 from ..operators.board_ops import REFBOARD_OT_AddBoard, REFBOARD_OT_RemoveBoard, REFBOARD_OT_MoveBoard
-from ..operators.pin_ops import REFBOARD_OT_AddPinFromFile, REFBOARD_OT_RemovePin, REFBOARD_OT_MovePin, REFBOARD_OT_SelectAllPins
-from ..operators.web_ops import REFBOARD_OT_WebSearch, REFBOARD_OT_AddPinFromURL
+from ..operators.pin_ops import (
+    REFBOARD_OT_AddPinFromFile, REFBOARD_OT_RemovePin, REFBOARD_OT_MovePin, REFBOARD_OT_MovePinToIndex,
+    REFBOARD_OT_SelectAllPins, REFBOARD_OT_InvertPinSelection,
+)
+from ..operators.web_ops import REFBOARD_OT_WebSearch, REFBOARD_OT_AddPinFromURL, REFBOARD_OT_RefreshFromSource
 from ..operators.placement_ops import REFBOARD_OT_PlacePinInView
+from ..operators.search_ops import REFBOARD_OT_GlobalSearch, REFBOARD_OT_CopySearchHitsToBoard
+from ..operators.library_ops import (
+    REFBOARD_OT_PublishBoard, REFBOARD_OT_MountLibraryBoard, REFBOARD_OT_LoadLibraryPins,
+    REFBOARD_OT_SearchLibrary, REFBOARD_OT_AddLibraryHits,
+)
+from ..preferences import is_library_enabled
+from ..operators.transfer_ops import REFBOARD_OT_TransferPins, REFBOARD_OT_SplitPinsToBoard
+from ..operators.package_ops import REFBOARD_OT_ExportBoardPackage, REFBOARD_OT_ImportBoardPackage
+from ..operators.color_ops import REFBOARD_OT_ComputePalettes, REFBOARD_OT_SearchByColor, REFBOARD_OT_SearchBySwatch
+from ..operators.sheet_ops import REFBOARD_OT_ExportContactSheet
+from ..operators.clipboard_ops import REFBOARD_OT_PasteFromClipboard
+from ..operators.tag_ops import REFBOARD_OT_NormalizeTags, REFBOARD_OT_MergeTags
+from ..operators.canvas_ops import REFBOARD_OT_OpenCanvas, REFBOARD_OT_ArrangeCanvas
+from ..operators.debug_ops import REFBOARD_OT_ExportInstrumentation, REFBOARD_OT_ResetInstrumentation
+from .. import instrumentation
 
 class REFBOARD_PT_BasePanel(Panel):
     bl_idname = "REFBOARD_PT_base_panel"; bl_label = "RefBoard Base"
@@ -51,7 +70,8 @@ class REFBOARD_PT_Help(REFBOARD_PT_BasePanel):
             text="    • Or, expand 'Web Tools' (at the bottom) to add images from URLs or search online.", icon='WORLD')
         col_workflow.label(
             text=" 3. Selecting Pins: Click the small checkbox that appears above a pin's preview to select it.")
-        col_workflow.label(text="    Use 'Select All' / 'Select None' buttons for quick selection.")
+        col_workflow.label(text="    Shift-click a checkbox to select the whole range from the last clicked pin.")
+        col_workflow.label(text="    Use 'Select All' / 'Select None' / 'Invert' for quick selection (they respect the filters).")
         col_workflow.label(text=" 4. Placing Pins: With pins selected, click 'Place Selected in 3D'.")
         col_workflow.label(
             text="    Tip: After placing, press F9 to open the 'Redo Last' panel and adjust placement settings.")
@@ -90,7 +110,8 @@ class REFBOARD_PT_Boards(REFBOARD_PT_BasePanel):
     bl_order = 0; bl_options = set()
     def draw(self, context):
         layout = self.layout; scene = context.scene; row = layout.row(align=True)
-        row.template_list("UI_UL_list", "boards_list", scene, "refboard_boards",
+        # Boards come from the file's store, the active one is the scene's own (an empty list until the first board)
+        row.template_list("UI_UL_list", "boards_list", get_store(scene) or scene, "refboard_boards",
                           scene, "refboard_active_board_index", rows=3)
         col_btns = row.column(align=True)
         col_btns.operator(REFBOARD_OT_AddBoard.bl_idname, text="", icon='ADD')
@@ -98,7 +119,12 @@ class REFBOARD_PT_Boards(REFBOARD_PT_BasePanel):
         op_up = col_sub.operator(REFBOARD_OT_MoveBoard.bl_idname, text="", icon='TRIA_UP'); op_up.direction = 'UP'
         op_down = col_sub.operator(REFBOARD_OT_MoveBoard.bl_idname, text="", icon='TRIA_DOWN'); op_down.direction = 'DOWN'
         col_sub.operator(REFBOARD_OT_RemoveBoard.bl_idname, text="", icon='REMOVE')
-        col_sub.enabled = scene.refboard_active_board_index >= 0 and len(scene.refboard_boards) > 0
+        col_sub.enabled = scene.refboard_active_board_index >= 0 and len(get_boards(scene)) > 0
+        col_io = col_btns.column(align=True)
+        col_io.separator()
+        col_io.operator(REFBOARD_OT_ImportBoardPackage.bl_idname, text="", icon='IMPORT')
+        col_io.operator(REFBOARD_OT_ExportBoardPackage.bl_idname, text="", icon='EXPORT')
+        col_io.operator(REFBOARD_OT_ExportContactSheet.bl_idname, text="", icon='IMAGE_DATA')
 
 class REFBOARD_PT_Pins(REFBOARD_PT_BasePanel):
     bl_idname = "REFBOARD_PT_pins"; bl_label = "Pins"; bl_order = 1
@@ -108,6 +134,11 @@ class REFBOARD_PT_Pins(REFBOARD_PT_BasePanel):
         layout = self.layout; board = get_active_board(context)
         if not board: layout.label(text="Select a board"); return
         layout.label(text=f"Active Board: {board.name}")
+        stats = get_board_stats(board) # Cached counters, cheap to read on every redraw
+        row_stats = layout.row(align=True)
+        row_stats.label(text=f"Pins: {stats.pin_count}")
+        row_stats.label(text=f"Selected: {stats.selected}")
+        row_stats.label(text=f"Missing: {stats.missing_images}", icon='ERROR' if stats.missing_images else 'NONE')
         main_row = layout.row()
 
         # Left column for filters, selection, and pin grid
@@ -122,28 +153,62 @@ class REFBOARD_PT_Pins(REFBOARD_PT_BasePanel):
         # Filter by tags
         row_tag_filter = box_filt.row(align=True)
         row_tag_filter.prop(board, "tag_filter", text="Tag Filter", icon='OUTLINER_OB_GROUP_INSTANCE')
+        row_tag_filter.operator(REFBOARD_OT_NormalizeTags.bl_idname, text="", icon='SORTALPHA')
+        row_tag_filter.operator(REFBOARD_OT_MergeTags.bl_idname, text="", icon='AUTOMERGE_ON')
 
         row_select_btns = box_filt.row(align=True)
         op_select = row_select_btns.operator(REFBOARD_OT_SelectAllPins.bl_idname, text="Select All")
         op_select.select_mode = True
         op_deselect = row_select_btns.operator(REFBOARD_OT_SelectAllPins.bl_idname, text="Select None")
         op_deselect.select_mode = False
-        row_select_btns.enabled = len(board.pins) > 0
+        row_select_btns.operator(REFBOARD_OT_InvertPinSelection.bl_idname, text="Invert")
+        row_select_btns.enabled = stats.pin_count > 0
 
         row_size = box_filt.row(align=True)
         row_size.prop(board, "thumbnail_size", text="Size")
 
+        row_sort = box_filt.row(align=True)
+        row_sort.prop(board, "sort_mode", text="Sort")
+        row_sort.prop(board, "sort_reverse", text="", icon='SORT_DESC' if board.sort_reverse else 'SORT_ASC')
+
+        scene = context.scene
+        row_color = box_filt.row(align=True)
+        row_color.prop(scene, "refboard_color_query", text="")
+        row_color.prop(scene, "refboard_color_tolerance", text="Tol.")
+        op_color = row_color.operator(REFBOARD_OT_SearchByColor.bl_idname, text="", icon='VIEWZOOM')
+        op_color.scope = 'ACTIVE'
+        op_color = row_color.operator(REFBOARD_OT_SearchByColor.bl_idname, text="", icon='WORLD')
+        op_color.scope = 'ALL'
+        row_color.operator(REFBOARD_OT_ComputePalettes.bl_idname, text="", icon='COLOR')
+
         # --- Placement button ---
         row_place = layout.row()
-        # Button is active if there are selected pins (operator's poll will check this)
+        # Button is active if there are selected pins with images
+        row_place.enabled = stats.selected_valid > 0
         row_place.operator(
             REFBOARD_OT_PlacePinInView.bl_idname,
             text="Place Selected in 3D",
             icon='IMAGE_REFERENCE'
         )
+        row_canvas = layout.row(align=True)
+        row_canvas.operator(REFBOARD_OT_OpenCanvas.bl_idname, text="Open Canvas", icon='IMAGE_BACKGROUND')
+        row_canvas.operator(REFBOARD_OT_ArrangeCanvas.bl_idname, text="", icon='SNAP_GRID')
+        row_transfer = layout.row(align=True)
+        row_transfer.enabled = stats.selected > 0
+        op_move = row_transfer.operator(REFBOARD_OT_TransferPins.bl_idname, text="Move To…", icon='FORWARD')
+        op_move.mode = 'MOVE'
+        op_copy = row_transfer.operator(REFBOARD_OT_TransferPins.bl_idname, text="Copy To…", icon='DUPLICATE')
+        op_copy.mode = 'COPY'
+        row_transfer.operator(REFBOARD_OT_SplitPinsToBoard.bl_idname, text="Split", icon='ADD')
         # Add some space above if needed
         layout.separator() # Adds a small margin
 
+        if board.library_uid: # Mounted from the shared library
+            row_lib = layout.row()
+            row_lib.label(text=f"Library: {board.library_offset}/{board.library_total} pins loaded", icon='ASSET_MANAGER')
+            if board.library_offset < board.library_total:
+                row_lib.operator(REFBOARD_OT_LoadLibraryPins.bl_idname, text="Load More", icon='IMPORT')
+
         if board.pins:
             layout.template_list("REFBOARD_UL_pins", "", board, "pins",
                                  board, "active_pin_index", rows=5, type='GRID', columns=4)
@@ -158,17 +223,26 @@ class REFBOARD_PT_Pins(REFBOARD_PT_BasePanel):
 
         op_add_pin = right_col.operator(REFBOARD_OT_AddPinFromFile.bl_idname, text="", icon='ADD')
         # op_add_pin.description = "Add new pin(s) from image files" # If a tooltip needs to be added
+        right_col.operator(REFBOARD_OT_PasteFromClipboard.bl_idname, text="", icon='PASTEDOWN')
 
         # Button group for moving the active pin
         move_col = right_col.column(align=True)
+        op_move_top = move_col.operator(REFBOARD_OT_MovePin.bl_idname, text="", icon='TRIA_UP_BAR')
+        op_move_top.direction = 'TOP'
         op_move_up = move_col.operator(REFBOARD_OT_MovePin.bl_idname, text="", icon='TRIA_UP')
         op_move_up.direction = 'UP'
         op_move_down = move_col.operator(REFBOARD_OT_MovePin.bl_idname, text="", icon='TRIA_DOWN')
         op_move_down.direction = 'DOWN'
-        move_col.enabled = board.active_pin_index >= 0 and len(board.pins) > 1 # Active if there is something to move
+        op_move_bottom = move_col.operator(REFBOARD_OT_MovePin.bl_idname, text="", icon='TRIA_DOWN_BAR')
+        op_move_bottom.direction = 'BOTTOM'
+        move_col.operator(REFBOARD_OT_MovePinToIndex.bl_idname, text="", icon='SORTSIZE')
+        # Active if there is something to move and the grid shows the stored order
+        move_col.enabled = board.active_pin_index >= 0 and stats.pin_count > 1 and board.sort_mode == 'MANUAL'
 
         # Button to remove SELECTED pins
-        op_remove_selected = right_col.operator("refboard.remove_selected_pins", text="", icon='REMOVE')
+        row_remove_selected = right_col.row(align=True)
+        row_remove_selected.enabled = stats.selected > 0
+        op_remove_selected = row_remove_selected.operator("refboard.remove_selected_pins", text="", icon='REMOVE')
         # op_remove_selected.description = "Remove all pins marked as 'Selected'" # Tooltip
         # --- NEW BUTTON: Remove ACTIVE pin ---
         op_remove_active = right_col.operator(REFBOARD_OT_RemovePin.bl_idname, text="", icon='CANCEL') # or 'TRASH'
@@ -205,6 +279,10 @@ class REFBOARD_PT_Pins(REFBOARD_PT_BasePanel):
             box_a.prop(scene, "refboard_image_url", text="")
             row_a = box_a.row()
             row_a.operator(REFBOARD_OT_AddPinFromURL.bl_idname, icon='URL', text="Add Image")
+            row_r = box_a.row(align=True)
+            row_r.label(text="Refresh from Source:")
+            row_r.operator(REFBOARD_OT_RefreshFromSource.bl_idname, text="Selected").scope = 'SELECTED'
+            row_r.operator(REFBOARD_OT_RefreshFromSource.bl_idname, text="Board", icon='FILE_REFRESH').scope = 'BOARD'
 
 class REFBOARD_PT_PinProperties(REFBOARD_PT_BasePanel):
     bl_idname = "REFBOARD_PT_pin_properties"; bl_label = "Active Pin Properties"; bl_order = 2; bl_options = {'DEFAULT_CLOSED'}
@@ -232,13 +310,94 @@ class REFBOARD_PT_PinProperties(REFBOARD_PT_BasePanel):
             valid = pin.external_link.startswith(("http://", "https://"))
             r = box.row(); r.enabled = valid
             op = r.operator("wm.url_open", text="Open Link", icon='URL'); op.url = pin.external_link
+            if valid: r.operator(REFBOARD_OT_RefreshFromSource.bl_idname, text="", icon='FILE_REFRESH').scope = 'ACTIVE'
             if not valid: r.label(text="Invalid URL", icon='ERROR')
         box.prop(pin, "tags", text="Tags")
 
+        # --- Palette ---
+        col_palette = box.column(align=True); col_palette.label(text="Palette:")
+        if len(pin.palette):
+            row_palette = col_palette.row(align=True)
+            for i, swatch in enumerate(pin.palette):
+                col_swatch = row_palette.column(align=True)
+                col_swatch.prop(swatch, "color", text="")
+                op = col_swatch.operator(REFBOARD_OT_SearchBySwatch.bl_idname, text="", icon='VIEWZOOM'); op.index = i
+        else:
+            col_palette.operator(REFBOARD_OT_ComputePalettes.bl_idname, text="Compute Palette", icon='COLOR')
+
+class REFBOARD_PT_GlobalSearch(REFBOARD_PT_BasePanel):
+    bl_idname = "REFBOARD_PT_global_search"; bl_label = "Search All Boards"; bl_order = 3; bl_options = {'DEFAULT_CLOSED'}
+    def draw(self, context):
+        layout = self.layout; scene = context.scene
+        row = layout.row(align=True)
+        row.prop(scene, "refboard_global_query", text="", icon='VIEWZOOM')
+        row.operator(REFBOARD_OT_GlobalSearch.bl_idname, text="", icon='FILE_REFRESH')
+        results = scene.refboard_search_results
+        if not results:
+            if scene.refboard_global_query: layout.label(text="No matching pins.")
+            return
+        layout.label(text=f"{len(results)} result(s)")
+        layout.template_list("REFBOARD_UL_search_results", "", scene, "refboard_search_results",
+                             scene, "refboard_search_result_index", rows=4, type='GRID', columns=3)
+        layout.operator(REFBOARD_OT_CopySearchHitsToBoard.bl_idname, icon='DUPLICATE')
+
+class REFBOARD_PT_Library(REFBOARD_PT_BasePanel):
+    bl_idname = "REFBOARD_PT_library"; bl_label = "Shared Library"; bl_order = 4; bl_options = {'DEFAULT_CLOSED'}
+    @classmethod
+    def poll(cls, context): return is_library_enabled(context)
+    def draw(self, context):
+        layout = self.layout; scene = context.scene
+        row = layout.row(align=True)
+        row.operator(REFBOARD_OT_PublishBoard.bl_idname, icon='EXPORT')
+        row.operator(REFBOARD_OT_MountLibraryBoard.bl_idname, icon='LINKED')
+        row = layout.row(align=True)
+        row.prop(scene, "refboard_library_query", text="", icon='VIEWZOOM')
+        row.operator(REFBOARD_OT_SearchLibrary.bl_idname, text="", icon='FILE_REFRESH')
+        results = scene.refboard_library_results
+        if not results: return
+        layout.label(text=f"{len(results)} result(s)")
+        layout.template_list("REFBOARD_UL_library_results", "", scene, "refboard_library_results",
+                             scene, "refboard_library_result_index", rows=4, type='GRID', columns=3)
+        op = layout.operator(REFBOARD_OT_AddLibraryHits.bl_idname, text="Add All to Active Board", icon='ADD')
+        op.index = -1
+
+class REFBOARD_PT_Debug(REFBOARD_PT_BasePanel):
+    bl_idname = "REFBOARD_PT_debug"; bl_label = "Performance (Debug)"; bl_order = 5; bl_options = {'DEFAULT_CLOSED'}
+    MAX_ROWS = 15
+    @classmethod
+    def poll(cls, context): return instrumentation.is_enabled()
+    def draw(self, context):
+        layout = self.layout
+        counters = instrumentation.get_counters()
+        col = layout.column(align=True)
+        col.label(text=f"Previews requested: {counters['preview_requests']}", icon='IMAGE_DATA')
+        col.label(text=f"Images loaded: {counters['image_loads']}", icon='FILE_IMAGE')
+        col.label(text=f"Downloaded: {counters['bytes_downloaded'] / 1e6:.2f} MB", icon='URL')
+        startup = instrumentation.startup
+        col.label(text=f"Startup: import {startup['import_ms']:.1f} ms, register {startup['register_ms']:.1f} ms", icon='TIME')
+        stats = instrumentation.get_stats()
+        if stats:
+            box = layout.box()
+            row = box.row(); row.label(text="Hook (slowest p95 first)")
+            sub = row.row(); sub.alignment = 'RIGHT'; sub.label(text="calls  p50 / p95 ms")
+            for item in stats[:self.MAX_ROWS]:
+                row = box.row()
+                row.label(text=item["hook"].removeprefix("REFBOARD_"))
+                sub = row.row(); sub.alignment = 'RIGHT'
+                sub.label(text=f"{item['calls']}  {item['p50_ms']:.2f} / {item['p95_ms']:.2f}")
+        else:
+            layout.label(text="No samples yet.")
+        row = layout.row(align=True)
+        row.operator(REFBOARD_OT_ExportInstrumentation.bl_idname, text="JSON", icon='EXPORT').format = 'JSON'
+        row.operator(REFBOARD_OT_ExportInstrumentation.bl_idname, text="cProfile", icon='EXPORT').format = 'PROFILE'
+        row.operator(REFBOARD_OT_ResetInstrumentation.bl_idname, text="", icon='TRASH')
 
 classes = (
     REFBOARD_PT_Help,
     REFBOARD_PT_Boards,
     REFBOARD_PT_Pins,
     REFBOARD_PT_PinProperties,
+    REFBOARD_PT_GlobalSearch,
+    REFBOARD_PT_Library,
+    REFBOARD_PT_Debug,
 )
\ No newline at end of file
@@ -1,35 +1,29 @@
 import bpy
 from bpy.types import UIList
+# Relative import of the board cache
+from ..board_cache import get_filter_mask
+from ..sorting import get_new_order
+from .. import instrumentation
 
 class REFBOARD_UL_pins(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         board = data; pin = item
-        name_filter = board.pin_filter.lower()
-        tag_filter = board.tag_filter.lower()
-        show = True
-        if name_filter:
-            p_name = pin.pin_name.lower() if pin.pin_name else ""
-            p_note = pin.note.lower() if pin.note else ""
-            if name_filter not in p_name and name_filter not in p_note: show = False
-        if show and tag_filter:
-            p_tags = pin.tags.lower()
-            if tag_filter not in p_tags:
-                pin_tags_set = {t.strip() for t in p_tags.split(',') if t.strip()}
-                filter_tags_set = {t.strip() for t in tag_filter.split(',') if t.strip()}
-                if not filter_tags_set.intersection(pin_tags_set): show = False
-        if not show: return
+        # Filtering is done once for the whole list in filter_items()
 
         if pin.image:
             # Always try to show a preview if there is an image data-block
             if not pin.image.preview:
                 pin.image.preview_ensure() # Request preview
+                instrumentation.count("preview_requests")
 
             col = layout.column(align=True)
-            # Add checkbox before the preview
+            # Add selection toggle before the preview (shift-click selects a range)
             row_select = col.row(align=True)
-            row_select.prop(pin, "is_selected", text="")
-            # Add empty space to align with the preview if needed
-            # row_select.label(text="") # Or use layout.split? For now, like this.
+            op = row_select.operator(
+                "refboard.select_pin", text="", emboss=False,
+                icon='CHECKBOX_HLT' if pin.is_selected else 'CHECKBOX_DEHLT'
+            )
+            op.index = index
 
             if pin.image.preview: # If preview is available
                 base_divisor = 100.0
@@ -46,8 +40,48 @@ class REFBOARD_UL_pins(UIList):
             col.label(text=display_label)
         else:
             # If the pin has no associated image data-block at all
-            col.label(text="Invalid Pin", icon='ERROR')
+            layout.label(text="Invalid Pin", icon='ERROR')
+
+    def filter_items(self, context, data, propname):
+        # Evaluate the board's name/note and tag filters for all pins at once
+        mask = get_filter_mask(data)
+        flt_flags = [self.bitflag_filter_item if visible else 0 for visible in mask]
+        # Sorting is a cached permutation; board.pins itself is never reordered
+        return flt_flags, get_new_order(data)
+
+class REFBOARD_UL_search_results(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        hit = item
+        col = layout.column(align=True)
+        if hit.image:
+            if not hit.image.preview:
+                hit.image.preview_ensure() # Request preview
+                instrumentation.count("preview_requests")
+            if hit.image.preview:
+                col.template_icon(hit.image.preview.icon_id, scale=4.0)
+            else: col.label(text="", icon='IMAGE_DATA')
+        else: col.label(text="", icon='ERROR')
+        col.alignment = 'CENTER'
+        col.label(text=hit.name)
+        op = col.operator("refboard.jump_to_search_hit", text=hit.board_name, icon='FORWARD', emboss=False)
+        op.index = index
+
+class REFBOARD_UL_library_results(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        hit = item
+        col = layout.column(align=True)
+        # Thumbnails come from the library database, loaded by the search operator (no database access here)
+        from .. import library
+        icon_id = library.get_loaded_thumbnail_icon(hit.hash)
+        if icon_id: col.template_icon(icon_id, scale=4.0)
+        else: col.label(text="", icon='IMAGE_DATA')
+        col.alignment = 'CENTER'
+        col.label(text=hit.name)
+        op = col.operator("refboard.add_library_hits", text=hit.board_name, icon='ADD', emboss=False)
+        op.index = index
 
 classes = (
     REFBOARD_UL_pins,
-)
\ No newline at end of file
+    REFBOARD_UL_search_results,
+    REFBOARD_UL_library_results,
+)
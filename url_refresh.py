@@ -0,0 +1,99 @@
+import bpy
+import os
+import time
+# Relative imports
+from . import image_utils
+from . import instrumentation
+from .palette import assign_palette
+
+# Refresh of pins downloaded from a URL (external_link). Each pin remembers the ETag and
+# Last-Modified headers and the content hash of the data it was made from. Refreshing sends
+# conditional requests (If-None-Match / If-Modified-Since) on a thread pool, so unchanged sources
+# cost one 304 response each; changed ones are downloaded, and only replace the pin's image if
+# the content hash differs. Blender data is only touched on the main thread.
+
+FETCH_TIMEOUT = 20.0 # Seconds per request
+MAX_WORKERS = 8      # Parallel requests
+URL_PREFIXES = ("http://", "https://")
+
+def get_validators(headers) -> dict:
+    """The cache validators of a response's headers."""
+    return {"etag": headers.get('ETag', ''), "last_modified": headers.get('Last-Modified', '')}
+
+def fetch_conditional(url: str, etag: str = "", last_modified: str = "", timeout: float = FETCH_TIMEOUT):
+    """
+    GETs the URL, conditional on the validators if given. Returns (status, data, validators);
+    data is None for 304 Not Modified. Raises ValueError if the response is not an image.
+    Safe to call from worker threads.
+    """
+    import urllib.request, urllib.error # Imported on first use
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if etag: headers['If-None-Match'] = etag
+    if last_modified: headers['If-Modified-Since'] = last_modified
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            ctype = resp.info().get('Content-Type', '').lower()
+            if ctype and not ctype.startswith('image/'): raise ValueError(f"Not image (Type: {ctype})")
+            return resp.status, resp.read(), get_validators(resp.info())
+    except urllib.error.HTTPError as e:
+        if e.code != 304: raise
+        return 304, None, get_validators(e.headers)
+
+def set_source(pin, validators: dict, digest: str | None) -> None:
+    """Stores the validators and content hash a pin's image was downloaded with."""
+    pin.source_etag = validators.get("etag", "")
+    pin.source_last_modified = validators.get("last_modified", "")
+    if digest: pin.source_hash = digest
+
+def get_url_pin_indices(board, indices=None) -> list[int]:
+    """The pins (of the given indices, or all) whose link is an http(s) URL."""
+    indices = range(len(board.pins)) if indices is None else indices
+    return [idx for idx in indices if board.pins[idx].external_link.startswith(URL_PREFIXES)]
+
+def refresh_pins(board, indices=None, workers: int = MAX_WORKERS, progress=None) -> dict:
+    """
+    Checks the sources of the board's URL pins (the given indices, or all) and replaces the images
+    of those that changed. Returns counts (checked, not_modified, unchanged, updated, failed),
+    downloaded bytes, seconds and a list of (url, error message).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import urllib.parse
+    start = time.perf_counter()
+    jobs = [(idx, pin.external_link, pin.source_etag, pin.source_last_modified)
+            for idx in get_url_pin_indices(board, indices) for pin in (board.pins[idx],)]
+    stats = {"checked": len(jobs), "not_modified": 0, "unchanged": 0, "updated": 0, "failed": 0, "bytes": 0, "errors": []}
+    def fetch(job):
+        _idx, url, etag, last_modified = job
+        try: return fetch_conditional(url, etag, last_modified), None
+        except Exception as e: return None, e
+
+    known = image_utils.find_images_by_hash()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs) or 1))) as pool:
+        for done, (job, (result, error)) in enumerate(zip(jobs, pool.map(fetch, jobs)), 1):
+            if progress: progress(done)
+            idx, url = job[:2]
+            if error is not None:
+                stats["failed"] += 1; stats["errors"].append((url, str(getattr(error, "reason", error)))); continue
+            status, data, validators = result
+            pin = board.pins[idx]
+            if status == 304:
+                stats["not_modified"] += 1
+                if validators["etag"]: pin.source_etag = validators["etag"]
+                if validators["last_modified"]: pin.source_last_modified = validators["last_modified"]
+                continue
+            stats["bytes"] += len(data); instrumentation.count("bytes_downloaded", len(data))
+            digest = image_utils.hash_bytes(data)
+            current = pin.source_hash or (image_utils.get_image_hash(pin.image) if pin.image else None)
+            set_source(pin, validators, digest)
+            if digest == current: # Server does not support validators, or the content is the same
+                stats["unchanged"] += 1; continue
+            img = known.get(digest)
+            if img is None:
+                name = os.path.basename(urllib.parse.urlparse(url).path) or "web_image"
+                img = known[digest] = image_utils.load_image_from_bytes(name, data, digest)
+            pin.image = img
+            assign_palette(pin)
+            stats["updated"] += 1
+    stats["seconds"] = time.perf_counter() - start
+    return stats